@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+import json
 from pydantic import BaseModel
 from typing import List, Dict
-from backend.services.stats_engine import StatisticalEngine
+from backend.api.reports import ReportOptions, render_report
+from backend.services.batch_analysis import BATCH_MAX_EXAMS, iter_batch_results
+from backend.services.stats_engine import AnswerKey, StatisticalEngine
 from backend.core.stat_models import ExamStats
 from backend.core.models import Exam, Question, Option
 
@@ -16,7 +21,11 @@ class StudentResponse(BaseModel):
 class AnalyzeRequest(BaseModel):
     exam: Exam
     student_responses: List[StudentResponse]
-    correct_answers: Dict[str, str]   # {question_id (str): correct_label (str)}
+    correct_answers: AnswerKey        # {question_id: label | [accepted labels]}
+    # Optional bootstrap confidence intervals for p, D and alpha
+    bootstrap: int = 0                # resamples B (0 = point estimates only)
+    confidence: float = 0.95
+    seed: int = 0
 
 
 # ─── Router ───────────────────────────────────────────────────────────────────
@@ -25,7 +34,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=ExamStats)
-async def analyze_exam(body: AnalyzeRequest):
+async def analyze_exam(body: AnalyzeRequest, options: ReportOptions = Depends()):
     """
     Phase 3 — Statistical Analysis Endpoint.
 
@@ -40,6 +49,10 @@ async def analyze_exam(body: AnalyzeRequest):
       - Distractor Efficiency per option
       - Cronbach's Alpha (reliability)
       - Flagged questions with reasons
+      - With `bootstrap` > 0: percentile confidence intervals for each of the above
+
+    `?offset=&limit=` pages question_stats; `?fast=true` skips response
+    re-validation and compresses large bodies (see api/reports.py).
     """
     if not body.student_responses:
         raise HTTPException(status_code=400, detail="No student responses provided.")
@@ -52,13 +65,54 @@ async def analyze_exam(body: AnalyzeRequest):
         raise HTTPException(status_code=400, detail="No correct answers provided.")
 
     try:
-        stats = StatisticalEngine.analyze(
+        stats = await run_in_threadpool(
+            StatisticalEngine.analyze,
             exam=body.exam,
             student_responses=[sr.model_dump() for sr in body.student_responses],
             correct_answers=body.correct_answers,
+            bootstrap=body.bootstrap,
+            confidence=body.confidence,
+            seed=body.seed,
         )
-        return stats
+        return render_report(stats, options)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@router.post("/batch")
+async def analyze_batch(request: Request):
+    """
+    Analyze many exams in one request; results stream back as NDJSON
+    (application/x-ndjson) in completion order.
+
+    Body — a manifest, parsed once as plain JSON (entries are validated
+    individually inside the worker processes, not as one huge model):
+
+      {"exams": [
+        {"exam": {...}, "student_responses": [...], "correct_answers": {...},
+         "similarity": true, "candidate_mode": "exhaustive"},
+        ...
+      ]}
+
+    One {"type": "result" | "error", "index": i, ...} line per entry, then
+    a final {"type": "summary", ...} line.
+    """
+    try:
+        manifest = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid manifest JSON: {e}")
+
+    entries = manifest.get("exams") if isinstance(manifest, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=400, detail='Manifest must contain a non-empty "exams" list.')
+    if len(entries) > BATCH_MAX_EXAMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Manifest has {len(entries)} exams; the limit is {BATCH_MAX_EXAMS}."
+        )
+    if not all(isinstance(entry, dict) and "exam" in entry for entry in entries):
+        raise HTTPException(status_code=400, detail='Every manifest entry needs an "exam".')
+
+    return StreamingResponse(iter_batch_results(entries), media_type="application/x-ndjson")
@@ -0,0 +1,123 @@
+"""
+Incremental exam sittings — /api/exams
+────────────────────────────────────────────────────────────────────────────────
+  POST /api/exams/                              register exam + answer key
+  POST /api/exams/{exam_id}/responses:append    append a JSON batch of students
+  POST /api/exams/{exam_id}/responses:upload    append a CSV batch (streamed)
+  GET  /api/exams/{exam_id}/stats               current ExamStats
+  DELETE /api/exams/{exam_id}                   drop the sitting
+
+Each batch only updates the exam's sufficient statistics, so stats stay
+current while centres upload without re-scanning earlier students.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List
+
+from backend.api.endpoints.analyze import StudentResponse
+from backend.api.reports import ReportOptions, render_report
+from backend.core.models import Exam
+from backend.core.stat_models import AccumulatorStatus, ExamStats
+from backend.services.exam_accumulator import (
+    ExamAccumulator, create_accumulator, drop_accumulator, get_accumulator
+)
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.response_parser import parse_response_stream
+from backend.services.stats_engine import AnswerKey
+
+
+class CreateExamRequest(BaseModel):
+    exam: Exam
+    correct_answers: AnswerKey        # {question_id: label | [accepted labels]}
+
+
+class AppendRequest(BaseModel):
+    student_responses: List[StudentResponse]
+
+
+router = APIRouter()
+
+
+def _status(acc: ExamAccumulator) -> AccumulatorStatus:
+    return AccumulatorStatus(
+        exam_id=acc.exam.exam_id,
+        total_questions=acc.exam.total_questions,
+        total_students=acc.n_students,
+        batches=acc.n_batches,
+    )
+
+
+def _require(exam_id: str) -> ExamAccumulator:
+    acc = get_accumulator(exam_id)
+    if acc is None:
+        raise HTTPException(status_code=404, detail=f"Unknown exam_id '{exam_id}'.")
+    return acc
+
+
+@router.post("/", response_model=AccumulatorStatus)
+async def create_exam(body: CreateExamRequest):
+    """
+    Register an exam and its answer key so response batches can be appended.
+    Re-registering an exam_id starts a fresh sitting.
+    """
+    if not body.exam.questions:
+        raise HTTPException(status_code=400, detail="Exam has no questions.")
+    if not body.correct_answers:
+        raise HTTPException(status_code=400, detail="No correct answers provided.")
+    return _status(create_accumulator(body.exam, body.correct_answers))
+
+
+@router.post("/{exam_id}/responses:append", response_model=AccumulatorStatus)
+async def append_responses(exam_id: str, body: AppendRequest):
+    """Fold a JSON batch of student responses into the running statistics."""
+    acc = _require(exam_id)
+    if not body.student_responses:
+        raise HTTPException(status_code=400, detail="No student responses provided.")
+
+    def _append() -> None:
+        acc.append(ResponseMatrix.from_dicts(
+            [sr.model_dump() for sr in body.student_responses], acc.q_ids
+        ))
+
+    await run_in_threadpool(_append)
+    return _status(acc)
+
+
+@router.post("/{exam_id}/responses:upload", response_model=AccumulatorStatus)
+async def upload_responses(
+    exam_id: str,
+    file: UploadFile = File(..., description="CSV batch of student responses"),
+):
+    """Fold a CSV batch (wide or long format) into the running statistics."""
+    acc = _require(exam_id)
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files are accepted.")
+
+    try:
+        matrix = await run_in_threadpool(parse_response_stream, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"CSV parse error: {e}")
+
+    await run_in_threadpool(acc.append, matrix)
+    return _status(acc)
+
+
+@router.get("/{exam_id}/stats", response_model=ExamStats)
+async def exam_stats(exam_id: str, options: ReportOptions = Depends()):
+    """Current CTT statistics for every student appended so far."""
+    acc = _require(exam_id)
+    try:
+        stats = acc.stats()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return render_report(stats, options)
+
+
+@router.delete("/{exam_id}")
+async def delete_exam(exam_id: str):
+    """Drop a sitting and its running statistics."""
+    if not drop_accumulator(exam_id):
+        raise HTTPException(status_code=404, detail=f"Unknown exam_id '{exam_id}'.")
+    return {"deleted": exam_id}
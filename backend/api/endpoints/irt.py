@@ -0,0 +1,62 @@
+"""
+POST /api/irt/
+────────────────────────────────────────────────────────────────────────────────
+Item Response Theory calibration (Rasch / 2PL / 3PL) alongside the CTT
+report from /api/analyze/. Takes the same exam / responses / answer-key
+payload and returns item parameters plus EAP ability estimates.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List
+
+from backend.api.endpoints.analyze import StudentResponse
+from backend.api.reports import ReportOptions, render_report
+from backend.core.irt_models import IRTModel, IRTReport
+from backend.core.models import Exam
+from backend.services.irt_engine import IRTEngine
+from backend.services.stats_engine import AnswerKey
+
+
+class IRTRequest(BaseModel):
+    exam: Exam
+    student_responses: List[StudentResponse]
+    correct_answers: AnswerKey        # {question_id: label | [accepted labels]}
+    model: IRTModel = "2pl"
+    include_abilities: bool = True    # per-student θ estimates in the reply
+
+
+router = APIRouter()
+
+
+@router.post("/", response_model=IRTReport)
+async def calibrate_exam(body: IRTRequest, options: ReportOptions = Depends()):
+    """
+    Calibrate item parameters (a, b, c) by marginal maximum likelihood
+    and estimate each student's ability θ.
+    """
+    if len(body.student_responses) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 student responses are required for IRT calibration."
+        )
+    if not body.correct_answers:
+        raise HTTPException(status_code=400, detail="No correct answers provided.")
+    if not body.exam.questions:
+        raise HTTPException(status_code=400, detail="Exam has no questions.")
+
+    try:
+        report = await run_in_threadpool(
+            IRTEngine.calibrate,
+            exam=body.exam,
+            student_responses=[sr.model_dump() for sr in body.student_responses],
+            correct_answers=body.correct_answers,
+            model=body.model,
+            include_abilities=body.include_abilities,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"IRT calibration failed: {str(e)}")
+    return render_report(report, options)
@@ -0,0 +1,75 @@
+"""
+POST /api/jobs/            → queue an upload → normalize → (analyze) pipeline
+GET  /api/jobs/{job_id}    → status, stage timings, progress and result
+────────────────────────────────────────────────────────────────────────────────
+The request returns as soon as the files are saved; extraction, OCR,
+normalization and CTT analysis run on the job worker pool, and the saved
+files are deleted once the job finishes (or is never queued). If a response
+CSV is attached and the paper carries an answer key, the job also returns
+ExamStats.
+"""
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import os
+import shutil
+import uuid
+
+from backend.core.job_models import Job, JobCreated
+from backend.services.jobs import JOB_INPUT_DIR, discard_inputs, get_job_manager
+from backend.api.endpoints.upload import ALLOWED_EXTENSIONS
+
+router = APIRouter()
+
+
+def _save(upload: UploadFile, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(upload.file, buffer)
+
+
+@router.post("/", response_model=JobCreated, status_code=202)
+async def create_job(
+    file: UploadFile = File(..., description="Exam paper (PDF, DOCX, TXT, CSV or image)"),
+    responses: Optional[UploadFile] = File(None, description="Optional CSV of student responses"),
+):
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format '{file_ext}'. Allowed: {ALLOWED_EXTENSIONS}"
+        )
+    if responses is not None and not responses.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files are accepted for responses.")
+
+    input_id = str(uuid.uuid4())
+    spec = {
+        "file_path": os.path.join(JOB_INPUT_DIR, f"{input_id}{file_ext}"),
+        "file_ext": file_ext,
+        "filename": file.filename,
+    }
+    try:
+        await run_in_threadpool(_save, file, spec["file_path"])
+        if responses is not None:
+            spec["responses_path"] = os.path.join(JOB_INPUT_DIR, f"{input_id}-responses.csv")
+            await run_in_threadpool(_save, responses, spec["responses_path"])
+    except Exception as e:
+        discard_inputs(spec)
+        raise HTTPException(status_code=500, detail=f"File save error: {str(e)}")
+
+    try:
+        job = get_job_manager().submit("pipeline", spec, source_file=file.filename)
+    except RuntimeError as e:
+        discard_inputs(spec)
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return JobCreated(job_id=job.job_id, status=job.status, status_url=f"/api/jobs/{job.job_id}")
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    return job
@@ -0,0 +1,21 @@
+"""
+GET /api/metrics
+────────────────────────────────────────────────────────────────────────────────
+Stage latency histograms, stage error counts and HTTP request metrics
+in the Prometheus text exposition format (see services/metrics.py).
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.services import metrics
+
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -4,7 +4,7 @@ POST /api/responses/upload
 Accepts:
   - A structured Exam JSON (paste or from /api/upload/)
   - A CSV file of student responses (wide or long format)
-  - A correct_answers JSON map: {question_id: correct_label}
+  - A correct_answers JSON map: {question_id: correct_label | [accepted labels]}
 
 Returns:
   ExamStats (full CTT analysis — difficulty, discrimination, alpha, flagged Qs)
@@ -13,30 +13,35 @@ This is the endpoint that closes the loop:
   Upload exam → Parse questions → Upload student CSV → Get CTT stats
 """
 
-from fastapi import APIRouter, HTTPException, File, Form, UploadFile
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
 import json
-from typing import Dict
 
+from backend.api.reports import ReportOptions, render_report
 from backend.core.models import Exam
 from backend.core.stat_models import ExamStats
-from backend.services.response_parser import parse_response_csv
-from backend.services.stats_engine import StatisticalEngine
+from backend.services.response_parser import parse_response_stream
+from backend.services.stats_engine import AnswerKey, StatisticalEngine, normalize_answer_key
 
 router = APIRouter()
 
+_answer_key = TypeAdapter(AnswerKey)
+
 
 @router.post("/upload", response_model=ExamStats)
 async def upload_responses(
     exam_json: str = Form(..., description="JSON string of the Exam object"),
-    correct_answers_json: str = Form(..., description="JSON map: {question_id: correct_label}"),
+    correct_answers_json: str = Form(..., description="JSON map: {question_id: correct_label | [accepted labels]}"),
     file: UploadFile = File(..., description="CSV file of student responses"),
+    bootstrap: int = Form(0, description="Bootstrap resamples for confidence intervals (0 = off)"),
+    options: ReportOptions = Depends(),
 ):
     """
     Full CTT analysis from a student response CSV.
 
     **exam_json** — paste the `exam` field from a /api/upload/ response  
-    **correct_answers_json** — e.g. `{"1": "C", "2": "A", "3": "B"}`  
+    **correct_answers_json** — e.g. `{"1": "C", "2": "A", "3": ["B", "D"]}`  
     **file** — CSV in wide or long format (see /docs for examples)
     """
     # ── Validate file ─────────────────────────────────────────────────────────
@@ -51,34 +56,34 @@ async def upload_responses(
 
     # ── Parse correct answers ─────────────────────────────────────────────────
     try:
-        correct_answers: Dict[str, str] = json.loads(correct_answers_json)
-        correct_answers = {str(k): str(v).strip().upper() for k, v in correct_answers.items()}
+        correct_answers = normalize_answer_key(_answer_key.validate_json(correct_answers_json))
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Invalid correct_answers_json: {e}")
 
-    # ── Parse CSV ─────────────────────────────────────────────────────────────
+    # ── Parse CSV (streamed in chunks into a compact code matrix) ─────────────
     try:
-        content = await file.read()
-        student_responses = parse_response_csv(content)
+        matrix = await run_in_threadpool(parse_response_stream, file.file)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=f"CSV parse error: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV read error: {e}")
 
-    if len(student_responses) < 2:
+    if matrix.n_students < 2:
         raise HTTPException(
             status_code=422,
-            detail=f"Need at least 2 student rows for analysis. Found {len(student_responses)}."
+            detail=f"Need at least 2 student rows for analysis. Found {matrix.n_students}."
         )
 
     # ── Run CTT engine ────────────────────────────────────────────────────────
     try:
-        stats = StatisticalEngine.analyze(
+        stats = await run_in_threadpool(
+            StatisticalEngine.analyze_matrix,
             exam=exam,
-            student_responses=student_responses,
+            matrix=matrix,
             correct_answers=correct_answers,
+            bootstrap=bootstrap,
         )
-        return stats
+        return render_report(stats, options)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
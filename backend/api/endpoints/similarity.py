@@ -1,20 +1,39 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List
+from typing import List, Literal
+from backend.api.reports import ReportOptions, render_report
 from backend.core.models import Exam
-from backend.core.similarity_models import SimilarityReport
-from backend.services.similarity_engine import SimilarityEngine
+from backend.core.similarity_models import (
+    SimilarityReport, BankMatch, QuestionBankMatches, BankReport, BankStatus
+)
+from backend.services.similarity_engine import SimilarityEngine, NEAR_DUP_THRESHOLD
+from backend.services.question_bank import get_question_bank, classify_score
+from backend.services.lsh import MinHashLSH
 
 
 class SimilarityRequest(BaseModel):
     exam: Exam
+    # "lsh" scores only MinHash/LSH candidate pairs — for very large exams
+    candidate_mode: Literal["exhaustive", "lsh"] = "exhaustive"
+
+
+class BankQueryRequest(BaseModel):
+    exam: Exam
+    top_k: int = 5
+    min_score: float = NEAR_DUP_THRESHOLD
+    add_to_bank: bool = False       # ingest the exam after querying it
+
+
+class BankAddRequest(BaseModel):
+    exam: Exam                      # replaces the bank's rows for its exam_id, if any
 
 
 router = APIRouter()
 
 
 @router.post("/", response_model=SimilarityReport)
-async def detect_similarity(body: SimilarityRequest):
+async def detect_similarity(body: SimilarityRequest, options: ReportOptions = Depends()):
     """
     Phase 4 — Similarity & Redundancy Detection Endpoint.
 
@@ -24,6 +43,9 @@ async def detect_similarity(body: SimilarityRequest):
       - Near-duplicate / paraphrased questions (0.60 ≤ sim < 0.95)
       - Similarity clusters (grouped by union-find)
       - Count of unique questions (not in any cluster)
+
+    `?offset=&limit=` pages the pair and cluster lists; `?fast=true`
+    skips response re-validation and compresses large bodies.
     """
     if not body.exam.questions:
         raise HTTPException(status_code=400, detail="Exam has no questions to analyze.")
@@ -34,7 +56,92 @@ async def detect_similarity(body: SimilarityRequest):
         )
 
     try:
-        report = SimilarityEngine.analyze(body.exam.questions)
-        return report
+        lsh = MinHashLSH() if body.candidate_mode == "lsh" else None
+        report = SimilarityEngine.analyze(body.exam.questions, lsh=lsh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Similarity analysis failed: {str(e)}")
+    return render_report(report, options)
+
+
+@router.post("/bank", response_model=BankReport)
+async def query_bank(body: BankQueryRequest):
+    """
+    Cross-exam duplicate detection against the persistent question bank.
+
+    Returns, for every question in the exam, the nearest bank questions
+    (from other exams) with similarity ≥ min_score.
+    """
+    if not body.exam.questions:
+        raise HTTPException(status_code=400, detail="Exam has no questions to analyze.")
+    if body.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1.")
+
+    bank = await run_in_threadpool(get_question_bank)       # first call loads the bank
+    questions = body.exam.questions
+    try:
+        hits = await run_in_threadpool(
+            bank.query,
+            [q.text.strip() for q in questions],
+            body.top_k,
+            body.min_score,
+            body.exam.exam_id,
+        )
+        bank_size = len(bank)
+        if body.add_to_bank:
+            await run_in_threadpool(bank.add_exam, body.exam)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Question bank query failed: {str(e)}")
+
+    results: List[QuestionBankMatches] = []
+    for q, q_hits in zip(questions, hits):
+        results.append(QuestionBankMatches(
+            question_id=q.id,
+            question_text=q.text,
+            matches=[
+                BankMatch(
+                    exam_id=m["exam_id"],
+                    question_id=m["question_id"],
+                    question_text=m["text"],
+                    similarity_score=round(score, 4),
+                    similarity_type=classify_score(score),
+                )
+                for score, m in q_hits
+            ],
+        ))
+
+    return BankReport(
+        total_questions=len(questions),
+        bank_size=bank_size,
+        questions_with_matches=sum(1 for r in results if r.matches),
+        results=results,
+    )
+
+
+@router.post("/bank/exams", response_model=BankStatus)
+async def add_to_bank(body: BankAddRequest):
+    """
+    Ingest an exam's questions into the persistent question bank.
+    Re-sending an exam_id replaces the questions stored for it.
+    """
+    bank = await run_in_threadpool(get_question_bank)
+    try:
+        added = await run_in_threadpool(bank.add_exam, body.exam)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Question bank insert failed: {str(e)}")
+    return BankStatus(
+        bank_size=len(bank),
+        shards=bank.shard_count,
+        vocabulary_size=bank.vocabulary_size,
+        added=added,
+    )
+
+
+@router.get("/bank", response_model=BankStatus)
+async def bank_status():
+    """Size of the persistent question bank."""
+    bank = await run_in_threadpool(get_question_bank)
+    return BankStatus(
+        bank_size=len(bank),
+        shards=bank.shard_count,
+        vocabulary_size=bank.vocabulary_size,
+    )
@@ -0,0 +1,146 @@
+"""
+Stored response sittings — /api/sittings
+────────────────────────────────────────────────────────────────────────────────
+  POST /api/sittings/                       upload exam + response CSV once
+  GET  /api/sittings/{sitting_id}           sitting summary
+  POST /api/sittings/{sitting_id}/analyze   CTT analysis with a (new) answer key
+  POST /api/sittings/{sitting_id}/rescore   ExamStats diff after an answer-key change
+  DELETE /api/sittings/{sitting_id}         drop the stored sitting
+
+The CSV is parsed once into a columnar uint8 response matrix on disk;
+each analyze call memory-maps it, so reruns with corrected answer keys
+never re-parse the responses. The last analyzed key stays scored in
+memory, so a rescore only recomputes the items whose key changed.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+import json
+from typing import Optional, Tuple
+
+from backend.api.reports import ReportOptions, render_report
+from backend.core.models import Exam
+from backend.core.stat_models import ExamStats, ExamStatsDiff, SittingInfo
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.response_parser import parse_response_stream
+from backend.services.response_store import get_response_store
+from backend.services.rescore import (
+    AnswerKey, ScoredSitting, drop_scored_sitting, get_scored_sitting, put_scored_sitting
+)
+
+
+class SittingAnalyzeRequest(BaseModel):
+    correct_answers: AnswerKey        # {question_id: label | [accepted labels]}
+
+
+class RescoreRequest(BaseModel):
+    correct_answers: AnswerKey
+    # Key to diff against when the sitting has not been analyzed in this process
+    base_answers: Optional[AnswerKey] = None
+
+
+router = APIRouter()
+
+
+def _info(sitting_id: str, exam: Exam, matrix: ResponseMatrix) -> SittingInfo:
+    return SittingInfo(
+        sitting_id=sitting_id,
+        exam_id=exam.exam_id,
+        total_questions=exam.total_questions,
+        total_students=matrix.n_students,
+    )
+
+
+def _require(sitting_id: str) -> Tuple[Exam, ResponseMatrix]:
+    sitting = get_response_store().load(sitting_id)
+    if sitting is None:
+        raise HTTPException(status_code=404, detail=f"Unknown sitting_id '{sitting_id}'.")
+    return sitting
+
+
+@router.post("/", response_model=SittingInfo)
+async def create_sitting(
+    exam_json: str = Form(..., description="JSON string of the Exam object"),
+    file: UploadFile = File(..., description="CSV file of student responses"),
+):
+    """Parse a response CSV once and store it as a columnar sitting."""
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files are accepted.")
+
+    try:
+        exam = Exam(**json.loads(exam_json))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Invalid exam_json: {e}")
+
+    try:
+        matrix = await run_in_threadpool(parse_response_stream, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"CSV parse error: {e}")
+
+    if matrix.n_students < 2:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Need at least 2 student rows for analysis. Found {matrix.n_students}."
+        )
+
+    sitting_id = await run_in_threadpool(get_response_store().save, exam, matrix)
+    return _info(sitting_id, exam, matrix)
+
+
+@router.get("/{sitting_id}", response_model=SittingInfo)
+async def get_sitting(sitting_id: str):
+    exam, matrix = _require(sitting_id)
+    return _info(sitting_id, exam, matrix)
+
+
+@router.post("/{sitting_id}/analyze", response_model=ExamStats)
+async def analyze_sitting(
+    sitting_id: str, body: SittingAnalyzeRequest, options: ReportOptions = Depends()
+):
+    """Full CTT analysis of a stored sitting against the given answer key."""
+    if not body.correct_answers:
+        raise HTTPException(status_code=400, detail="No correct answers provided.")
+    exam, matrix = _require(sitting_id)
+
+    try:
+        scored = await run_in_threadpool(ScoredSitting, exam, matrix, body.correct_answers)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    put_scored_sitting(sitting_id, scored)
+    return render_report(scored.stats, options)
+
+
+@router.post("/{sitting_id}/rescore", response_model=ExamStatsDiff)
+async def rescore_sitting(sitting_id: str, body: RescoreRequest):
+    """
+    Re-score a sitting with a changed answer key (e.g. a regraded item or
+    several accepted labels) and return only what changed in ExamStats.
+    The new key becomes the baseline for the next rescore.
+    """
+    if not body.correct_answers:
+        raise HTTPException(status_code=400, detail="No correct answers provided.")
+
+    scored = None if body.base_answers is not None else get_scored_sitting(sitting_id)
+    if scored is None:
+        if body.base_answers is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Sitting has no scored baseline. Analyze it first or pass base_answers.",
+            )
+        exam, matrix = _require(sitting_id)
+        try:
+            scored = await run_in_threadpool(ScoredSitting, exam, matrix, body.base_answers)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        put_scored_sitting(sitting_id, scored)
+
+    return await run_in_threadpool(scored.rescore, body.correct_answers)
+
+
+@router.delete("/{sitting_id}")
+async def delete_sitting(sitting_id: str):
+    if not get_response_store().delete(sitting_id):
+        raise HTTPException(status_code=404, detail=f"Unknown sitting_id '{sitting_id}'.")
+    drop_scored_sitting(sitting_id)
+    return {"deleted": sitting_id}
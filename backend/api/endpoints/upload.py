@@ -1,16 +1,30 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Dict, Iterator, List
+import json
 import shutil
 import os
+import tempfile
 import uuid
-from backend.services.ingestion import IngestionService
-from backend.services.normalizer import normalize
-from backend.core.models import NormalizationResult
+from backend.services.answer_key import apply_answer_key
+from backend.services.exam_set import UPLOAD_BATCH_MAX_FILES, process_exam_set
+from backend.services.ingestion import IngestionService, Source
+from backend.services.normalizer import assemble_result, iter_questions, normalize
+from backend.services.extraction_cache import ExtractionCache, get_extraction_cache
+from backend.core.models import ExamSetResult, NormalizationResult, Question
+from backend.services.metrics import span
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Uploads up to this size are extracted straight from memory. Larger ones
+# are copied to a temp file in UPLOAD_DIR that is deleted once extracted.
+UPLOAD_MEMORY_LIMIT = int(os.getenv("UPLOAD_MEMORY_LIMIT", str(32 * 1024 * 1024)))
+
 ALLOWED_EXTENSIONS = {
     # Documents
     ".pdf", ".docx", ".txt", ".csv",
@@ -19,6 +33,36 @@ ALLOWED_EXTENSIONS = {
 }
 
 
+async def _load_upload(file: UploadFile, file_ext: str) -> Source:
+    """
+    The upload's bytes, or — above UPLOAD_MEMORY_LIMIT — the path of a temp
+    copy the caller must hand to _discard_upload once extraction is done.
+    """
+    await file.seek(0)
+    if file.size is not None and file.size <= UPLOAD_MEMORY_LIMIT:
+        with span("upload.read"):
+            return await file.read()
+    return await run_in_threadpool(_save_upload, file, file_ext)
+
+
+def _save_upload(file: UploadFile, file_ext: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=file_ext, dir=UPLOAD_DIR)
+    try:
+        with span("upload.save"), os.fdopen(fd, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _discard_upload(source: Source) -> None:
+    if isinstance(source, str):
+        try:
+            os.unlink(source)
+        except FileNotFoundError:
+            pass
+
 
 @router.post("/", response_model=NormalizationResult)
 async def upload_and_normalize(file: UploadFile = File(...)):
@@ -28,6 +72,9 @@ async def upload_and_normalize(file: UploadFile = File(...)):
     2. Extract raw text via IngestionService
     3. Run Normalization Engine to produce structured Exam JSON
     Returns a NormalizationResult with the structured exam and any warnings.
+
+    Results are cached by the SHA-256 of the file bytes: re-uploading the
+    same file skips extraction (and OCR) entirely.
     """
     file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in ALLOWED_EXTENSIONS:
@@ -36,22 +83,32 @@ async def upload_and_normalize(file: UploadFile = File(...)):
             detail=f"Unsupported file format '{file_ext}'. Allowed: {ALLOWED_EXTENSIONS}"
         )
 
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_ext}")
+    # Step 0: Content-addressed cache lookup
+    cache = get_extraction_cache()
+    digest = await run_in_threadpool(ExtractionCache.digest_stream, file.file)
+    cached = await run_in_threadpool(cache.get, digest)
+    if cached is not None:
+        _, result = cached
+        # Same content, new upload: a fresh exam identity under the new filename
+        result.exam.exam_id = str(uuid.uuid4())
+        result.exam.source_file = file.filename
+        return result
 
-    # Save file to disk
+    # Read the upload (blocking work stays off the event loop; for large
+    # scanned papers prefer POST /api/jobs/, which returns immediately)
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        source = await _load_upload(file, file_ext)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File save error: {str(e)}")
 
     # Step 1: Extract raw text
     try:
-        extraction = IngestionService.process_file(file_path, file_ext)
+        extraction = await run_in_threadpool(IngestionService.process_file, source, file_ext)
         raw_text = extraction.get("raw_text", "")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Text extraction failed: {str(e)}")
+    finally:
+        _discard_upload(source)
 
     if not raw_text.strip():
         raise HTTPException(
@@ -62,8 +119,185 @@ async def upload_and_normalize(file: UploadFile = File(...)):
 
     # Step 2: Normalize into structured Exam
     try:
-        result = normalize(raw_text, source_file=file.filename)
+        result = await run_in_threadpool(normalize, raw_text, source_file=file.filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Normalization failed: {str(e)}")
+    result.warnings[:0] = extraction.get("warnings", [])
+
+    try:
+        await run_in_threadpool(cache.put, digest, extraction, result)
+    except OSError:
+        pass    # a full or read-only cache disk must never fail the upload
 
     return result
+
+
+# ─── Multi-file exam set ──────────────────────────────────────────────────────
+
+@router.post("/batch", response_model=ExamSetResult)
+async def upload_exam_set(files: List[UploadFile] = File(...)):
+    """
+    Upload every file of one paper — question booklet, answer-key sheet,
+    supplement pages — and get back a single merged Exam.
+
+    Files are extracted concurrently (UPLOAD_BATCH_WORKERS); answer-key
+    documents ("1-C 2-A 3-D …", one or more pairs per line) fill
+    correct_option of the matching questions instead of adding questions.
+    `documents` reports the role each file played, in upload order.
+    """
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {UPLOAD_BATCH_MAX_FILES} files per batch (got {len(files)}).",
+        )
+    exts = [os.path.splitext(f.filename)[1].lower() for f in files]
+    for f, ext in zip(files, exts):
+        if ext not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{f.filename}: unsupported file format '{ext}'. Allowed: {ALLOWED_EXTENSIONS}"
+            )
+
+    sources: List[Source] = []
+    try:
+        documents = []
+        for f, ext in zip(files, exts):
+            digest = await run_in_threadpool(ExtractionCache.digest_stream, f.file)
+            try:
+                sources.append(await _load_upload(f, ext))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{f.filename}: file save error: {str(e)}")
+            documents.append((f.filename, sources[-1], ext, digest))
+
+        result = await run_in_threadpool(process_exam_set, documents)
+    finally:
+        for source in sources:
+            _discard_upload(source)
+
+    if not result.exam.questions:
+        failed = " ".join(f"{d.filename}: {d.detail}" for d in result.documents if d.role == "failed")
+        raise HTTPException(
+            status_code=422,
+            detail="No questions could be extracted from any file. "
+                   "If the papers are scanned, please provide an OCR API key."
+                   + (f" {failed}" if failed else ""),
+        )
+    return result
+
+
+# ─── Streaming upload (NDJSON) ────────────────────────────────────────────────
+
+@router.post("/stream")
+async def upload_and_stream(file: UploadFile = File(...)):
+    """
+    Streaming variant of POST /api/upload/ for very large papers. Replies
+    with NDJSON (application/x-ndjson), one record per line:
+
+      {"type": "question", "question": {...}}   as soon as each question is parsed
+      {"type": "summary", "exam_id": ..., "source_file": ..., "total_questions": ...,
+       "warnings": [...], "raw_text_preview": ..., "correct_answers": {q_id: label}}
+      {"type": "error", "detail": ...}          if extraction fails mid-stream
+
+    PDFs are extracted page by page, so the first questions arrive long
+    before the last page is read (or OCR'd). A trailing answer key is only
+    seen after its questions went out, so the complete key is in the
+    summary's correct_answers.
+    """
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format '{file_ext}'. Allowed: {ALLOWED_EXTENSIONS}"
+        )
+
+    cache = get_extraction_cache()
+    digest = await run_in_threadpool(ExtractionCache.digest_stream, file.file)
+    cached = await run_in_threadpool(cache.get, digest)
+    if cached is not None:
+        _, result = cached
+        result.exam.exam_id = str(uuid.uuid4())
+        result.exam.source_file = file.filename
+        return StreamingResponse(_replay_result(result), media_type="application/x-ndjson")
+
+    try:
+        source = await _load_upload(file, file_ext)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"File save error: {str(e)}")
+
+    # Cleanup runs after the response even if the client leaves before
+    # the body starts streaming (the generator would never run its finally)
+    return StreamingResponse(
+        _stream_extraction(source, file_ext, file.filename, digest),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_discard_upload, source),
+    )
+
+
+def _question_record(q: Question) -> bytes:
+    return b'{"type": "question", "question": ' + q.model_dump_json().encode("utf-8") + b"}\n"
+
+
+def _summary_record(result: NormalizationResult) -> bytes:
+    return (json.dumps({
+        "type": "summary",
+        "exam_id": result.exam.exam_id,
+        "source_file": result.exam.source_file,
+        "total_questions": result.exam.total_questions,
+        "warnings": result.warnings,
+        "raw_text_preview": result.raw_text_preview,
+        "correct_answers": {
+            str(q.id): q.correct_option for q in result.exam.questions if q.correct_option
+        },
+    }) + "\n").encode("utf-8")
+
+
+def _error_record(detail: str) -> bytes:
+    return (json.dumps({"type": "error", "detail": detail}) + "\n").encode("utf-8")
+
+
+def _replay_result(result: NormalizationResult) -> Iterator[bytes]:
+    for q in result.exam.questions:
+        yield _question_record(q)
+    yield _summary_record(result)
+
+
+def _stream_extraction(source: Source, file_ext: str, filename: str, digest: str) -> Iterator[bytes]:
+    """Runs in Starlette's threadpool: extract page by page, parse, emit."""
+    meta: dict = {}
+    pages: List[str] = []
+    warnings: List[str] = []
+    preview: List[str] = []
+    questions: List[Question] = []
+    answer_key: Dict[str, str] = {}
+
+    def _lines() -> Iterator[str]:
+        for page in IngestionService.iter_pages(source, file_ext, meta):
+            pages.append(page)
+            yield from page.splitlines()
+
+    try:
+        for q in iter_questions(_lines(), warnings, preview, answer_key):
+            questions.append(q)
+            yield _question_record(q)
+    except Exception as e:
+        yield _error_record(f"Text extraction failed: {str(e)}")
+        return
+
+    raw_text = "\n".join(pages)
+    if not raw_text.strip():
+        yield _error_record(
+            "No text could be extracted from the file. "
+            "If this is a scanned document, please provide an OCR API key."
+        )
+        return
+
+    warnings[:0] = meta.get("warnings", [])
+    # A trailing answer key arrives after its questions were streamed: it
+    # fills the cached result and the summary's correct_answers
+    apply_answer_key(questions, answer_key, warnings)
+    result = assemble_result(questions, warnings, preview, source_file=filename)
+    try:
+        get_extraction_cache().put(digest, {"raw_text": raw_text, **meta}, result)
+    except OSError:
+        pass
+    yield _summary_record(result)
@@ -0,0 +1,118 @@
+"""
+Request instrumentation middleware.
+
+Every request:
+  - counts into examforge_http_requests_total{method, route, status} and
+    examforge_http_request_seconds{method, route} (route = the matched
+    path template, so /api/jobs/{job_id} is one series, not one per id),
+  - collects the pipeline spans it runs and reports them in a
+    Server-Timing header (e.g. "normalize.parse;dur=12.41").
+
+With REQUEST_PROFILING=1 and ?profile=1 the request also runs under the
+sampling profiler and the profile is returned with the result:
+  JSON replies     → {"result": <original body>, "profile": {...}}
+  NDJSON streams   → one extra final line {"type": "profile", ...}
+Off by default: the sampler reads every thread's stack, so a profile
+shows other requests' frames and slows everyone down while it runs.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from backend.services import metrics
+from backend.services.profiler import SamplingProfiler
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "0") == "1"
+
+# Headers describing the original body; rebuilt when the body is replaced
+_BODY_HEADERS = {"content-length", "content-type", "content-encoding", "vary"}
+
+
+async def instrument_requests(request: Request, call_next):
+    profiler = None
+    if REQUEST_PROFILING and request.query_params.get("profile") == "1":
+        profiler = SamplingProfiler().start()
+
+    started = time.perf_counter()
+    status = 500
+    with metrics.request_spans() as spans:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        except BaseException:
+            if profiler is not None:
+                profiler.stop()
+            raise
+        finally:
+            route = request.scope.get("route")
+            labels = dict(method=request.method, route=getattr(route, "path", "unmatched"))
+            metrics.HTTP_SECONDS.observe(time.perf_counter() - started, **labels)
+            metrics.HTTP_REQUESTS.inc(status=str(status), **labels)
+
+    if spans:
+        response.headers["Server-Timing"] = _server_timing(spans)
+    if profiler is None:
+        return response
+
+    media_type = response.headers.get("content-type", "")
+    if media_type.startswith("application/x-ndjson"):
+        return _profiled_stream(response, profiler, spans)
+    if media_type.startswith("application/json"):
+        return await _profiled_json(response, profiler, spans)
+    profiler.stop()
+    return response
+
+
+def _server_timing(spans: List[Tuple[str, float]]) -> str:
+    totals: Dict[str, float] = {}
+    for name, seconds in spans:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
+
+
+def _profile(profiler: SamplingProfiler, spans: List[Tuple[str, float]]) -> Dict:
+    profiler.stop()
+    report = profiler.report()
+    report["spans"] = [{"name": name, "ms": round(s * 1000, 3)} for name, s in spans]
+    return report
+
+
+async def _profiled_json(response, profiler: SamplingProfiler, spans) -> Response:
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    encoding = response.headers.get("content-encoding")
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "br" and brotli is not None:
+        body = brotli.decompress(body)
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS}
+    return JSONResponse(
+        {"result": json.loads(body) if body else None, "profile": _profile(profiler, spans)},
+        status_code=response.status_code,
+        headers=headers,
+    )
+
+
+def _profiled_stream(response, profiler: SamplingProfiler, spans) -> StreamingResponse:
+    async def body():
+        async for chunk in response.body_iterator:
+            yield chunk
+        profile = {"type": "profile", **_profile(profiler, spans)}
+        yield (json.dumps(profile) + "\n").encode("utf-8")
+
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS}
+    return StreamingResponse(
+        body(), status_code=response.status_code, headers=headers,
+        media_type=response.headers.get("content-type"),
+    )
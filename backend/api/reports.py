@@ -0,0 +1,129 @@
+"""
+Report responses — pagination and the opt-in fast serialization path.
+
+FastAPI re-validates whatever an endpoint returns against its
+`response_model`, turns it into JSON-compatible Python objects and only
+then encodes those with the stdlib json module. For a 1,000-item
+ExamStats or a SimilarityReport with tens of thousands of pairs that is
+most of the response time, and it is redundant: engine reports are
+already validated models.
+
+With `?fast=true` (or FAST_RESPONSES=1 as the default) the endpoint
+returns a ReportResponse instead, which FastAPI passes through untouched:
+the model is encoded straight to bytes by pydantic-core's Rust
+serializer, and bodies of at least RESPONSE_COMPRESS_MIN_BYTES are
+compressed when the client accepts it — brotli if the optional `brotli`
+package is installed, otherwise gzip.
+
+`?offset=&limit=` works on both paths: every long list of the report
+(see PAGED_FIELDS) is cut to the same window, and `page` records the
+window and each list's full length.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+from fastapi import Query, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from backend.core.irt_models import IRTReport
+from backend.core.models import PageInfo
+from backend.core.similarity_models import SimilarityReport
+from backend.core.stat_models import ExamStats
+from backend.services.metrics import span
+
+try:
+    import brotli
+except ImportError:            # optional: gzip is always available
+    brotli = None
+
+
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "0") == "1"
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", str(64 * 1024)))
+# Low levels: large JSON compresses ~10× already, higher levels mostly cost CPU
+GZIP_LEVEL = 1
+BROTLI_QUALITY = 4
+
+PAGED_FIELDS = {
+    ExamStats: ("question_stats",),
+    SimilarityReport: ("duplicate_pairs", "near_duplicate_pairs", "clusters"),
+    IRTReport: ("items", "abilities"),
+}
+
+
+class ReportOptions:
+    """Query parameters shared by every report endpoint (use with Depends())."""
+
+    def __init__(
+        self,
+        request: Request,
+        fast: bool = Query(FAST_RESPONSES, description="Serialize without re-validation; compress large bodies"),
+        offset: int = Query(0, ge=0, description="First element of each paginated list"),
+        limit: Optional[int] = Query(None, ge=1, description="Max elements per paginated list"),
+    ):
+        self.fast = fast
+        self.offset = offset
+        self.limit = limit
+        self.accept_encoding = request.headers.get("accept-encoding", "")
+
+
+class ReportResponse(Response):
+    """JSON body pre-encoded from a model; compressed above the size threshold."""
+
+    media_type = "application/json"
+
+    def __init__(self, report: BaseModel, accept_encoding: str = ""):
+        with span("response.serialize"):
+            body = report.model_dump_json().encode("utf-8")
+        headers = {}
+        if len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+            encodings = _accepted_encodings(accept_encoding)
+            if brotli is not None and "br" in encodings:
+                body = brotli.compress(body, quality=BROTLI_QUALITY)
+                headers["Content-Encoding"] = "br"
+            elif "gzip" in encodings:
+                body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+                headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+        super().__init__(content=body, headers=headers)
+
+
+def render_report(report: BaseModel, options: ReportOptions):
+    """Paginate `report`, then return it as is or as a ReportResponse."""
+    report = paginate(report, options.offset, options.limit)
+    if options.fast:
+        return ReportResponse(report, options.accept_encoding)
+    return report
+
+
+def paginate(report: BaseModel, offset: int = 0, limit: Optional[int] = None) -> BaseModel:
+    """
+    Copy of `report` with each list in PAGED_FIELDS cut to
+    [offset, offset + limit). The report itself is not modified.
+    """
+    fields = PAGED_FIELDS.get(type(report))
+    if not fields or (offset == 0 and limit is None):
+        return report
+    stop = None if limit is None else offset + limit
+    update, totals = {}, {}
+    for name in fields:
+        items = getattr(report, name)
+        if items is None:
+            continue
+        totals[name] = len(items)
+        update[name] = items[offset:stop]
+    update["page"] = PageInfo(offset=offset, limit=limit, totals=totals)
+    return report.model_copy(update=update)
+
+
+def _accepted_encodings(header: str) -> set:
+    """Codings listed in Accept-Encoding, minus any refused with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if coding and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.lower())
+    return accepted
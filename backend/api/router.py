@@ -1,5 +1,7 @@
 from fastapi import APIRouter
-from backend.api.endpoints import upload, analyze, similarity, responses
+from backend.api.endpoints import (
+    upload, analyze, similarity, responses, exams, jobs, sittings, irt, metrics
+)
 
 router = APIRouter()
 
@@ -9,11 +11,23 @@ router.include_router(upload.router, prefix="/upload", tags=["Ingestion & Normal
 # POST /api/analyze/         →  Phase 3: CTT Analysis (JSON payload)
 router.include_router(analyze.router, prefix="/analyze", tags=["Statistical Analysis"])
 
+# POST /api/irt/             →  IRT calibration (Rasch / 2PL / 3PL)
+router.include_router(irt.router, prefix="/irt", tags=["Item Response Theory"])
+
 # POST /api/similarity/      →  Phase 4: Duplicate Detection
 router.include_router(similarity.router, prefix="/similarity", tags=["Similarity Detection"])
 
 # POST /api/responses/upload →  Phase 3: CTT Analysis from CSV student responses
 router.include_router(responses.router, prefix="/responses", tags=["Student Responses"])
 
+# POST /api/exams/{id}/responses:append  →  Incremental CTT over streamed batches
+router.include_router(exams.router, prefix="/exams", tags=["Incremental Sittings"])
+
+# POST /api/jobs/            →  Background upload → normalize → analyze pipeline
+router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 
+# POST /api/sittings/        →  Store a response CSV once, analyze it with many keys
+router.include_router(sittings.router, prefix="/sittings", tags=["Stored Sittings"])
 
+# GET /api/metrics           →  Prometheus text: stage latency histograms + counters
+router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
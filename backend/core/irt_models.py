@@ -0,0 +1,38 @@
+"""
+Pydantic models for the Item Response Theory (IRT) calibration engine.
+"""
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+from backend.core.models import PageInfo
+
+
+IRTModel = Literal["rasch", "2pl", "3pl"]
+
+
+class ItemParameters(BaseModel):
+    question_id: int
+    discrimination: float           # a — slope at the inflection point (1.0 for Rasch)
+    difficulty: float               # b — ability at which P = (1 + c) / 2
+    guessing: float                 # c — lower asymptote (0.0 unless 3PL)
+    is_flagged: bool = False
+    flag_reasons: List[str] = []
+
+
+class AbilityEstimate(BaseModel):
+    student_id: str
+    theta: float                    # EAP ability estimate
+    standard_error: float           # posterior SD
+
+
+class IRTReport(BaseModel):
+    exam_id: str
+    model: IRTModel
+    total_questions: int
+    total_students: int
+    iterations: int                 # EM cycles run
+    converged: bool
+    log_likelihood: float           # marginal log-likelihood at the final estimates
+    items: List[ItemParameters]
+    abilities: Optional[List[AbilityEstimate]] = None
+    page: Optional[PageInfo] = None             # set when items / abilities are paginated
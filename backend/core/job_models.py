@@ -0,0 +1,36 @@
+"""
+Pydantic models for the asynchronous job API.
+A job runs an upload → normalize → (optional) analyze pipeline off the
+request path; clients poll /api/jobs/{job_id} for status and results.
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+
+
+JobState = Literal["queued", "running", "succeeded", "failed"]
+
+
+class StageTiming(BaseModel):
+    name: str                               # "extract", "normalize", "analyze", ...
+    started_at: float                       # unix timestamp
+    duration_ms: Optional[float] = None     # None while the stage is running
+
+
+class Job(BaseModel):
+    job_id: str
+    kind: str                               # "pipeline"
+    status: JobState = "queued"
+    source_file: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    stages: List[StageTiming] = []
+    progress: Dict[str, int] = {}           # e.g. {"ocr_pages_done": 3, "ocr_pages_queued": 10}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class JobCreated(BaseModel):
+    job_id: str
+    status: JobState
+    status_url: str
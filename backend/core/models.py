@@ -3,7 +3,7 @@ Pydantic data models for the Exam Reliability Analyzer.
 These define the canonical structure for all data flowing through the system.
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import uuid
 
 
@@ -37,3 +37,24 @@ class NormalizationResult(BaseModel):
     exam: Exam
     warnings: List[str] = []   # e.g., "Question 3 has no options detected"
     raw_text_preview: Optional[str] = None
+
+
+class SourceDocument(BaseModel):
+    """One file of a multi-file upload (POST /api/upload/batch)."""
+    filename: str
+    role: str                       # "questions", "answer_key" or "failed"
+    type: Optional[str] = None      # extraction type, e.g. "pdf_text", "docx"
+    questions: int = 0              # questions contributed to the exam
+    answers: int = 0                # key entries applied (answer_key documents)
+    detail: Optional[str] = None    # why a "failed" document was skipped
+
+
+class ExamSetResult(NormalizationResult):
+    documents: List[SourceDocument] = []
+
+
+class PageInfo(BaseModel):
+    """Window applied to a paginated report (?offset=&limit=)."""
+    offset: int
+    limit: Optional[int] = None
+    totals: Dict[str, int]     # full length of every paginated list field
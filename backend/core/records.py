@@ -0,0 +1,51 @@
+"""
+Lightweight internal records for the parsing hot path.
+
+The normalizer emits one question per a handful of lines; building a
+validated Pydantic Question (and one Option per option line) for each is
+most of its per-question cost. The parser fills these __slots__ records
+instead, and they become Pydantic models only at the boundary — either
+one at a time as they are streamed out (`to_model`) or all together in
+a single `model_validate(..., from_attributes=True)` of the finished
+result, which reads the slots directly without an intermediate dict.
+
+Records expose the same attribute names the engines read (id, text,
+options[].label / .text), so they can be passed wherever a list of
+Question models is expected.
+"""
+from typing import List, Optional
+
+from backend.core.models import Question
+
+
+class OptionRecord:
+
+    __slots__ = ("label", "text")
+
+    def __init__(self, label: str, text: str):
+        self.label = label
+        self.text = text
+
+
+class QuestionRecord:
+
+    __slots__ = ("id", "text", "options", "correct_option", "is_flagged", "flag_reason")
+
+    def __init__(
+        self,
+        id: int,
+        text: str,
+        options: List[OptionRecord],
+        correct_option: Optional[str] = None,
+        is_flagged: bool = False,
+        flag_reason: Optional[str] = None,
+    ):
+        self.id = id
+        self.text = text
+        self.options = options
+        self.correct_option = correct_option
+        self.is_flagged = is_flagged
+        self.flag_reason = flag_reason
+
+    def to_model(self) -> Question:
+        return Question.model_validate(self, from_attributes=True)
@@ -2,7 +2,9 @@
 Pydantic models for the Similarity & Redundancy Detection Engine (Phase 4).
 """
 from pydantic import BaseModel
-from typing import List, Literal
+from typing import List, Literal, Optional
+
+from backend.core.models import PageInfo
 
 
 class SimilarPair(BaseModel):
@@ -28,3 +30,34 @@ class SimilarityReport(BaseModel):
     near_duplicate_pairs: List[SimilarPair]     # 0.60 – 0.94 similarity
     clusters: List[SimilarityCluster]
     unique_question_count: int                  # questions in no cluster
+    page: Optional[PageInfo] = None             # set when pairs / clusters are paginated
+
+
+# ─── Question bank (cross-exam) ───────────────────────────────────────────────
+
+class BankMatch(BaseModel):
+    exam_id: str                    # exam the bank question was ingested from
+    question_id: int
+    question_text: str
+    similarity_score: float
+    similarity_type: Literal["duplicate", "near_duplicate"]
+
+
+class QuestionBankMatches(BaseModel):
+    question_id: int
+    question_text: str
+    matches: List[BankMatch]        # best first
+
+
+class BankReport(BaseModel):
+    total_questions: int
+    bank_size: int                  # questions in the bank at query time
+    questions_with_matches: int
+    results: List[QuestionBankMatches]
+
+
+class BankStatus(BaseModel):
+    bank_size: int
+    shards: int
+    vocabulary_size: int
+    added: int = 0
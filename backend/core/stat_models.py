@@ -3,7 +3,9 @@ Extended Pydantic models for Statistical Analysis Engine (Phase 3).
 These augment the base models from core/models.py with stats result types.
 """
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+
+from backend.core.models import PageInfo
 
 
 class DistractorStat(BaseModel):
@@ -15,6 +17,11 @@ class DistractorStat(BaseModel):
     is_effective: bool      # True if chosen by ≥5% of students (non-correct only)
 
 
+class ConfidenceInterval(BaseModel):
+    lower: float
+    upper: float
+
+
 class QuestionStat(BaseModel):
     question_id: int
     question_text: str
@@ -22,9 +29,15 @@ class QuestionStat(BaseModel):
     difficulty_label: str           # "Easy", "Moderate", "Hard"
     discrimination_index: float     # D-value: top27% correct – bottom27% correct
     discrimination_label: str       # "Excellent", "Good", "Fair", "Poor", "Remove"
+    point_biserial: Optional[float] = None          # item–total correlation (item included)
+    corrected_item_total: Optional[float] = None    # item–rest correlation (item excluded)
+    alpha_if_deleted: Optional[float] = None        # Cronbach's Alpha without this item
     distractors: List[DistractorStat] = []
     is_flagged: bool = False
     flag_reasons: List[str] = []
+    # Bootstrap intervals — only set when analysis ran with bootstrap resamples
+    difficulty_ci: Optional[ConfidenceInterval] = None
+    discrimination_ci: Optional[ConfidenceInterval] = None
 
 
 class ExamStats(BaseModel):
@@ -38,3 +51,40 @@ class ExamStats(BaseModel):
     difficulty_distribution: Dict[str, int]   # {"Easy": 5, "Moderate": 12, "Hard": 3}
     flagged_question_count: int
     question_stats: List[QuestionStat]
+    cronbach_alpha_ci: Optional[ConfidenceInterval] = None
+    bootstrap_resamples: Optional[int] = None   # B, when intervals were computed
+    confidence_level: Optional[float] = None
+    page: Optional[PageInfo] = None             # set when question_stats is paginated
+
+
+class AccumulatorStatus(BaseModel):
+    exam_id: str
+    total_questions: int
+    total_students: int             # students folded in so far
+    batches: int                    # number of append calls
+
+
+class SittingInfo(BaseModel):
+    sitting_id: str
+    exam_id: str
+    total_questions: int
+    total_students: int             # rows in the stored response matrix
+
+
+class FieldChange(BaseModel):
+    field: str
+    before: Any
+    after: Any
+
+
+class QuestionStatDiff(BaseModel):
+    question_id: int
+    changes: List[FieldChange]
+
+
+class ExamStatsDiff(BaseModel):
+    exam_id: str
+    rescored_question_ids: List[int]        # items whose accepted answers changed
+    exam_changes: List[FieldChange]         # exam-level fields that moved
+    question_changes: List[QuestionStatDiff]
+    elapsed_ms: float
@@ -1,15 +1,27 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from backend.api.middleware import instrument_requests
 from backend.api.router import router
+from backend.services.process_pool import shutdown_pools
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the PDF / bootstrap / IRT / batch worker processes with the server
+    shutdown_pools()
+
+
 app = FastAPI(
     title="ExamForge — Exam Reliability Analyzer",
     version="1.0.0",
     description="Analyzes exam quality using Classical Test Theory metrics and duplicate detection.",
+    lifespan=lifespan,
 )
 
 # ── CORS ──────────────────────────────────────────────────────────────────────
@@ -21,10 +33,15 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# ── Instrumentation ───────────────────────────────────────────────────────────
+# Request counters/latency, Server-Timing spans and the ?profile=1 mode
+app.middleware("http")(instrument_requests)
+
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
@@ -0,0 +1,239 @@
+"""
+Answer Key Parser.
+
+Finds the answer key in extracted text — whether it is a whole document
+or a trailing section of the paper — in one streaming pass over the
+lines (split_answer_key). Recognized layouts:
+
+  pairs, any number per line     "1. C"   "Q3: (D)"   "1-C 2-A 3-D"   "1:C, 2:A; 3:B"
+  table rows (DOCX tables are    "1 | C"   "Q.No | Answer" header rows
+  extracted as "cell | cell")
+  transposed grids               "Q | 1 | 2 | 3"  followed by  "Ans | C | A | D"
+  one cell per line (PDF tables) "1" / "C" / "2" / "A" … (inside a key section)
+
+Numbers and letters inside ordinary question text are never read as
+answers: a line counts only when it is made of pairs entirely, and a
+block of such lines is a key only
+  - under an "Answer Key" title or a table header row (until the next
+    ordinary line), or
+  - untitled, when it is the last thing in the text and follows the end
+    of a question (an option or an inline "Answer:" line) or nothing at
+    all. An untitled block is held back until the end of the input and
+    goes back to the question parser as text if anything else follows,
+    so a "1 2 3" / "A B C" matching table in a question stem stays put.
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+
+# "Q12 - (c)", "12.C", "12 | C" — the letter must stand alone ("12 Apples" is no pair)
+_PAIR_PATTERN = r"(?<![\w.])(?:Q(?:uestion)?\s*)?(\d{1,3})\s*[.):\-=|]?\s*\(?([A-Ea-e])\)?(?!\w)"
+_PAIR = re.compile(_PAIR_PATTERN, re.IGNORECASE)
+# A whole line of pairs and the separators between them
+_KEY_LINE = re.compile(rf"[\s,;|/]*(?:{_PAIR_PATTERN}[\s,;|/]*)+", re.IGNORECASE)
+
+# Section titles: "Answer Key", "ANSWERS:", "Key - Set A" (but not "Answer: C")
+_TITLE_PATTERN = r"(?:answer\s*keys?|answers?|keys?)\s*(?:[:\-–]\s*[^\d:]*)?"
+_INLINE_ANSWER_PATTERN = r"(?:answer|ans|correct\s+answer|key)[\s:.\-–]+\(?[A-Ea-e]\)?"
+# Table header rows: a question column then an answer column —
+# "Q.No | Answer", "Question No. | Correct Option", "S.No Key"
+_HEADER_PATTERN = (
+    r"(?:q|question|s\.?\s*no|sl|no)s?\.?(?:\s*(?:no|number|#)\.?)?[\s|/]+"
+    r"(?:correct\s+)?(?:answers?|ans|keys?|options?)\.?"
+)
+# Transposed grid rows, optionally labelled: "Q | 1 | 2 | 3", "Ans | C | A | D"; or one cell
+_NUMBERS_ROW_PATTERN = (
+    r"(?:(?:q|question|s\.?\s*no|no)s?\.?(?:\s*no\.?)?[\s|:]*)?(\d{1,3}(?:[\s|,;]+\d{1,3})*)[\s|]*"
+)
+_LETTERS_ROW_PATTERN = (
+    r"(?:(?:answers?|ans|keys?|correct(?:\s+options?)?)\.?[\s|:]*)?([A-E](?:[\s|,;]+[A-E])*)[\s|]*"
+)
+_LETTERS_ROW = re.compile(rf"^{_LETTERS_ROW_PATTERN}$", re.IGNORECASE)
+# Every other line kind in one match (tried in this order): "title",
+# "header", "pairs" or "numbers"
+_LINE_KIND = re.compile(
+    rf"(?P<title>(?!{_INLINE_ANSWER_PATTERN}$){_TITLE_PATTERN})|(?P<header>{_HEADER_PATTERN})"
+    rf"|(?P<pairs>[\s,;|/]*(?:{_PAIR_PATTERN}[\s,;|/]*)+)|(?P<numbers>{_NUMBERS_ROW_PATTERN})",
+    re.IGNORECASE,
+)
+_NUMBER = re.compile(r"\d+")
+_ROW_ITEM = re.compile(r"\w+")
+# Lines that can play any part in a key (or are blank) start with one of
+# these; everything else is passed through after a set lookup (and a word
+# starting with a candidate letter after one more match)
+_KEY_START = frozenset("0123456789qQsSnNaAkK|") | {""}
+_CANDIDATE = re.compile(r"(?i)\s*(?:q|s\.?\s*no|sl|no|answer|ans|key)")
+
+# Lines that end a question — an option ("(b) 4", "c. Rome") or an inline
+# answer — the only lines an untitled key block may follow
+_QUESTION_END = re.compile(
+    r"(?:\((?:[A-Ea-e]|[ivxIVX]{1,4})\)|(?:[A-Ea-e]|[ivxIVX]{1,4})[.)\-:])(?:\s|$)"
+    rf"|(?i:{_INLINE_ANSWER_PATTERN}$)"
+)
+
+# Share of non-blank lines that must be key lines for an answer-key document
+ANSWER_KEY_MIN_SHARE = 0.6
+
+
+def parse_key_line(line: str) -> Dict[str, str]:
+    """{question_id: label} if the whole line is answer pairs, else {}."""
+    if not _KEY_LINE.fullmatch(line):
+        return {}
+    return {str(int(number)): label.upper() for number, label in _PAIR.findall(line)}
+
+
+def split_answer_key(lines: Iterable[str], key: Dict[str, str]) -> Iterator[str]:
+    """
+    Yield every line that is not part of an answer key; the pairs of the
+    key lines go into `key` as {question_id: label} (first entry per
+    question wins). Key lines under a title stream through; an untitled
+    block is held back until something follows it or the input ends.
+    """
+    in_section = False      # after a title/header row, until an ordinary line
+    last: Optional[str] = None      # the last ordinary non-blank line
+    # Lines that are key only if what follows confirms them, with their pairs
+    pending: List[str] = []
+    pending_key: Dict[str, str] = {}
+    grid: Optional[List[str]] = None    # a numbers row waiting for its letters row
+
+    def take(pairs: Dict[str, str], into: Dict[str, str]) -> None:
+        for q_id, label in pairs.items():
+            into.setdefault(q_id, label)
+
+    def release() -> List[str]:
+        # The held lines were question text after all
+        nonlocal grid
+        held = pending[:]
+        pending.clear()
+        pending_key.clear()
+        grid = None
+        return held
+
+    for line in lines:
+        first = line.lstrip()[:1]
+        if grid is None and not pending and (
+            first not in _KEY_START or first.isalpha() and not _CANDIDATE.match(line)
+        ):
+            in_section = False
+            last = line
+            yield line
+            continue
+
+        s = line.strip()
+        if not s:
+            if pending:
+                pending.append(line)
+            else:
+                yield line
+            continue
+
+        if grid is not None:
+            letters = _LETTERS_ROW.match(s)
+            labels = _ROW_ITEM.findall(letters.group(1)) if letters is not None else ()
+            if len(labels) == len(grid):
+                take({str(int(n)): l.upper() for n, l in zip(grid, labels)}, pending_key)
+                grid = None
+                if in_section:
+                    take(pending_key, key)
+                    release()
+                else:
+                    pending.append(line)
+                continue
+            # A numbers row without its letters row is question text
+            numbers_line = pending[-1].strip()
+            yield from release()
+            in_section = False
+            last = numbers_line
+
+        kind = _LINE_KIND.fullmatch(s)
+        kind = kind.lastgroup if kind is not None else None
+        if kind == "title" or kind == "header":
+            yield from release()
+            in_section = True
+            continue
+
+        # An untitled block may only start where a question ends
+        opens = in_section or bool(pending) or last is None or _QUESTION_END.match(last.strip()) is not None
+        if kind == "pairs" and opens:
+            pairs = {str(int(number)): label.upper() for number, label in _PAIR.findall(s)}
+            if in_section:
+                take(pairs, key)
+            else:
+                pending.append(line)
+                take(pairs, pending_key)
+            continue
+        if kind == "numbers" and opens:
+            row = _NUMBER.findall(s)
+            # A lone number outside a key block is a page number or a
+            # formula fragment far more often than a table cell
+            if len(row) > 1 or in_section or pending:
+                pending.append(line)
+                grid = row
+                continue
+
+        yield from release()
+        in_section = False
+        last = s
+        yield line
+
+    if grid is not None:
+        yield from release()
+    elif pending:
+        # The untitled block ends the text: it is the key
+        take(pending_key, key)
+
+
+def parse_answer_key(text: Union[str, Iterable[str]]) -> Dict[str, str]:
+    """
+    The answer key in `text` as {question_id: label}, the form
+    POST /api/analyze/ takes as correct_answers.
+    """
+    key: Dict[str, str] = {}
+    for _ in split_answer_key(text.splitlines() if isinstance(text, str) else text, key):
+        pass
+    return key
+
+
+def is_answer_key(text: str, min_share: float = ANSWER_KEY_MIN_SHARE) -> bool:
+    """True if `text` is an answer-key document rather than a question paper."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    key: Dict[str, str] = {}
+    rest = sum(1 for line in split_answer_key(lines, key) if line.strip())
+    return bool(key) and rest <= (1 - min_share) * len(lines)
+
+
+def apply_answer_key(
+    questions: Iterable, key: Dict[str, str], warnings: List[str], source: Optional[str] = None
+) -> int:
+    """
+    Set correct_option of every question (Question or QuestionRecord) the
+    key covers. An inline "Answer:" line is never overwritten, and a label
+    that is not one of the question's options is not set; both, and
+    entries without a question, are reported in `warnings`, prefixed
+    with `source` when given. Returns the number of questions the key
+    agrees with or filled.
+    """
+    prefix = f"{source}: " if source else ""
+    by_id = {str(q.id): q for q in questions}
+    applied, unmatched = 0, []
+    for q_id, label in key.items():
+        q = by_id.get(q_id)
+        if q is None:
+            unmatched.append(q_id)
+            continue
+        if q.options and label not in {o.label for o in q.options}:
+            warnings.append(f"{prefix}Q{q_id}: key '{label}' is not one of its options; ignored.")
+            continue
+        if q.correct_option and q.correct_option != label:
+            warnings.append(
+                f"{prefix}Q{q_id}: key '{label}' conflicts with inline answer "
+                f"'{q.correct_option}'; kept the inline answer."
+            )
+            continue
+        q.correct_option = label
+        applied += 1
+    if unmatched:
+        warnings.append(
+            f"{prefix}No question matches {len(unmatched)} answer-key entries (first: Q{unmatched[0]})."
+        )
+    return applied
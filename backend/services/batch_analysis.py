@@ -0,0 +1,112 @@
+"""
+Batch Analysis — many exams per request, fanned out over a process pool.
+
+End-of-term runs analyze hundreds of section papers. Instead of one HTTP
+round trip (and one full Pydantic validation of the whole payload) per
+paper, a manifest of exam / responses / key triples is parsed once as
+plain JSON and each entry is shipped to a worker process, which:
+
+  1. validates only its own Exam,
+  2. runs StatisticalEngine.analyze (and SimilarityEngine.analyze),
+  3. serializes the result to one NDJSON line itself,
+
+so the parent only relays finished bytes, in completion order.
+
+Records (one JSON object per line):
+  {"type": "result", "index": i, "exam_id": ..., "stats": {...}, "similarity": {...}}
+  {"type": "error",  "index": i, "exam_id": ..., "detail": ...}
+  {"type": "summary", "total": N, "succeeded": s, "failed": f, "seconds": t}
+"""
+
+import json
+import os
+import time
+from concurrent.futures import Future, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.core.models import Exam
+from backend.services.lsh import MinHashLSH
+from backend.services.process_pool import get_pool
+from backend.services.similarity_engine import SimilarityEngine
+from backend.services.stats_engine import StatisticalEngine
+
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0")) or (os.cpu_count() or 1)
+BATCH_MAX_EXAMS = int(os.getenv("BATCH_MAX_EXAMS", "1000"))
+
+
+def iter_batch_results(entries: List[Dict]) -> Iterator[bytes]:
+    """
+    Analyze every manifest entry and yield NDJSON lines as entries finish,
+    followed by one summary line. Runs inline for a single entry or when
+    BATCH_WORKERS=1. Closing the generator early (the client went away)
+    cancels the entries no worker has started yet.
+    """
+    started = time.perf_counter()
+    failed = 0
+    futures: Dict[Future, int] = {}
+
+    if len(entries) < 2 or BATCH_WORKERS < 2:
+        lines = (analyze_entry(i, entry) for i, entry in enumerate(entries))
+    else:
+        pool = get_pool("batch_analysis", BATCH_WORKERS)
+        futures = {pool.submit(analyze_entry, i, entry): i for i, entry in enumerate(entries)}
+        lines = (_result_or_error(f, futures[f], entries) for f in as_completed(futures))
+
+    try:
+        for ok, line in lines:
+            if not ok:
+                failed += 1
+            yield line
+    finally:
+        for future in futures:
+            future.cancel()
+
+    yield (json.dumps({
+        "type": "summary",
+        "total": len(entries),
+        "succeeded": len(entries) - failed,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }) + "\n").encode("utf-8")
+
+
+# ─── Worker (module level so it pickles into the process pool) ────────────────
+
+def analyze_entry(index: int, entry: Dict) -> Tuple[bool, bytes]:
+    """One manifest entry → (succeeded, one NDJSON line: result or error)."""
+    exam_id = None
+    try:
+        exam = Exam.model_validate(entry["exam"])
+        exam_id = exam.exam_id
+        student_responses = entry.get("student_responses") or []
+        correct_answers = entry.get("correct_answers") or {}
+
+        parts = [f'{{"type": "result", "index": {index}, "exam_id": {json.dumps(exam_id)}']
+        if student_responses:
+            if not correct_answers:
+                raise ValueError("No correct answers provided.")
+            stats = StatisticalEngine.analyze(exam, student_responses, correct_answers)
+            parts.append(f'"stats": {stats.model_dump_json()}')
+        if entry.get("similarity", True) and len(exam.questions) >= 2:
+            lsh = MinHashLSH() if entry.get("candidate_mode") == "lsh" else None
+            report = SimilarityEngine.analyze(exam.questions, lsh=lsh)
+            parts.append(f'"similarity": {report.model_dump_json()}')
+        return True, (", ".join(parts) + "}\n").encode("utf-8")
+    except Exception as e:
+        return False, _error_line(index, exam_id, e)
+
+
+def _error_line(index: int, exam_id: Optional[str], error: Exception) -> bytes:
+    detail = f"{type(error).__name__}: {error}" if isinstance(error, KeyError) else str(error)
+    return (json.dumps({
+        "type": "error", "index": index, "exam_id": exam_id, "detail": detail,
+    }) + "\n").encode("utf-8")
+
+
+def _result_or_error(future: Future, index: int, entries: List[Dict]) -> Tuple[bool, bytes]:
+    try:
+        return future.result()
+    except Exception as e:                      # worker crashed or entry failed to pickle
+        exam = entries[index].get("exam") if isinstance(entries[index], dict) else None
+        return False, _error_line(index, exam.get("exam_id") if isinstance(exam, dict) else None, e)
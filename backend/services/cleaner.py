@@ -5,8 +5,17 @@ Strips noise from raw extracted text before normalization:
   - Headers / footers
   - Repeated whitespace
   - Watermarks / boilerplate lines
+
+Cleaning is a single streaming pass over the lines (iter_clean_lines):
+each raw line is tested once against one fused noise pattern, and the
+block-level rules (DPP response grids, [rough work] brackets, blank-line
+collapsing) run as small state machines that only hold lines back while
+a grid or bracket is still open. The output is identical to joining the
+lines and applying the block regexes to the whole text.
 """
 import re
+from collections import deque
+from typing import Deque, Iterable, Iterator, Optional, Union
 
 
 # Lines that are very likely noise (page numbers, section headers, etc.)
@@ -28,39 +37,169 @@ _NOISE_PATTERNS = [
     r"^\s*End Time\s*:.*$",
 ]
 
-_NOISE_RE = [re.compile(p, re.IGNORECASE) for p in _NOISE_PATTERNS]
+# One alternation → one regex call per line instead of one per pattern
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in _NOISE_PATTERNS), re.IGNORECASE)
+
+_INLINE_WS = re.compile(r"[ \t]+")
+
+# DPP response grids interrupt questions:
+#   RESPONSE GRID 1. 2. 3. ... Space for Rough Work <rest of line + newline>
+_GRID_START = re.compile(r"RESPONSE", re.IGNORECASE)
+_GRID_BLOCK = re.compile(r"RESPONSE\s*GRID[\s\d.]*Space for Rough Work", re.IGNORECASE)
+_GRID_PREFIX = re.compile(r"RESPONSE\s*(?:GRID[\s\d.]*)?", re.IGNORECASE)
 
 
 def clean_text(raw: str) -> str:
     """
     Main entry point. Accepts raw extracted text and returns cleaned text.
     """
-    lines = raw.splitlines()
-    cleaned_lines = []
+    return "\n".join(iter_clean_lines(raw))
+
+
+def iter_clean_lines(raw: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Stream the lines of the cleaned text; accepts the raw text or an
+    iterable of raw lines (e.g. one page at a time).
+    """
+    lines = raw.splitlines() if isinstance(raw, str) else raw
+    return _trim_blank_lines(_strip_brackets(_strip_response_grids(_filter_lines(lines))))
+
 
+# ─── Line stage: noise + whitespace ───────────────────────────────────────────
+
+def _filter_lines(lines: Iterable[str]) -> Iterator[str]:
     for line in lines:
-        if _is_noise(line):
+        stripped = line.strip()
+        if not stripped or _NOISE_RE.match(stripped):
             continue
         # Normalise whitespace within the line
-        line = re.sub(r"[ \t]+", " ", line).strip()
-        if line:
-            cleaned_lines.append(line)
-
-    # Combine lines to apply block-level cleaning
-    text = "\n".join(cleaned_lines)
-    
-    # Custom rule for DPP Response Grids which interrupt questions
-    text = re.sub(r"RESPONSE[\s\n]*GRID[\s\d\.\n]*Space for Rough Work(?:.*?(?:\n|$))?", "", text, flags=re.IGNORECASE | re.DOTALL)
-    # Remove rough work brackets that might have bypassed line rules due to wrapped lines
-    text = re.sub(r"\[.*?\]", "", text, flags=re.DOTALL)
-    
-    # Collapse more than two consecutive blank lines into one
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
-
-
-def _is_noise(line: str) -> bool:
-    for pattern in _NOISE_RE:
-        if pattern.match(line.strip()):
-            return True
-    return False
+        if "\t" in stripped or "  " in stripped:
+            stripped = _INLINE_WS.sub(" ", stripped).strip()
+        yield stripped
+
+
+# ─── Block stages ─────────────────────────────────────────────────────────────
+
+def _peek(buffer: Deque[str], source: Iterator[str], i: int) -> Optional[str]:
+    """Line i of the lookahead, pulling from `source` as needed."""
+    while len(buffer) <= i:
+        line = next(source, None)
+        if line is None:
+            return None
+        buffer.append(line)
+    return buffer[i]
+
+
+def _strip_response_grids(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Remove "RESPONSE GRID ... Space for Rough Work" blocks, which may span
+    several lines. Like the whole-text substitution, the rest of the
+    "Rough Work" line and its newline go too, so the text before RESPONSE
+    joins the line that follows the block.
+    """
+    source, buffer = iter(lines), deque()
+    carry: Optional[str] = None
+
+    while True:
+        line = buffer.popleft() if buffer else next(source, None)
+        if line is None:
+            if carry is not None:
+                yield carry
+            return
+        pos = 0
+        if carry is not None:
+            line, pos, carry = carry + line, len(carry), None
+
+        while True:
+            start = _GRID_START.search(line, pos)
+            if start is None:
+                yield line
+                break
+            p = start.start()
+
+            # Grow the window one line at a time while the block is still open
+            window, used = line, 0
+            block = _GRID_BLOCK.match(window, p)
+            while block is None and _GRID_PREFIX.match(window, p).end() == len(window):
+                extra = _peek(buffer, source, used)
+                if extra is None:
+                    break
+                window, used = f"{window}\n{extra}", used + 1
+                block = _GRID_BLOCK.match(window, p)
+
+            if block is None:
+                pos = p + 1
+                continue
+            for _ in range(used):
+                buffer.popleft()
+            carry = line[:p]
+            break
+
+
+def _strip_brackets(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Remove "[...]" rough-work spans (lazily, possibly across lines). An
+    unclosed "[" holds lines back until its "]" arrives or input ends.
+    """
+    source, buffer = iter(lines), deque()
+
+    while True:
+        line = buffer.popleft() if buffer else next(source, None)
+        if line is None:
+            return
+        pos = 0
+        while True:
+            i = line.find("[", pos)
+            if i < 0:
+                yield line
+                break
+            j = line.find("]", i + 1)
+            if j >= 0:
+                line, pos = line[:i] + line[j + 1:], i
+                continue
+
+            # Look for the closing bracket on the following lines
+            k = 0
+            while True:
+                extra = _peek(buffer, source, k)
+                if extra is None:
+                    break
+                j = extra.find("]")
+                if j >= 0:
+                    break
+                k += 1
+            if extra is None:
+                # No "]" anywhere after this point: nothing else can match
+                yield line
+                yield from buffer
+                yield from source
+                return
+            for _ in range(k + 1):
+                buffer.popleft()
+            line, pos = line[:i] + extra[j + 1:], i
+
+
+def _trim_blank_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Collapse runs of empty lines into one and strip the text's ends."""
+    held = []               # whitespace-only lines that may turn out to be trailing
+    started = False
+    previous: Optional[str] = None
+
+    for line in lines:
+        if not started:
+            line = line.lstrip()
+            if not line:
+                continue
+            started = True
+        elif not line or line.isspace():
+            if not (line == "" and held and held[-1] == ""):
+                held.append(line)
+            continue
+        if previous is not None:
+            yield previous
+        yield from held
+        held.clear()
+        previous = line
+
+    if previous is not None:
+        yield previous.rstrip()
@@ -0,0 +1,227 @@
+"""
+Incremental CTT Accumulator — online statistics for streaming exam sittings.
+
+Sittings arrive in batches as exam centres upload. Instead of re-scanning
+every student on each request, an ExamAccumulator keeps only sufficient
+statistics, updated in O(batch × n_questions) per append:
+
+  correct_counts[i]        students who answered item i correctly
+  option_counts[i, c]      students who chose label c on item i
+  score_hist[s]            students with raw score s          (0 ≤ s ≤ k)
+  item_by_score[s, i]      students with raw score s who got item i right
+
+From these, `stats()` rebuilds a full ExamStats in O(k²) without touching
+any earlier student:
+
+  - Difficulty p            = correct_counts / n
+  - 27% groups              walk score_hist from either end; students
+                            tied on the boundary score contribute
+                            proportionally (expected value over tie order)
+  - Cronbach's Alpha        Σ item variances from correct_counts,
+                            total variance (= Σ item covariances) from
+                            score_hist
+  - Item–total r, α if      Σ xᵢT = Σ_s s · item_by_score[s, i]
+    item deleted
+
+Because the batch engine breaks boundary ties by sort order, the
+discrimination index can differ from /api/analyze/ when many students
+share the cutoff score; every other metric matches exactly.
+"""
+
+import os
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from backend.core.models import Exam
+from backend.core.stat_models import ExamStats
+from backend.services.response_matrix import ResponseMatrix, MISSING, _register_label
+from backend.services.stats_engine import (
+    AnswerKey, StatisticalEngine, _reliability_label, normalize_answer_key
+)
+
+
+class ExamAccumulator:
+
+    def __init__(self, exam: Exam, correct_answers: AnswerKey):
+        self.exam = exam
+        self.correct_answers = normalize_answer_key(correct_answers)
+        self.q_ids = [str(q.id) for q in exam.questions]
+        k = len(self.q_ids)
+
+        # Accumulator-wide label table: batch codes are remapped onto it
+        self.labels: List[str] = [""]
+        self._label_codes: Dict[str, int] = {"": MISSING}
+        # (questions × labels) accepted-label table, as StatisticalEngine
+        # scores with; grows with the label table
+        key = [[self._code(lbl) for lbl in self.correct_answers.get(q_id, ())] for q_id in self.q_ids]
+        self._accepted = np.zeros((k, len(self.labels)), dtype=bool)
+        for j, codes in enumerate(key):
+            self._accepted[j, codes] = True
+        self._cols = np.arange(k, dtype=np.intp)
+
+        self.n_students = 0
+        self.n_batches = 0
+        self.correct_counts = np.zeros(k, dtype=np.int64)
+        self.option_counts  = np.zeros((k, len(self.labels)), dtype=np.int64)
+        self.score_hist     = np.zeros(k + 1, dtype=np.int64)
+        self.item_by_score  = np.zeros((k + 1, k), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    # ─── Updates ──────────────────────────────────────────────────────────────
+
+    def append(self, batch: ResponseMatrix) -> int:
+        """
+        Fold one batch of students into the sufficient statistics.
+        Returns the running student count.
+        """
+        batch = batch.select(self.q_ids)
+        with self._lock:
+            remap = np.array([self._code(lbl) for lbl in batch.labels], dtype=np.uint8)
+            codes = remap[batch.codes]
+            k = len(self.q_ids)
+            n_labels = len(self.labels)
+
+            if self._accepted.shape[1] < n_labels:
+                grown = np.zeros((k, n_labels), dtype=bool)
+                grown[:, :self._accepted.shape[1]] = self._accepted
+                self._accepted = grown
+            score = self._accepted[self._cols[np.newaxis, :], codes]
+            totals = score.sum(axis=1)
+
+            self.correct_counts += score.sum(axis=0)
+            self.score_hist += np.bincount(totals, minlength=k + 1)
+
+            # item_by_score: group the batch's rows by raw score, then one
+            # segmented reduction per score level present in the batch
+            if batch.n_students:
+                order = np.argsort(totals, kind="stable")
+                levels, starts = np.unique(totals[order], return_index=True)
+                self.item_by_score[levels] += np.add.reduceat(
+                    score[order].astype(np.int64), starts, axis=0
+                )
+
+            # option_counts: one bincount over offset codes
+            if self.option_counts.shape[1] < n_labels:
+                grown = np.zeros((k, n_labels), dtype=np.int64)
+                grown[:, :self.option_counts.shape[1]] = self.option_counts
+                self.option_counts = grown
+            if k and batch.n_students:
+                flat = (codes.astype(np.intp) + np.arange(k) * n_labels).ravel()
+                self.option_counts += np.bincount(
+                    flat, minlength=k * n_labels
+                ).reshape(k, n_labels)
+
+            self.n_students += batch.n_students
+            self.n_batches += 1
+            return self.n_students
+
+    # ─── Snapshot ─────────────────────────────────────────────────────────────
+
+    def stats(self) -> ExamStats:
+        """Current ExamStats, computed from the sufficient statistics only."""
+        with self._lock:
+            n = self.n_students
+            if n < 2:
+                raise ValueError("At least 2 student responses required for statistical analysis.")
+
+            k = len(self.q_ids)
+            hist = self.score_hist.astype(np.float64)
+            levels = np.arange(k + 1, dtype=np.float64)
+
+            # ── Difficulty ────────────────────────────────────────────────────
+            p_values = self.correct_counts / n
+
+            # ── Discrimination (27% groups from the score histogram) ──────────
+            cutoff = max(1, int(np.ceil(0.27 * n)))
+            bottom = self._group_correct(hist, cutoff)
+            top    = self._group_correct(hist[::-1], cutoff, reverse=True)
+            disc_values = (top - bottom) / cutoff
+
+            # ── Score moments and Cronbach's Alpha ────────────────────────────
+            mean = float((levels * hist).sum() / n)
+            total_variance = float(((levels - mean) ** 2 * hist).sum() / (n - 1))
+            c = self.correct_counts.astype(np.float64)
+            item_variance_sum = float(((c - c * c / n) / (n - 1)).sum())
+            alpha = StatisticalEngine._alpha_from_variances(
+                k, item_variance_sum, total_variance
+            )
+
+            # ── Item–total statistics ─────────────────────────────────────────
+            item_metrics = StatisticalEngine._item_total_stats(
+                p_values, levels @ self.item_by_score, n, mean, total_variance
+            )
+
+            question_stats, diff_distribution, flagged_count = (
+                StatisticalEngine._assemble_question_stats(
+                    self.exam, p_values, disc_values,
+                    self.option_counts, self.labels, self.correct_answers, n,
+                    item_metrics,
+                )
+            )
+
+            return ExamStats(
+                exam_id=self.exam.exam_id,
+                total_questions=self.exam.total_questions,
+                total_students=n,
+                average_score=round(mean, 2),
+                score_std_dev=round(float(np.sqrt(total_variance)), 2),
+                cronbach_alpha=round(alpha, 4),
+                reliability_label=_reliability_label(alpha),
+                difficulty_distribution=diff_distribution,
+                flagged_question_count=flagged_count,
+                question_stats=question_stats,
+            )
+
+    # ─── Internals ────────────────────────────────────────────────────────────
+
+    def _group_correct(self, hist: np.ndarray, cutoff: int, reverse: bool = False) -> np.ndarray:
+        """
+        Expected number of correct answers per item among the first
+        `cutoff` students when walking score levels in `hist` order.
+        """
+        before = np.cumsum(hist) - hist
+        taken = np.clip(cutoff - before, 0, hist)
+        share = np.divide(taken, hist, out=np.zeros_like(hist), where=hist > 0)
+        item_by_score = self.item_by_score[::-1] if reverse else self.item_by_score
+        return share @ item_by_score
+
+    def _code(self, label: str) -> int:
+        c = self._label_codes.get(label)
+        if c is None:
+            c = _register_label(label, self.labels, self._label_codes)
+        return c
+
+
+# ─── Registry ─────────────────────────────────────────────────────────────────
+# In-process, per exam_id. The EXAM_ACCUMULATORS_MAX most recently used
+# sittings are kept; older ones are dropped (or removed explicitly).
+
+EXAM_ACCUMULATORS_MAX = int(os.getenv("EXAM_ACCUMULATORS_MAX", "256"))
+
+_accumulators: "OrderedDict[str, ExamAccumulator]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def create_accumulator(exam: Exam, correct_answers: AnswerKey) -> ExamAccumulator:
+    acc = ExamAccumulator(exam, correct_answers)
+    with _registry_lock:
+        _accumulators[exam.exam_id] = acc
+        _accumulators.move_to_end(exam.exam_id)
+        while len(_accumulators) > EXAM_ACCUMULATORS_MAX:
+            _accumulators.popitem(last=False)
+    return acc
+
+
+def get_accumulator(exam_id: str) -> Optional[ExamAccumulator]:
+    with _registry_lock:
+        acc = _accumulators.get(exam_id)
+        if acc is not None:
+            _accumulators.move_to_end(exam_id)
+        return acc
+
+
+def drop_accumulator(exam_id: str) -> bool:
+    with _registry_lock:
+        return _accumulators.pop(exam_id, None) is not None
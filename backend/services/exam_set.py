@@ -0,0 +1,148 @@
+"""
+Exam Set Assembly — several uploaded files → one Exam.
+
+A paper often arrives as a question booklet, an answer-key sheet and
+scanned supplement pages. Every file is extracted and parsed on its own
+worker thread — extraction is PyMuPDF/python-docx work and OCR round
+trips, and long PDFs already fan out to the page-range process pool —
+so a set takes about as long as its slowest file. Then, in upload order:
+
+  - answer-key documents (answer_key.is_answer_key) are not parsed for
+    questions; their pairs fill correct_option of the matching questions
+    (an inline "Answer:" line is kept, a conflict is a warning),
+  - every other document contributes its questions; a question number
+    already taken by an earlier file is renumbered after the highest one
+    (keys match the question that kept the number),
+  - a file that fails to extract is reported and skipped.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.models import ExamSetResult, Question
+from backend.services.answer_key import apply_answer_key, is_answer_key, parse_answer_key
+from backend.services.extraction_cache import get_extraction_cache
+from backend.services.ingestion import IngestionService, Source
+from backend.services.normalizer import normalize
+
+
+UPLOAD_BATCH_WORKERS = int(os.getenv("UPLOAD_BATCH_WORKERS", "4"))
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "20"))
+
+# (filename, source, file_ext, sha256 digest)
+Document = Tuple[str, Source, str, str]
+
+
+def process_exam_set(documents: List[Document]) -> ExamSetResult:
+    """Extract and parse every document concurrently, then merge them."""
+    pool = _get_pool()
+    # Each task runs in a copy of the caller's context so its stage spans
+    # are reported with the request that submitted it
+    futures = [
+        pool.submit(contextvars.copy_context().run, _process_document, *doc)
+        for doc in documents
+    ]
+    return merge_exam_set([f.result() for f in futures])
+
+
+def _process_document(filename: str, source: Source, file_ext: str, digest: str) -> Dict:
+    """One file → {"filename", "type", and "key" or "result", or "error"}."""
+    cache = get_extraction_cache()
+    try:
+        cached = cache.get(digest)
+        extraction = cached[0] if cached else IngestionService.process_file(source, file_ext)
+    except Exception as e:
+        return {"filename": filename, "error": f"Text extraction failed: {e}"}
+
+    raw_text = extraction.get("raw_text", "")
+    doc = {"filename": filename, "type": extraction.get("type")}
+    if is_answer_key(raw_text):
+        doc["key"] = parse_answer_key(raw_text)
+        return doc
+
+    if cached:
+        doc["result"] = cached[1]
+        return doc
+    doc["result"] = normalize(raw_text, source_file=filename)
+    doc["result"].warnings[:0] = extraction.get("warnings", [])
+    if raw_text.strip():
+        try:
+            cache.put(digest, extraction, doc["result"])
+        except OSError:
+            pass
+    return doc
+
+
+def merge_exam_set(parsed: List[Dict]) -> ExamSetResult:
+    """Merge per-file results (in upload order) into one ExamSetResult."""
+    questions: List[Question] = []
+    warnings: List[str] = []
+    documents: List[Optional[Dict]] = [None] * len(parsed)     # upload order
+    preview: Optional[str] = None
+
+    papers = [d for d in parsed if "result" in d]
+    top = max((q.id for d in papers for q in d["result"].exam.questions), default=0)
+    taken = set()
+
+    for i, doc in enumerate(parsed):
+        name = doc["filename"]
+        if "error" in doc:
+            documents[i] = {"filename": name, "role": "failed", "detail": doc["error"]}
+            warnings.append(f"{name}: {doc['error']}")
+            continue
+        if "key" in doc:
+            continue
+        result = doc["result"]
+        for q in result.exam.questions:
+            # Copies: a cached result must not see this set's renumbering or key
+            q = q.model_copy()
+            if q.id in taken:
+                top += 1
+                warnings.append(f"{name}: Q{q.id} renumbered to Q{top} (number already used).")
+                q.id = top
+            taken.add(q.id)
+            questions.append(q)
+        warnings.extend(f"{name}: {w}" for w in result.warnings)
+        preview = preview or result.raw_text_preview
+        documents[i] = {
+            "filename": name, "role": "questions", "type": doc["type"],
+            "questions": result.exam.total_questions,
+        }
+
+    for i, doc in enumerate(parsed):
+        if "key" not in doc:
+            continue
+        name = doc["filename"]
+        applied = apply_answer_key(questions, doc["key"], warnings, source=name)
+        documents[i] = {
+            "filename": name, "role": "answer_key", "type": doc["type"], "answers": applied,
+        }
+
+    sources = [d["filename"] for d in documents if d["role"] == "questions"]
+
+    return ExamSetResult.model_validate({
+        "exam": {
+            "source_file": ", ".join(sources) or None,
+            "total_questions": len(questions),
+            "questions": questions,
+        },
+        "warnings": warnings,
+        "raw_text_preview": preview,
+        "documents": documents,
+    }, from_attributes=True)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, UPLOAD_BATCH_WORKERS), thread_name_prefix="upload-batch"
+            )
+        return _pool
@@ -0,0 +1,211 @@
+"""
+Content-Addressed Extraction Cache.
+
+Teachers re-upload the same paper many times. Extraction (PyMuPDF, OCR)
+and normalization are pure functions of the file bytes, so their output
+is cached under the SHA-256 of those bytes:
+
+  memory  — LRU of serialized entries, bounded by entry count and bytes
+  disk    — <dir>/<sha[:2]>/<version>-<sha>.json, bounded by total bytes; the least
+            recently used files are evicted first (mtime is bumped on hit)
+
+A repeat upload is answered from the cache without touching PyMuPDF or
+the OCR backend. Bump CACHE_VERSION whenever extraction or normalization
+output changes so stale entries are ignored.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from backend.core.models import NormalizationResult
+from backend.services.metrics import span
+
+
+CACHE_VERSION = "v3"
+
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "extraction_cache")
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "256"))
+EXTRACTION_CACHE_MAX_MEMORY = int(os.getenv("EXTRACTION_CACHE_MAX_MEMORY", str(64 << 20)))
+EXTRACTION_CACHE_MAX_DISK = int(os.getenv("EXTRACTION_CACHE_MAX_DISK", str(1 << 30)))
+
+_HASH_CHUNK = 1 << 20
+
+
+class ExtractionCache:
+
+    def __init__(
+        self,
+        directory: Optional[str] = EXTRACTION_CACHE_DIR,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+        max_memory_bytes: int = EXTRACTION_CACHE_MAX_MEMORY,
+        max_disk_bytes: int = EXTRACTION_CACHE_MAX_DISK,
+    ):
+        self.directory = directory or None      # None / "" → memory only
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: Dict[str, int] = {}          # path → size, for the disk budget
+        self._lock = threading.Lock()
+        if self.directory:
+            self._scan_disk()
+
+    # ─── Keys ─────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def digest_stream(fileobj: BinaryIO) -> str:
+        """SHA-256 of a binary stream, read in chunks; rewinds the stream."""
+        h = hashlib.sha256()
+        with span("upload.digest"):
+            fileobj.seek(0)
+            for chunk in iter(lambda: fileobj.read(_HASH_CHUNK), b""):
+                h.update(chunk)
+            fileobj.seek(0)
+        return h.hexdigest()
+
+    @staticmethod
+    def digest_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    # ─── Lookup / store ───────────────────────────────────────────────────────
+
+    def get(self, digest: str) -> Optional[Tuple[dict, NormalizationResult]]:
+        """Cached (extraction, NormalizationResult) for a digest, or None."""
+        key = f"{CACHE_VERSION}-{digest}"
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+        if blob is None and self.directory:
+            blob = self._read_disk(key)
+            if blob is not None:
+                self._remember(key, blob)
+        if blob is None:
+            return None
+
+        entry = json.loads(blob)
+        return entry["extraction"], NormalizationResult.model_validate(entry["result"])
+
+    def put(self, digest: str, extraction: dict, result: NormalizationResult) -> None:
+        if extraction.get("ocr_failed_pages"):
+            return      # a transient OCR failure must not stick to the content
+        key = f"{CACHE_VERSION}-{digest}"
+        blob = json.dumps({
+            "extraction": extraction,
+            "result": result.model_dump(mode="json"),
+        }).encode("utf-8")
+        self._remember(key, blob)
+        if self.directory:
+            self._write_disk(key, blob)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path in list(self._disk):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk.clear()
+
+    # ─── Memory tier ──────────────────────────────────────────────────────────
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = blob
+            self._memory_bytes += len(blob)
+            while self._memory and (
+                len(self._memory) > self.max_entries
+                or self._memory_bytes > self.max_memory_bytes
+            ):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    # ─── Disk tier ────────────────────────────────────────────────────────────
+
+    def _path(self, key: str) -> str:
+        digest = key.split("-", 1)[1]
+        return os.path.join(self.directory, digest[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            os.utime(path)                      # mark as recently used
+            return blob
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, blob: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk[path] = len(blob)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        total = sum(self._disk.values())
+        if total <= self.max_disk_bytes:
+            return
+
+        def _mtime(path: str) -> float:
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        for path in sorted(self._disk, key=_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            total -= self._disk.pop(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _scan_disk(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    self._disk[path] = os.path.getsize(path)
+
+
+# ─── Process-wide cache ───────────────────────────────────────────────────────
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
+
+
+def set_extraction_cache(cache: Optional[ExtractionCache]) -> Optional[ExtractionCache]:
+    """Install a cache process-wide (None → default on next use); returns the previous one."""
+    global _cache
+    with _cache_lock:
+        previous, _cache = _cache, cache
+        return previous
@@ -1,112 +1,252 @@
 """
-Ingestion Service — Phase 1 + OCR.space Integration
+Ingestion Service — Phase 1 + OCR Integration
 
 Handles all document types:
   - PDF (text-based)   → PyMuPDF direct extraction
-  - PDF (scanned)      → OCR.space API (auto-detected by low text yield)
-  - DOCX               → python-docx
-  - Images (.jpg, .png, .jpeg, .tiff, .bmp, .gif) → OCR.space API
+  - PDF (scanned)      → OCR backend (auto-detected by low text yield)
+  - DOCX               → python-docx (paragraphs and tables, in document order)
+  - Images (.jpg, .png, .jpeg, .tiff, .bmp, .gif) → OCR backend
   - CSV / TXT          → direct text read
 
-Smart routing: if PyMuPDF yields < 50 characters from a PDF,
-it is assumed to be a scanned document and falls back to OCR.space.
+Smart routing is per page: a PDF page with no text layer but images, or
+< 50 characters of text under images covering most of the page, is
+assumed to be scanned, rasterized and queued for OCR — a mixed PDF only
+OCRs its scanned pages, and a logo or diagram beside a short caption
+keeps its PyMuPDF text. If OCR fails for a page, that page keeps its
+PyMuPDF text and the failure is reported in the extraction's warnings. Long PDFs are split into
+page ranges across a process pool; every worker opens the document once.
+
+OCR runs through the pluggable backend in services/ocr.py (OCR_BACKEND);
+scanned pages are fed to a bounded worker pool as soon as they are
+rasterized, so extraction and OCR overlap.
+
+Every extractor takes a Source: a file path, or the document's bytes
+when the upload is already in memory (PyMuPDF opens the stream, DOCX
+and text are read from it directly) — no temp file needed.
 """
 
+import io
 import os
-import requests
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Iterator, List, Optional, Tuple, Union
 import fitz          # PyMuPDF
 import docx
+from docx.table import Table as DocxTable
 from dotenv import load_dotenv
 
-load_dotenv()
+from backend.services.metrics import span
+from backend.services.ocr import OCRPageQueue, ProgressCallback, get_ocr_backend
+from backend.services.process_pool import get_pool
 
-OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY", "helloworld")
-OCR_SPACE_URL = "https://api.ocr.space/parse/image"
+load_dotenv()
 
-# Minimum chars extracted by PyMuPDF for us to consider it text-based
+# Minimum chars extracted by PyMuPDF for a page to count as text-based
 TEXT_PDF_THRESHOLD = 50
 
+# Share of a page its images must cover for a page with some (< threshold)
+# text to count as scanned; pages with no text at all only need an image
+SCANNED_IMAGE_COVERAGE = 0.5
+
+# Resolution used to rasterize scanned pages before OCR
+OCR_PAGE_DPI = int(os.getenv("OCR_PAGE_DPI", "200"))
+
+# Process-pool extraction: used once a PDF has PARALLEL_PAGE_THRESHOLD pages
+# per available worker (PDF_EXTRACT_WORKERS=1 disables it)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0")) or (os.cpu_count() or 1)
+PARALLEL_PAGE_THRESHOLD = 32
+
+# A document on disk (path) or in memory (its bytes)
+Source = Union[str, bytes]
+
 
 class IngestionService:
 
     # ─── Public Router ────────────────────────────────────────────────────────
 
     @staticmethod
-    def process_file(file_path: str, file_ext: str) -> dict:
+    def process_file(
+        source: Source,
+        file_ext: str,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> dict:
         """
-        Route the file to the correct extractor based on extension.
+        Route the file (path or bytes) to the correct extractor based on extension.
         Always returns: {"raw_text": str, "type": str, ...metadata}
+
+        on_progress(page_number, pages_done, pages_queued) is called as each
+        OCR'd page finishes.
         """
         ext = file_ext.lower()
 
         if ext == ".pdf":
-            return IngestionService._process_pdf(file_path)
+            with span("ingest.pdf"):
+                return IngestionService._process_pdf(source, on_progress)
 
         elif ext == ".docx":
-            return IngestionService._extract_from_docx(file_path)
+            with span("ingest.docx"):
+                return IngestionService._extract_from_docx(source)
 
         elif ext in {".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp", ".gif"}:
-            return IngestionService._extract_from_image_ocr(file_path)
+            with span("ingest.image"):
+                return IngestionService._extract_from_image_ocr(source, ext)
 
         elif ext in {".txt", ".csv"}:
-            return IngestionService._extract_from_text(file_path)
+            with span("ingest.text"):
+                return IngestionService._extract_from_text(source)
 
         else:
             raise ValueError(f"Unsupported file extension: {ext}")
 
-    # ─── PDF: Smart Router ────────────────────────────────────────────────────
+    # ─── Page Stream ──────────────────────────────────────────────────────────
 
     @staticmethod
-    def _process_pdf(file_path: str) -> dict:
+    def iter_pages(
+        source: Source,
+        file_ext: str,
+        meta: Optional[dict] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Iterator[str]:
         """
-        Try PyMuPDF first. If text yield is too low → scanned PDF → OCR.space.
+        Yield the document text one page at a time (PDFs; other formats come
+        as a single chunk) so normalization can start before extraction is
+        done. Once exhausted, `meta` holds the same metadata process_file
+        returns, minus raw_text.
         """
-        text = IngestionService._pymupdf_extract(file_path)
-
-        if len(text.strip()) >= TEXT_PDF_THRESHOLD:
-            return {
-                "raw_text": text,
-                "type": "pdf_text",
-                "pages": IngestionService._pdf_page_count(file_path),
-                "ocr_used": False,
-            }
+        ext = file_ext.lower()
+        if ext == ".pdf":
+            yield from IngestionService._iter_pdf_text(source, meta, on_progress)
+            return
+
+        extraction = IngestionService.process_file(source, ext)
+        raw_text = extraction.pop("raw_text")
+        if meta is not None:
+            meta.update(extraction)
+        yield raw_text
+
+    # ─── PDF: Per-page Router ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _process_pdf(source: Source, on_progress: Optional[ProgressCallback] = None) -> dict:
+        """
+        Extract every page with PyMuPDF; pages that look scanned (see
+        _looks_scanned) go to OCR, keeping their PyMuPDF text if OCR fails.
+        """
+        meta: dict = {}
+        texts = list(IngestionService._iter_pdf_text(source, meta, on_progress))
+        return {"raw_text": "\n".join(texts), **meta}
+
+    @staticmethod
+    def _iter_pdf_text(
+        source: Source,
+        meta: Optional[dict] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Iterator[str]:
+        """
+        Page texts in page order. Scanned pages are queued for OCR as soon as
+        they are rasterized; later text pages keep being extracted while OCR
+        runs, and each page is released once every page before it is ready.
+        A page whose OCR fails keeps its PyMuPDF text; `meta` then lists it
+        in ocr_failed_pages and carries a warning per page.
+        """
+        pending: Deque[Tuple[int, str, Optional[Future]]] = deque()
+        ocr_pages: List[int] = []
+        ocr_failed: List[int] = []
+        warnings: List[str] = []
+        page_count = 0
+
+        def _page_text(page: int, text: str, future: Optional[Future]) -> str:
+            if future is None:
+                return text
+            try:
+                return future.result()
+            except Exception as e:
+                ocr_failed.append(page)
+                warnings.append(f"Page {page}: OCR failed ({e}); kept the PDF text layer.")
+                return text
+
+        with OCRPageQueue(get_ocr_backend(), on_progress=on_progress) as ocr:
+            for text, image in IngestionService._iter_pdf_pages(source):
+                page_count += 1
+                future = None
+                if image is not None:
+                    ocr_pages.append(page_count)
+                    future = ocr.submit(page_count, image)
+                pending.append((page_count, text, future))
+                while pending and (pending[0][2] is None or pending[0][2].done()):
+                    yield _page_text(*pending.popleft())
+            while pending:
+                yield _page_text(*pending.popleft())
+
+        if not ocr_pages:
+            doc_type = "pdf_text"
+        elif len(ocr_pages) == page_count:
+            doc_type = "pdf_scanned"
         else:
-            # Scanned PDF — hand off to OCR.space
-            ocr_text = IngestionService._extract_via_ocr_space(
-                file_path=file_path,
-                file_type="pdf",
-            )
-            return {
-                "raw_text": ocr_text,
-                "type": "pdf_scanned",
-                "pages": IngestionService._pdf_page_count(file_path),
-                "ocr_used": True,
-            }
+            doc_type = "pdf_mixed"
+
+        if meta is not None:
+            meta.update({
+                "type": doc_type,
+                "pages": page_count,
+                "ocr_used": bool(ocr_pages),
+                "ocr_pages": ocr_pages,
+            })
+            if ocr_failed:
+                meta.update({"ocr_failed_pages": ocr_failed, "warnings": warnings})
 
-    # ─── PyMuPDF (text-based PDF) ─────────────────────────────────────────────
+    # ─── PyMuPDF (page ranges, optionally in parallel) ────────────────────────
 
     @staticmethod
-    def _pymupdf_extract(file_path: str) -> str:
+    def _iter_pdf_pages(source: Source) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """
+        One (text, png_or_None) tuple per page, in order. png is set for
+        pages that need OCR, rasterized while the document is already open.
+
+        Large documents are split into page ranges across a process pool;
+        each worker opens the document exactly once. In-memory documents
+        are sent to every worker (they are bounded by the upload memory
+        limit; bigger uploads arrive as paths).
+        """
         try:
-            doc = fitz.open(file_path)
-            return "\n".join(page.get_text() for page in doc)
+            with _open_pdf(source) as doc:
+                page_count = len(doc)
+                workers = min(PDF_EXTRACT_WORKERS, page_count // PARALLEL_PAGE_THRESHOLD)
+                if workers < 2:
+                    yield from _iter_page_range(doc, 0, page_count)
+                    return
         except Exception as e:
             raise RuntimeError(f"PyMuPDF extraction failed: {e}")
 
-    @staticmethod
-    def _pdf_page_count(file_path: str) -> int:
+        # Parallel: contiguous page ranges, a few per worker for load balance
+        step = max(PARALLEL_PAGE_THRESHOLD // 2, -(-page_count // (workers * 2)))
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
         try:
-            return len(fitz.open(file_path))
-        except Exception:
-            return 0
+            pool = get_pool("pdf_extract", PDF_EXTRACT_WORKERS)
+            chunks = pool.map(
+                _extract_page_range_from_source,
+                [source] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            for chunk in chunks:
+                yield from chunk
+        except Exception as e:
+            raise RuntimeError(f"PyMuPDF extraction failed: {e}")
 
     # ─── DOCX ────────────────────────────────────────────────────────────────
 
     @staticmethod
-    def _extract_from_docx(file_path: str) -> dict:
+    def _extract_from_docx(source: Source) -> dict:
         try:
-            doc = docx.Document(file_path)
-            text = "\n".join(para.text for para in doc.paragraphs if para.text.strip())
+            doc = docx.Document(source if isinstance(source, str) else io.BytesIO(source))
+            lines = []
+            for block in doc.iter_inner_content():
+                if isinstance(block, DocxTable):
+                    lines.extend(_docx_table_rows(block))
+                elif block.text.strip():
+                    lines.append(block.text)
+            text = "\n".join(lines)
             return {"raw_text": text, "type": "docx", "ocr_used": False}
         except Exception as e:
             raise RuntimeError(f"DOCX extraction failed: {e}")
@@ -114,86 +254,79 @@ class IngestionService:
     # ─── Plain text / CSV ─────────────────────────────────────────────────────
 
     @staticmethod
-    def _extract_from_text(file_path: str) -> dict:
+    def _extract_from_text(source: Source) -> dict:
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
+            if isinstance(source, str):
+                with open(source, "r", encoding="utf-8", errors="ignore") as f:
+                    text = f.read()
+            else:
+                text = source.decode("utf-8", errors="ignore")
             return {"raw_text": text, "type": "text", "ocr_used": False}
         except Exception as e:
             raise RuntimeError(f"Text file read failed: {e}")
 
-    # ─── Image → OCR.space ───────────────────────────────────────────────────
+    # ─── Image → OCR backend ─────────────────────────────────────────────────
 
     @staticmethod
-    def _extract_from_image_ocr(file_path: str) -> dict:
-        text = IngestionService._extract_via_ocr_space(
-            file_path=file_path,
-            file_type="image",
-        )
+    def _extract_from_image_ocr(source: Source, file_ext: str) -> dict:
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                image, filename = f.read(), os.path.basename(source)
+        else:
+            image, filename = source, f"upload{file_ext}"
+        text = get_ocr_backend().recognize(image, filename)
         return {"raw_text": text, "type": "image_ocr", "ocr_used": True}
 
-    # ─── OCR.space Core Call ──────────────────────────────────────────────────
 
-    @staticmethod
-    def _extract_via_ocr_space(file_path: str, file_type: str = "image") -> str:
-        """
-        Send a file to OCR.space API and return extracted text.
+def _docx_table_rows(table: DocxTable) -> Iterator[str]:
+    """One "cell | cell | …" line per row, so answer-key tables read as key rows."""
+    for row in table.rows:
+        cells, seen = [], set()
+        for cell in row.cells:
+            # A merged cell is returned once per grid column it spans
+            if id(cell._tc) in seen:
+                continue
+            seen.add(id(cell._tc))
+            text = " ".join(cell.text.split())
+            if text:
+                cells.append(text)
+        if cells:
+            yield " | ".join(cells)
 
-        Docs: https://ocr.space/ocrapi
-        Supports: JPG, PNG, GIF, PDF, TIFF, BMP
-        """
-        if not OCR_SPACE_API_KEY:
-            raise RuntimeError(
-                "OCR_SPACE_API_KEY is not set. "
-                "Add it to your .env file: OCR_SPACE_API_KEY=your_key_here"
-            )
 
-        payload = {
-            "apikey": OCR_SPACE_API_KEY,
-            "language": "eng",
-            "isOverlayRequired": False,
-            "detectOrientation": True,
-            "scale": True,
-            "OCREngine": 2,       # Engine 2 handles complex layouts better
-            "isCreateSearchablePdf": False,
-            "isSearchablePdfHideTextLayer": False,
-        }
+# ─── Page-range workers (module level so they pickle into the process pool) ──
 
-        try:
-            with open(file_path, "rb") as f:
-                filename = os.path.basename(file_path)
-                response = requests.post(
-                    OCR_SPACE_URL,
-                    data=payload,
-                    files={"filename": (filename, f)},
-                    timeout=60,
-                )
-
-            response.raise_for_status()
-            result = response.json()
-
-            # OCR.space error handling
-            if result.get("IsErroredOnProcessing"):
-                error_msg = result.get("ErrorMessage", ["Unknown OCR error"])
-                if isinstance(error_msg, list):
-                    error_msg = " | ".join(error_msg)
-                raise RuntimeError(f"OCR.space API error: {error_msg}")
-
-            # Extract text from all parsed results (multi-page support)
-            parsed_results = result.get("ParsedResults", [])
-            if not parsed_results:
-                raise RuntimeError("OCR.space returned no parsed results.")
-
-            full_text = "\n".join(
-                pr.get("ParsedText", "") for pr in parsed_results
-            )
+def _iter_page_range(doc, start: int, stop: int) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """(text, png_or_None) per page; png is set for pages that need OCR."""
+    for page in doc.pages(start, stop):
+        text = page.get_text()
+        image = None
+        if _looks_scanned(page, text):
+            image = page.get_pixmap(dpi=OCR_PAGE_DPI).tobytes("png")
+        yield text, image
 
-            return full_text.strip()
 
-        except requests.exceptions.Timeout:
-            raise RuntimeError(
-                "OCR.space API timed out. "
-                "The file may be too large or the service is slow."
-            )
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"OCR.space network error: {e}")
+def _looks_scanned(page, text: str) -> bool:
+    stripped = text.strip()
+    if len(stripped) >= TEXT_PDF_THRESHOLD or not page.get_images():
+        return False
+    if not stripped:
+        return True
+    area = abs(page.rect) or 1.0
+    covered = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    return covered / area >= SCANNED_IMAGE_COVERAGE
+
+
+def _extract_page_range(doc, start: int, stop: int) -> List[Tuple[str, Optional[bytes]]]:
+    return list(_iter_page_range(doc, start, stop))
+
+
+def _extract_page_range_from_source(source: Source, start: int, stop: int):
+    with _open_pdf(source) as doc:
+        return _extract_page_range(doc, start, stop)
+
+
+def _open_pdf(source: Source):
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
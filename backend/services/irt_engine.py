@@ -0,0 +1,287 @@
+"""
+Item Response Theory Engine — Rasch / 2PL / 3PL calibration.
+
+Complements the CTT StatisticalEngine with sample-independent item
+parameters and per-student ability estimates:
+
+  P(correct | θ) = c + (1 − c) · σ(a·θ + d)          b = −d / a
+
+  rasch  a = 1, c = 0        (one difficulty per item)
+  2pl    c = 0               (slope + difficulty)
+  3pl    all three           (adds a guessing asymptote)
+
+Estimation is marginal maximum likelihood via EM (Bock–Aitkin) on a
+fixed Gauss–Hermite grid over θ ~ N(0, 1):
+
+  E-step   log-likelihood of every student at every node is one matrix
+           product  X · logit(P)ᵀ  over the binary score matrix, followed
+           by a per-row softmax → posterior weights W (n × Q). Expected
+           counts are  N = Σᵢ W  and  R = Xᵀ · W  (k × Q).
+  M-step   Fisher scoring on (R, N) — independent per item and vectorized
+           over items; for very large item banks blocks of items fan out
+           over a process pool (IRT_WORKERS).
+
+Weak priors keep the M-step away from Heywood cases: a ~ N(1, 1.5²)
+for 2PL/3PL and c ~ Beta(5, 17) for 3PL. Abilities are EAP estimates
+with the posterior SD as standard error.
+"""
+
+import os
+import numpy as np
+from typing import Dict, List, Tuple
+
+from backend.core.irt_models import AbilityEstimate, IRTModel, IRTReport, ItemParameters
+from backend.core.models import Exam
+from backend.services.process_pool import get_pool
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.stats_engine import AnswerKey, StatisticalEngine
+
+
+QUADRATURE_POINTS = 41
+MAX_EM_CYCLES = 200
+EM_TOLERANCE = 1e-4               # max |Δ parameter| between cycles
+
+IRT_WORKERS = int(os.getenv("IRT_WORKERS", "0")) or (os.cpu_count() or 1)
+# M-step work per item is O(Q); only huge banks amortise the pool's IPC
+PARALLEL_ITEM_THRESHOLD = 2000
+
+_A_PRIOR_MEAN, _A_PRIOR_VAR = 1.0, 1.5 ** 2
+_C_PRIOR_ALPHA, _C_PRIOR_BETA = 5.0, 17.0
+_EPS = 1e-9
+
+
+class IRTFit:
+    __slots__ = ("a", "d", "c", "posterior", "theta", "iterations", "converged", "log_likelihood")
+
+    def __init__(self, a, d, c, posterior, theta, iterations, converged, log_likelihood):
+        self.a = a                          # (k,) slopes
+        self.d = d                          # (k,) intercepts
+        self.c = c                          # (k,) lower asymptotes
+        self.posterior = posterior          # (n × Q) posterior weights per student
+        self.theta = theta                  # (Q,) quadrature nodes
+        self.iterations = iterations
+        self.converged = converged
+        self.log_likelihood = log_likelihood
+
+    @property
+    def difficulty(self) -> np.ndarray:
+        return -self.d / self.a
+
+    def abilities(self) -> Tuple[np.ndarray, np.ndarray]:
+        """EAP ability and posterior SD per student."""
+        mean = self.posterior @ self.theta
+        var = self.posterior @ (self.theta ** 2) - mean ** 2
+        return mean, np.sqrt(np.clip(var, 0, None))
+
+
+class IRTEngine:
+
+    @staticmethod
+    def calibrate(
+        exam: Exam,
+        student_responses: List[Dict],
+        correct_answers: AnswerKey,
+        model: IRTModel = "2pl",
+        include_abilities: bool = True,
+    ) -> IRTReport:
+        """IRT calibration from the engine's list-of-dicts response format."""
+        if len(student_responses) < 2:
+            raise ValueError("At least 2 student responses required for IRT calibration.")
+        q_ids = [str(q.id) for q in exam.questions]
+        score_matrix = StatisticalEngine._build_score_matrix(student_responses, correct_answers, q_ids)
+        student_ids = [str(sr.get("student_id", "")) for sr in student_responses]
+        return IRTEngine._report(exam, score_matrix, student_ids, model, include_abilities)
+
+    @staticmethod
+    def calibrate_matrix(
+        exam: Exam,
+        matrix: ResponseMatrix,
+        correct_answers: AnswerKey,
+        model: IRTModel = "2pl",
+        include_abilities: bool = True,
+    ) -> IRTReport:
+        """IRT calibration on an encoded ResponseMatrix."""
+        if matrix.n_students < 2:
+            raise ValueError("At least 2 student responses required for IRT calibration.")
+        matrix = matrix.select([str(q.id) for q in exam.questions])
+        accepted = StatisticalEngine._accepted_table(matrix, correct_answers)
+        score_matrix = StatisticalEngine._score_codes(matrix.codes, accepted)
+        return IRTEngine._report(exam, score_matrix, matrix.student_ids, model, include_abilities)
+
+    # ─── Estimation ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def fit(
+        score_matrix: np.ndarray,
+        model: IRTModel = "2pl",
+        max_cycles: int = MAX_EM_CYCLES,
+        tol: float = EM_TOLERANCE,
+    ) -> IRTFit:
+        """MML/EM calibration of a binary (n_students × n_items) score matrix."""
+        if model not in ("rasch", "2pl", "3pl"):
+            raise ValueError(f"Unknown IRT model '{model}'. Use rasch, 2pl or 3pl.")
+        X = np.asarray(score_matrix, dtype=np.float64)
+        n, k = X.shape
+        if n < 2 or k < 1:
+            raise ValueError("IRT calibration needs at least 2 students and 1 item.")
+
+        theta, log_prior = _quadrature(QUADRATURE_POINTS)
+        p = np.clip(X.mean(axis=0), 0.02, 0.98)
+        a = np.ones(k)
+        c = np.full(k, 0.2) if model == "3pl" else np.zeros(k)
+        star = np.clip((p - c) / (1 - c), 0.02, 0.98)
+        d = np.log(star / (1 - star))
+
+        converged = False
+        cycles = 0
+        for cycles in range(1, max_cycles + 1):
+            W, _ = _e_step(X, a, d, c, theta, log_prior)
+            N = W.sum(axis=0)                              # (Q,)
+            R = (W.T @ X).T                                # (k × Q)
+            a_new, d_new, c_new = _m_step(a, d, c, R, N, theta, model)
+            change = max(np.abs(a_new - a).max(), np.abs(d_new - d).max(), np.abs(c_new - c).max())
+            a, d, c = a_new, d_new, c_new
+            if change < tol:
+                converged = True
+                break
+
+        W, log_likelihood = _e_step(X, a, d, c, theta, log_prior)
+        return IRTFit(a, d, c, W, theta, cycles, converged, log_likelihood)
+
+    # ─── Report ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _report(
+        exam: Exam,
+        score_matrix: np.ndarray,
+        student_ids: List[str],
+        model: IRTModel,
+        include_abilities: bool,
+    ) -> IRTReport:
+        fit = IRTEngine.fit(score_matrix, model)
+
+        items = []
+        for q, a, b, c in zip(exam.questions, fit.a.tolist(), fit.difficulty.tolist(), fit.c.tolist()):
+            flag_reasons = []
+            if a < 0.30:
+                flag_reasons.append(f"Low discrimination (a={a:.2f})")
+            if abs(b) > 3.0:
+                flag_reasons.append(f"Extreme difficulty (b={b:.2f})")
+            if c > 0.35:
+                flag_reasons.append(f"High guessing (c={c:.2f})")
+            items.append(ItemParameters(
+                question_id=q.id,
+                discrimination=round(a, 4),
+                difficulty=round(b, 4),
+                guessing=round(c, 4),
+                is_flagged=bool(flag_reasons),
+                flag_reasons=flag_reasons,
+            ))
+
+        abilities = None
+        if include_abilities:
+            theta, se = fit.abilities()
+            abilities = [
+                AbilityEstimate(student_id=sid, theta=round(t, 4), standard_error=round(s, 4))
+                for sid, t, s in zip(student_ids, theta.tolist(), se.tolist())
+            ]
+
+        return IRTReport(
+            exam_id=exam.exam_id,
+            model=model,
+            total_questions=exam.total_questions,
+            total_students=len(student_ids),
+            iterations=fit.iterations,
+            converged=fit.converged,
+            log_likelihood=round(fit.log_likelihood, 4),
+            items=items,
+            abilities=abilities,
+        )
+
+
+# ─── EM steps ─────────────────────────────────────────────────────────────────
+
+def _quadrature(points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Gauss–Hermite nodes for θ ~ N(0, 1) and their log weights."""
+    nodes, weights = np.polynomial.hermite_e.hermegauss(points)
+    return nodes, np.log(weights / weights.sum())
+
+
+def _probabilities(a, d, c, theta) -> Tuple[np.ndarray, np.ndarray]:
+    """σ(aθ + d) and P = c + (1 − c)·σ, both (k × Q)."""
+    star = 1.0 / (1.0 + np.exp(-(a[:, np.newaxis] * theta[np.newaxis, :] + d[:, np.newaxis])))
+    P = np.clip(c[:, np.newaxis] + (1 - c[:, np.newaxis]) * star, _EPS, 1 - _EPS)
+    return star, P
+
+
+def _e_step(X, a, d, c, theta, log_prior) -> Tuple[np.ndarray, float]:
+    """Posterior weights (n × Q) and the marginal log-likelihood."""
+    _, P = _probabilities(a, d, c, theta)
+    log_q = np.log1p(-P)                               # (k × Q)
+    ll = X @ (np.log(P) - log_q)                       # (n × Q) — the one big product
+    ll += log_q.sum(axis=0) + log_prior
+    peak = ll.max(axis=1, keepdims=True)
+    # Floor at e^-200 (~1e-87): negligible mass, but keeps W free of subnormals,
+    # which would otherwise slow the following BLAS products several-fold
+    W = np.exp(np.maximum(ll - peak, -200.0))
+    total = W.sum(axis=1, keepdims=True)
+    W /= total
+    return W, float((peak + np.log(total)).sum())
+
+
+def _m_step(a, d, c, R, N, theta, model: IRTModel):
+    k = len(a)
+    workers = min(IRT_WORKERS, k // PARALLEL_ITEM_THRESHOLD)
+    if workers < 2:
+        return _m_step_block(a, d, c, R, N, theta, model)
+
+    bounds = np.linspace(0, k, workers * 2 + 1).astype(int)
+    blocks = list(zip(bounds[:-1], bounds[1:]))
+    parts = list(get_pool("irt", IRT_WORKERS).map(
+        _m_step_block,
+        [a[s:e] for s, e in blocks], [d[s:e] for s, e in blocks], [c[s:e] for s, e in blocks],
+        [R[s:e] for s, e in blocks], [N] * len(blocks), [theta] * len(blocks),
+        [model] * len(blocks),
+    ))
+    return tuple(np.concatenate([part[i] for part in parts]) for i in range(3))
+
+
+def _m_step_block(a, d, c, R, N, theta, model: IRTModel, steps: int = 2):
+    """
+    Fisher-scoring updates for a block of items, all items at once.
+    Maximises Σ_q R·log P + (N − R)·log(1 − P) (+ log priors) per item.
+    """
+    a, d, c = a.copy(), d.copy(), c.copy()
+    for _ in range(steps):
+        star, P = _probabilities(a, d, c, theta)
+        slope = (1 - c)[:, np.newaxis] * star * (1 - star)        # ∂P/∂d
+        grads = [slope]                                             # d is always free
+        if model != "rasch":
+            grads.append(slope * theta[np.newaxis, :])              # ∂P/∂a
+        if model == "3pl":
+            grads.append(1 - star)                                  # ∂P/∂c
+        J = np.stack(grads, axis=2)                                 # (k × Q × m)
+
+        info_w = N[np.newaxis, :] / (P * (1 - P))
+        score = np.einsum("kq,kqi->ki", (R - N[np.newaxis, :] * P) / (P * (1 - P)), J)
+        info = np.einsum("kq,kqi,kqj->kij", info_w, J, J)
+
+        if model != "rasch":
+            score[:, 1] -= (a - _A_PRIOR_MEAN) / _A_PRIOR_VAR
+            info[:, 1, 1] += 1 / _A_PRIOR_VAR
+        if model == "3pl":
+            score[:, 2] += (_C_PRIOR_ALPHA - 1) / c - (_C_PRIOR_BETA - 1) / (1 - c)
+            info[:, 2, 2] += (_C_PRIOR_ALPHA - 1) / c ** 2 + (_C_PRIOR_BETA - 1) / (1 - c) ** 2
+
+        m = J.shape[2]
+        step = np.linalg.solve(info + 1e-8 * np.eye(m), score[..., np.newaxis])[..., 0]
+        # Damping: cap each item's step so early cycles cannot overshoot
+        norm = np.linalg.norm(step, axis=1, keepdims=True)
+        step *= np.minimum(1.0, 1.0 / np.maximum(norm, _EPS))
+
+        d = np.clip(d + step[:, 0], -15.0, 15.0)
+        if model != "rasch":
+            a = np.clip(a + step[:, 1], 0.05, 6.0)
+        if model == "3pl":
+            c = np.clip(c + step[:, 2], 1e-4, 0.5)
+    return a, d, c
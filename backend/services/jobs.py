@@ -0,0 +1,358 @@
+"""
+Asynchronous Job Subsystem.
+
+Heavy pipelines (save → extract/OCR → normalize → analyze) run off the
+request path:
+
+  POST /api/jobs          → job is stored as "queued" and its id returned at once
+  worker pool             → JOB_WORKERS threads pick jobs off an in-process queue
+                            (PyMuPDF and OCR release the GIL; long PDFs already fan
+                            out to the extraction process pool)
+  GET  /api/jobs/{id}     → status, per-stage timings, progress and result
+
+Stores:
+  MemoryJobStore  — default; jobs live as long as the process
+  SQLiteJobStore  — JOB_STORE_PATH=jobs.db; on restart unfinished jobs whose
+                    saved input is still on disk are re-queued (the pipeline is
+                    idempotent), the rest are marked failed
+
+Both keep only the newest JOB_MAX_FINISHED finished jobs. A job's saved
+input files are deleted as soon as it succeeds or fails.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.job_models import Job, StageTiming
+from backend.services.extraction_cache import ExtractionCache, get_extraction_cache
+from backend.services.ingestion import IngestionService
+from backend.services.normalizer import normalize
+from backend.services.response_parser import parse_response_stream
+from backend.services.stats_engine import StatisticalEngine
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "100"))   # queued + running
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "")             # empty → in-memory
+JOB_INPUT_DIR = os.getenv("JOB_INPUT_DIR", "uploads")
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", "1000"))
+
+_FINISHED = {"succeeded", "failed"}
+
+
+# ─── Stores ───────────────────────────────────────────────────────────────────
+
+class MemoryJobStore:
+    """Jobs in a dict; only the newest `max_finished` finished jobs are kept."""
+
+    def __init__(self, max_finished: int = JOB_MAX_FINISHED):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Tuple[Job, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, job: Job, spec: dict) -> None:
+        with self._lock:
+            self._jobs[job.job_id] = (job.model_copy(deep=True), spec)
+            finished = [jid for jid, (j, _) in self._jobs.items() if j.status in _FINISHED]
+            for jid in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[jid]
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        return entry[0].model_copy(deep=True) if entry else None
+
+    def unfinished(self) -> List[Tuple[Job, dict]]:
+        with self._lock:
+            return [(j.model_copy(deep=True), s) for j, s in self._jobs.values()
+                    if j.status not in _FINISHED]
+
+
+class SQLiteJobStore:
+    """
+    One row per job: the Job as JSON plus the runner spec needed to resume
+    it; only the newest `max_finished` finished jobs are kept.
+    """
+
+    def __init__(self, path: str, max_finished: int = JOB_MAX_FINISHED):
+        self.path = path
+        self.max_finished = max_finished
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " spec TEXT NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)"
+            )
+
+    def save(self, job: Job, spec: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, created_at, spec, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.status, job.created_at, json.dumps(spec), job.model_dump_json()),
+            )
+            if job.status in _FINISHED:
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE job_id IN ("
+                    " SELECT job_id FROM jobs WHERE status IN ('succeeded', 'failed')"
+                    " ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_finished,),
+                )
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def unfinished(self) -> List[Tuple[Job, dict]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload, spec FROM jobs WHERE status IN ('queued', 'running') "
+                "ORDER BY created_at"
+            ).fetchall()
+        return [(Job.model_validate_json(p), json.loads(s)) for p, s in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ─── Runner context ───────────────────────────────────────────────────────────
+
+class JobContext:
+    """Handed to a runner: records stage timings and progress on the live job."""
+
+    def __init__(self, manager: "JobManager", job_id: str):
+        self._manager = manager
+        self.job_id = job_id
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        timing = StageTiming(name=name, started_at=time.time())
+        t0 = time.perf_counter()
+        self._manager._update(self.job_id, lambda job: job.stages.append(timing))
+        try:
+            yield
+        finally:
+            elapsed = round((time.perf_counter() - t0) * 1000, 2)
+            self._manager._update(
+                self.job_id, lambda job: setattr(job.stages[-1], "duration_ms", elapsed)
+            )
+
+    def progress(self, **counts: int) -> None:
+        self._manager._update(self.job_id, lambda job: job.progress.update(counts), persist=False)
+
+
+Runner = Callable[[JobContext, dict], Dict[str, Any]]
+
+
+# ─── Manager ──────────────────────────────────────────────────────────────────
+
+class JobManager:
+
+    def __init__(
+        self,
+        store=None,
+        max_workers: int = JOB_WORKERS,
+        queue_limit: int = JOB_QUEUE_LIMIT,
+    ):
+        self.store = store if store is not None else MemoryJobStore()
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self._live: Dict[str, Tuple[Job, dict]] = {}    # queued / running jobs
+        self._lock = threading.Lock()
+        self.resume()
+
+    def submit(self, kind: str, spec: dict, source_file: Optional[str] = None) -> Job:
+        if kind not in RUNNERS:
+            raise ValueError(f"Unknown job kind '{kind}'. Choose from: {sorted(RUNNERS)}")
+        job = Job(job_id=str(uuid.uuid4()), kind=kind, source_file=source_file, created_at=time.time())
+        with self._lock:
+            if len(self._live) >= self.queue_limit:
+                raise RuntimeError(f"Job queue is full ({self.queue_limit} pending). Retry later.")
+            self._live[job.job_id] = (job, spec)
+        self.store.save(job, spec)
+        self._executor.submit(self._run, job.job_id)
+        return job.model_copy(deep=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            entry = self._live.get(job_id)
+            if entry is not None:
+                return entry[0].model_copy(deep=True)
+        return self.store.load(job_id)
+
+    def resume(self) -> int:
+        """Re-queue unfinished jobs from the store; fail those whose input is gone."""
+        requeued = 0
+        for job, spec in self.store.unfinished():
+            if all(os.path.exists(p) for p in _input_paths(spec)):
+                job.status, job.started_at, job.stages, job.progress = "queued", None, [], {}
+                with self._lock:
+                    self._live[job.job_id] = (job, spec)
+                self.store.save(job, spec)
+                self._executor.submit(self._run, job.job_id)
+                requeued += 1
+            else:
+                job.status, job.finished_at = "failed", time.time()
+                job.error = "Interrupted by a server restart and its input is no longer available."
+                self.store.save(job, spec)
+                discard_inputs(spec)
+        return requeued
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # ── worker side ──
+
+    def _update(self, job_id: str, mutate: Callable[[Job], Any], persist: bool = True) -> None:
+        with self._lock:
+            job, spec = self._live[job_id]
+            mutate(job)
+            snapshot = job.model_copy(deep=True)
+        if persist:
+            self.store.save(snapshot, spec)
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            job, spec = self._live[job_id]
+
+        def _start(j: Job) -> None:
+            j.status, j.started_at = "running", time.time()
+
+        self._update(job_id, _start)
+        try:
+            result = RUNNERS[job.kind](JobContext(self, job_id), spec)
+
+            def _finish(j: Job) -> None:
+                j.status, j.result = "succeeded", result
+        except Exception as e:
+            message = str(e) or type(e).__name__
+
+            def _finish(j: Job) -> None:
+                j.status, j.error = "failed", message
+
+        def _close(j: Job) -> None:
+            _finish(j)
+            j.finished_at = time.time()
+
+        self._update(job_id, _close)
+        with self._lock:
+            del self._live[job_id]
+        discard_inputs(spec)
+
+
+def _input_paths(spec: dict) -> List[str]:
+    return [spec[k] for k in ("file_path", "responses_path") if spec.get(k)]
+
+
+def discard_inputs(spec: dict) -> None:
+    """Delete a job's saved input files (those that exist)."""
+    for path in _input_paths(spec):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# ─── Runners ──────────────────────────────────────────────────────────────────
+
+def run_pipeline(ctx: JobContext, spec: dict) -> Dict[str, Any]:
+    """
+    spec: {"file_path", "file_ext", "filename", "responses_path"?}
+    → {"normalization": NormalizationResult, "stats": ExamStats | None}
+    """
+    cache = get_extraction_cache()
+
+    with ctx.stage("extract"):
+        with open(spec["file_path"], "rb") as f:
+            digest = ExtractionCache.digest_stream(f)
+        cached = cache.get(digest)
+        if cached is not None:
+            extraction, result = cached
+        else:
+            extraction = IngestionService.process_file(
+                spec["file_path"],
+                spec["file_ext"],
+                on_progress=lambda page, done, queued: ctx.progress(
+                    ocr_pages_done=done, ocr_pages_queued=queued
+                ),
+            )
+            if not extraction.get("raw_text", "").strip():
+                raise RuntimeError(
+                    "No text could be extracted from the file. "
+                    "If this is a scanned document, check the OCR backend configuration."
+                )
+
+    if cached is None:
+        with ctx.stage("normalize"):
+            result = normalize(extraction["raw_text"], source_file=spec["filename"])
+            result.warnings[:0] = extraction.get("warnings", [])
+            try:
+                cache.put(digest, extraction, result)
+            except OSError:
+                pass
+    result.exam.exam_id = str(uuid.uuid4())
+    result.exam.source_file = spec["filename"]
+
+    stats = None
+    if spec.get("responses_path"):
+        with ctx.stage("analyze"):
+            correct_answers = {
+                str(q.id): q.correct_option.strip().upper()
+                for q in result.exam.questions if q.correct_option
+            }
+            if not correct_answers:
+                raise ValueError(
+                    "The paper has no answer key; analyze it with /api/responses/upload instead."
+                )
+            with open(spec["responses_path"], "rb") as f:
+                matrix = parse_response_stream(f)
+            if matrix.n_students < 2:
+                raise ValueError(
+                    f"Need at least 2 student rows for analysis. Found {matrix.n_students}."
+                )
+            stats = StatisticalEngine.analyze_matrix(result.exam, matrix, correct_answers)
+
+    return {
+        "normalization": result.model_dump(mode="json"),
+        "stats": stats.model_dump(mode="json") if stats is not None else None,
+    }
+
+
+RUNNERS: Dict[str, Runner] = {
+    "pipeline": run_pipeline,
+}
+
+
+# ─── Process-wide manager ─────────────────────────────────────────────────────
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = SQLiteJobStore(JOB_STORE_PATH) if JOB_STORE_PATH else MemoryJobStore()
+            _manager = JobManager(store)
+        return _manager
@@ -0,0 +1,144 @@
+"""
+MinHash / LSH Candidate Generation — front stage for SimilarityEngine.
+
+For very large question banks even a sparse all-pairs product is too
+expensive. MinHash signatures + banded LSH buckets propose candidate
+pairs in roughly linear time; exact TF-IDF cosine is then computed only
+for those candidates.
+
+Shingles mirror the TF-IDF features: lower-cased word unigrams and
+bigrams with English stop words removed. Two questions whose shingle
+sets have Jaccard similarity J collide in at least one band with
+probability
+
+    P(candidate) = 1 − (1 − J^r)^b        (b bands × r rows = num_perm)
+
+so recall is tuned with `bands` (more bands → higher recall, more
+candidates). The defaults (128 permutations, 32 bands of 4 rows) catch
+≈ 87% of pairs at J = 0.5 and ≈ 99.6% at J = 0.7.
+"""
+
+import re
+import zlib
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from typing import List, Tuple
+
+
+NUM_PERM          = 128
+LSH_BANDS         = 32
+MAX_BUCKET_SIZE   = 500         # skip degenerate buckets (boilerplate text)
+_PRIME            = np.uint64(4294967311)    # smallest prime > 2**32
+_TOKEN            = re.compile(r"(?u)\b\w\w+\b")   # TfidfVectorizer's token pattern
+_SIGNATURE_CHUNK  = 1 << 16     # shingles hashed per vectorized step
+_SMALL_BUCKET     = 8           # buckets up to this size are paired fully vectorized
+
+
+class MinHashLSH:
+
+    def __init__(
+        self,
+        num_perm: int = NUM_PERM,
+        bands: int = LSH_BANDS,
+        max_bucket_size: int = MAX_BUCKET_SIZE,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket_size = max_bucket_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    # ─── Shingling ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def shingles(text: str) -> List[str]:
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in ENGLISH_STOP_WORDS]
+        return words + [f"{w1} {w2}" for w1, w2 in zip(words, words[1:])]
+
+    # ─── Signatures ───────────────────────────────────────────────────────────
+
+    def signatures(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n × num_perm) uint64 MinHash signatures, plus a boolean mask of
+        texts that produced at least one shingle (empty texts never collide).
+        """
+        n = len(texts)
+        hashes, doc_of = [], []
+        for i, text in enumerate(texts):
+            hs = {zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)}
+            hashes.extend(hs)
+            doc_of.extend([i] * len(hs))
+
+        sig = np.full((n, self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        if not hashes:
+            return sig, np.zeros(n, dtype=bool)
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        doc_of = np.asarray(doc_of, dtype=np.intp)
+
+        # Hash chunks of shingles under every permutation at once, then take
+        # the per-document minimum with a segmented reduction.
+        for start in range(0, len(hashes), _SIGNATURE_CHUNK):
+            h = hashes[start:start + _SIGNATURE_CHUNK]
+            d = doc_of[start:start + _SIGNATURE_CHUNK]
+            permuted = (h[:, np.newaxis] * self._a + self._b) % _PRIME    # (chunk × perm)
+            docs, first = np.unique(d, return_index=True)
+            sig[docs] = np.minimum(sig[docs], np.minimum.reduceat(permuted, first, axis=0))
+
+        has_shingles = np.zeros(n, dtype=bool)
+        has_shingles[doc_of] = True
+        return sig, has_shingles
+
+    # ─── Banding ──────────────────────────────────────────────────────────────
+
+    def candidate_pairs(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate index pairs (i < j) that share at least one LSH bucket,
+        deduplicated and ordered by (i, j).
+        """
+        sig, valid = self.signatures(texts)
+        idx = np.flatnonzero(valid)
+        pair_keys = []
+
+        n = len(texts)
+        for band in range(self.bands):
+            block = np.ascontiguousarray(sig[idx, band * self.rows:(band + 1) * self.rows])
+            keys = block.view(np.dtype((np.void, block.dtype.itemsize * self.rows))).ravel()
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            members = idx[order].astype(np.int64)     # documents, grouped by bucket
+
+            # Bucket id, bucket size and position-in-bucket for every entry
+            new_bucket = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            bucket = np.cumsum(new_bucket) - 1
+            starts = np.flatnonzero(new_bucket)
+            sizes = np.diff(np.append(starts, len(order)))
+            size_of = sizes[bucket]
+            pos = np.arange(len(order)) - starts[bucket]
+
+            # Small buckets: emit pairs (pos, pos + d) for every offset at once
+            small = size_of <= _SMALL_BUCKET
+            for d in range(1, _SMALL_BUCKET):
+                m = np.flatnonzero(small & (pos + d < size_of))
+                if len(m) == 0:
+                    break
+                a, b = members[m], members[m + d]
+                pair_keys.append(np.minimum(a, b) * n + np.maximum(a, b))
+
+            # Larger buckets: one triangle per bucket, degenerate ones skipped
+            large = (sizes > _SMALL_BUCKET) & (sizes <= self.max_bucket_size)
+            for start, size in zip(starts[large].tolist(), sizes[large].tolist()):
+                group = np.sort(members[start:start + size])
+                i, j = np.triu_indices(size, k=1)
+                pair_keys.append(group[i] * n + group[j])
+
+        if not pair_keys:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        keys = np.unique(np.concatenate(pair_keys))
+        return keys // n, keys % n
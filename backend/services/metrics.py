@@ -0,0 +1,223 @@
+"""
+Pipeline Metrics — stage spans, latency histograms and counters.
+
+`with span("normalize.parse"):` times one stage of the pipeline. Every
+span feeds the process-wide `examforge_stage_seconds` histogram (and
+`examforge_stage_errors_total` when the stage raises); spans that run
+inside an HTTP request are also collected for that request, which is
+where the Server-Timing header and the ?profile=1 report come from.
+
+Stage names are dotted, coarse-to-fine:
+
+  upload.digest  upload.read  upload.save
+  ingest.pdf  ingest.docx  ingest.text  ingest.image  ocr.page
+  normalize.parse  normalize.answer_key  normalize.assemble
+  responses.parse
+  stats.encode  stats.score  stats.report  stats.bootstrap
+  similarity.vectorize  similarity.pairs  similarity.report
+  response.serialize
+
+`render()` writes the registry in the Prometheus text exposition format
+(served at GET /api/metrics). Values are per process — with several
+uvicorn workers, scrape each one. Spans recorded inside process-pool
+workers (PDF page ranges, batch analysis) are not seen by the parent.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Upper bounds in seconds; +Inf is implicit
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+# ─── Metric types ─────────────────────────────────────────────────────────────
+
+class Counter:
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labels, labels), 0.0)
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label key → [per-bucket counts (last = +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labels, labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(_label_key(self.labels, labels))
+            return series[2] if series else 0
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((k, [list(s[0]), s[1], s[2]]) for k, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.labels + ("le",), key + (le,))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), **kwargs) -> Histogram:
+        return self._register(Histogram(name, help, labels, **kwargs))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        out: List[str] = []
+        for metric in metrics:
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        return "\n".join(out) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+
+def _label_key(names: Tuple[str, ...], labels: Dict[str, str]) -> Tuple[str, ...]:
+    return tuple(str(labels.get(n, "")) for n in names)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ─── Process-wide registry ────────────────────────────────────────────────────
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "examforge_stage_seconds", "Time spent in each pipeline stage.", ("stage",)
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "examforge_stage_errors_total", "Pipeline stages that raised.", ("stage",)
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "examforge_http_requests_total", "HTTP requests served.", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "examforge_http_request_seconds",
+    "HTTP latency until the response starts (streamed bodies continue after).",
+    ("method", "route"),
+)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ─── Spans ────────────────────────────────────────────────────────────────────
+
+# Spans of the current request as (name, seconds) in completion order;
+# None outside a request. Thread-pool work inherits the request's context.
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "request_spans", default=None
+)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time one pipeline stage."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((name, elapsed))
+
+
+@contextmanager
+def request_spans() -> Iterator[List[Tuple[str, float]]]:
+    """Collect the spans recorded in this context (one HTTP request)."""
+    spans: List[Tuple[str, float]] = []
+    token = _request_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _request_spans.reset(token)
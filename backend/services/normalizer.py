@@ -1,88 +1,159 @@
 """
 Normalization Engine — Phase 2 Core.
 
-Converts cleaned raw text into a structured Exam object using
-multi-pattern regex matching for:
+Converts cleaned raw text into a structured Exam object in one streaming
+pass, classifying every line with a single fused regex for:
   - Question detection (numbered, Q-prefixed, etc.)
   - Option detection ((a)/(A)/A./i) formats)
   - Answer key detection (inline or trailing)
+
+Trailing answer keys — grids ("1-C 2-A 3-D"), tables and per-line pairs
+— are split off the raw lines before cleaning (services/answer_key.py)
+and fill correct_option of questions without an inline answer once
+parsing is done.
 """
 import re
-from typing import List, Tuple, Optional
-from backend.core.models import Exam, Question, Option, NormalizationResult
-from backend.services.cleaner import clean_text
-
-
-# ─── Regex Patterns ──────────────────────────────────────────────────────────
-
-# Matches question starters:
-# - With Q: "Q1", "Q.1", "Question 1:" (allows spaces after)
-# - Without Q: "1.", "1)", "1-" (MUST have a punctuation mark AND space or eol to prevent matching "5.20m")
-_QUESTION_START = re.compile(
-    r"^(?:Q(?:uestion)?\s*(\d{1,3})[\s.)\-:]*|(\d{1,3})[.)\-:]+(?=\s|$))\s*(.*)",
-    re.IGNORECASE
-)
-
-# Matches option lines:
-# - "(a)", "(A)", "a.", "A)", "i)"
-# - MUST have a surrounding parenthesis or a trailing punctuation mark.
-_OPTION_START = re.compile(
-    r"^(?:\(([A-Ea-e]|[ivxIVX]{1,4})\)|([A-Ea-e]|[ivxIVX]{1,4})[.)\-:])\s*(.*)$"
-)
-
-# Matches answer key lines:
-_ANSWER_LINE = re.compile(
-    r"^(?:answer|ans|correct\s+answer|key)[\s:.\-]+\(?([A-Ea-e])\)?",
-    re.IGNORECASE
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
+from backend.core.models import Question, NormalizationResult
+from backend.core.records import OptionRecord, QuestionRecord
+from backend.services.answer_key import apply_answer_key, split_answer_key
+from backend.services.cleaner import iter_clean_lines
+from backend.services.metrics import span
+
+
+# ─── Line Classifier ─────────────────────────────────────────────────────────
+
+# Every cleaned line is classified by ONE match against a fused alternation;
+# the named group that participates tells the line kind:
+#
+#   answer    "Answer: C", "Ans - (b)", "Key: A", "Correct answer: d"
+#   question  - With Q: "Q1", "Q.1", "Question 1:" (allows spaces after)
+#             - Without Q: "1.", "1)", "1-" (MUST have a punctuation mark AND
+#               space or eol to prevent matching "5.20m")
+#   option    "(a)", "(A)", "a.", "A)", "i)" — MUST have a surrounding
+#             parenthesis or a trailing punctuation mark (case-sensitive
+#             class, so the i flag is scoped to the other two branches)
+#   anything else is a continuation line
+#
+# The three branches cannot match the same line, so the alternation order
+# only matters for speed.
+_LINE = re.compile(
+    r"(?i:(?:answer|ans|correct\s+answer|key)[\s:.\-]+\(?(?P<answer>[A-Ea-e])\)?)"
+    r"|(?i:(?:Q(?:uestion)?\s*(?P<q_num>\d{1,3})[\s.)\-:]*|(?P<q_bare>\d{1,3})[.)\-:]+(?=\s|$))\s*(?P<q_text>.*))"
+    r"|(?:\((?P<opt>[A-Ea-e]|[ivxIVX]{1,4})\)|(?P<opt_bare>[A-Ea-e]|[ivxIVX]{1,4})[.)\-:])\s*(?P<opt_text>.*)$"
 )
 
 
 # ─── Main Normalizer ─────────────────────────────────────────────────────────
 
 def normalize(raw_text: str, source_file: str = None) -> NormalizationResult:
-    cleaned = clean_text(raw_text)
-    questions, warnings = _parse_questions(cleaned)
-
-    exam = Exam(
-        source_file=source_file,
-        total_questions=len(questions),
-        questions=questions,
-    )
-
-    return NormalizationResult(
-        exam=exam,
-        warnings=warnings,
-        raw_text_preview=cleaned[:500] if cleaned else None,
-    )
+    warnings: List[str] = []
+    preview: List[str] = []
+    answer_key: Dict[str, str] = {}
+    # Records go straight into one validation of the whole result
+    with span("normalize.parse"):           # cleaning runs fused into this pass
+        records = list(_iter_parsed(_clean(raw_text, preview, answer_key), warnings))
+    if answer_key:
+        with span("normalize.answer_key"):
+            apply_answer_key(records, answer_key, warnings)
+    with span("normalize.assemble"):
+        return assemble_result(records, warnings, preview, source_file)
+
+
+def iter_questions(
+    lines: Union[str, Iterable[str]],
+    warnings: Optional[List[str]] = None,
+    preview: Optional[List[str]] = None,
+    answer_key: Optional[Dict[str, str]] = None,
+) -> Iterator[Question]:
+    """
+    Yield each Question as soon as it is complete (the next question
+    starts, or input ends). `lines` are raw extracted lines — any iterable,
+    e.g. fed page by page — cleaned on the fly in the same pass.
+
+    Parse warnings are appended to `warnings`; the first ~500 characters
+    of cleaned lines to `preview`. Answer-key lines are kept out of the
+    questions and collected into `answer_key` — it is only complete once
+    the stream is exhausted, so apply it (apply_answer_key) afterwards.
+    """
+    key = {} if answer_key is None else answer_key
+    records = _iter_parsed(_clean(lines, preview, key), [] if warnings is None else warnings)
+    return (r.to_model() for r in records)
+
+
+def assemble_result(
+    questions: List[Union[Question, QuestionRecord]],
+    warnings: List[str],
+    preview: List[str],
+    source_file: Optional[str] = None,
+) -> NormalizationResult:
+    """
+    Build the NormalizationResult in one validation pass. `questions` may
+    be Question models (already validated, kept as is) or QuestionRecords.
+    """
+    cleaned = "\n".join(preview)
+    return NormalizationResult.model_validate({
+        "exam": {
+            "source_file": source_file,
+            "total_questions": len(questions),
+            "questions": questions,
+        },
+        "warnings": warnings,
+        "raw_text_preview": cleaned[:500] if cleaned else None,
+    }, from_attributes=True)
+
+
+def _clean(
+    lines: Union[str, Iterable[str]],
+    preview: Optional[List[str]],
+    answer_key: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    if answer_key is not None:
+        # Before cleaning: it drops lone numbers and "Answer Key" titles
+        lines = split_answer_key(lines.splitlines() if isinstance(lines, str) else lines, answer_key)
+    cleaned = iter_clean_lines(lines)
+    if preview is not None:
+        cleaned = _tap_preview(cleaned, preview)
+    return cleaned
+
+
+def _tap_preview(lines: Iterable[str], preview: List[str], limit: int = 500) -> Iterator[str]:
+    size = 0
+    for line in lines:
+        if size < limit:
+            preview.append(line)
+            size += len(line) + 1
+        yield line
 
 
-def _parse_questions(text: str) -> Tuple[List[Question], List[str]]:
-    lines = text.splitlines()
-    questions: List[Question] = []
+def _parse_questions(text: str) -> Tuple[List[QuestionRecord], List[str]]:
     warnings: List[str] = []
+    return list(_iter_parsed(text.splitlines(), warnings)), warnings
 
+
+def _iter_parsed(lines: Iterable[str], warnings: List[str]) -> Iterator[QuestionRecord]:
     current_q_num: Optional[int] = None
     current_q_text: List[str] = []
-    current_options: List[Option] = []
+    # (label, text parts); parts are joined once on flush instead of
+    # re-concatenating the option text for every continuation line
+    current_options: List[Tuple[str, List[str]]] = []
     current_answer: Optional[str] = None
     
     # State tracking: "TEXT" or "OPTION"
     # If "OPTION", we append subsequent lines to the LAST option's text
     current_state = "ROOT" 
 
-    def _flush():
-        nonlocal current_q_num, current_q_text, current_options, current_answer
-        
+    def _flush() -> Optional[QuestionRecord]:
         # Don't save if there's no actual question text (e.g., random "1." from a grid)
         full_text = " ".join(current_q_text).strip()
         if current_q_num is None or not full_text:
-            return
+            return None
 
-        q = Question(
-            id=current_q_num,
-            text=full_text,
-            options=current_options[:],
-            correct_option=current_answer,
+        q = QuestionRecord(
+            current_q_num,
+            full_text,
+            [OptionRecord(label, " ".join(parts).strip()) for label, parts in current_options],
+            current_answer,
         )
 
         if not current_options:
@@ -91,41 +162,44 @@ def _parse_questions(text: str) -> Tuple[List[Question], List[str]]:
             q.is_flagged = True
             q.flag_reason = "Fewer than 2 options found."
 
-        questions.append(q)
+        return q
 
     for line in lines:
         line = line.strip()
         if not line:
             continue
 
-        # 1. Check for answer key
-        ans_match = _ANSWER_LINE.match(line)
-        if ans_match and current_q_num is not None:
-            current_answer = ans_match.group(1).upper()
-            continue
-
-        # 2. Check for new question
-        q_match = _QUESTION_START.match(line)
-        if q_match:
-            _flush()  # save previous
-            q_num_str = q_match.group(1) or q_match.group(2)
-            current_q_num = int(q_num_str)
-            remainder = q_match.group(3)
-            current_q_text = [remainder.strip()] if remainder.strip() else []
-            current_options = []
-            current_answer = None
-            current_state = "TEXT"
-            continue
-
-        # 3. Check for option line
-        opt_match = _OPTION_START.match(line)
-        # Avoid matching random standalone text as options unless we are currently inside a question
-        if opt_match and current_q_num is not None:
-            label = (opt_match.group(1) or opt_match.group(2)).upper()
-            remainder = opt_match.group(3)
-            current_options.append(Option(label=label, text=remainder.strip() if remainder else ""))
-            current_state = "OPTION"
-            continue
+        m = _LINE.match(line)
+        if m is not None:
+            # 1. Answer key
+            answer = m.group("answer")
+            if answer is not None:
+                if current_q_num is not None:
+                    current_answer = answer.upper()
+                continue
+
+            # 2. New question
+            q_num_str = m.group("q_num") or m.group("q_bare")
+            if q_num_str is not None:
+                q = _flush()  # emit previous
+                if q is not None:
+                    yield q
+                current_q_num = int(q_num_str)
+                remainder = m.group("q_text").strip()
+                current_q_text = [remainder] if remainder else []
+                current_options = []
+                current_answer = None
+                current_state = "TEXT"
+                continue
+
+            # 3. Option line — only inside a question, so stray "a." text
+            #    before the first question is ignored
+            if current_q_num is not None:
+                label = (m.group("opt") or m.group("opt_bare")).upper()
+                remainder = m.group("opt_text")
+                current_options.append((label, [remainder.strip() if remainder else ""]))
+                current_state = "OPTION"
+                continue
 
         # 4. Continuation line
         if current_q_num is not None:
@@ -133,8 +207,8 @@ def _parse_questions(text: str) -> Tuple[List[Question], List[str]]:
                 current_q_text.append(line)
             elif current_state == "OPTION" and len(current_options) > 0:
                 # Append to the last option's text
-                last_opt = current_options[-1]
-                last_opt.text = (last_opt.text + " " + line).strip()
+                current_options[-1][1].append(line)
 
-    _flush()
-    return questions, warnings
+    q = _flush()
+    if q is not None:
+        yield q
@@ -0,0 +1,251 @@
+"""
+OCR Backends + Page-level Work Queue.
+
+Every OCR engine implements one method:
+
+    recognize(image: bytes, filename: str) -> str
+
+Backends (selected with the OCR_BACKEND env var):
+  - "ocr_space"  (default) → remote OCR.space API, one request per page
+  - "tesseract"            → local Tesseract via pytesseract (optional dependency)
+  - "static"               → deterministic stand-in for tests and offline dev
+
+OCRPageQueue feeds rasterized pages to a bounded pool of worker threads.
+Producers block once `max_pending` pages are waiting, so memory stays
+bounded while extraction and OCR overlap; results are reassembled in page
+order and progress is reported per finished page.
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+import requests
+from dotenv import load_dotenv
+
+from backend.services.metrics import span
+
+load_dotenv()
+
+OCR_BACKEND = os.getenv("OCR_BACKEND", "ocr_space")
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "4"))
+
+OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY", "helloworld")
+OCR_SPACE_URL = "https://api.ocr.space/parse/image"
+
+# on_progress(page_number, pages_done, pages_submitted)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+
+class OCRBackend:
+    name = "base"
+
+    def recognize(self, image: bytes, filename: str) -> str:
+        raise NotImplementedError
+
+
+class OCRSpaceBackend(OCRBackend):
+    """Remote OCR.space API. Docs: https://ocr.space/ocrapi"""
+
+    name = "ocr_space"
+
+    def __init__(self, api_key: str = OCR_SPACE_API_KEY, timeout: int = 60):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def recognize(self, image: bytes, filename: str) -> str:
+        if not self.api_key:
+            raise RuntimeError(
+                "OCR_SPACE_API_KEY is not set. "
+                "Add it to your .env file: OCR_SPACE_API_KEY=your_key_here"
+            )
+
+        payload = {
+            "apikey": self.api_key,
+            "language": "eng",
+            "isOverlayRequired": False,
+            "detectOrientation": True,
+            "scale": True,
+            "OCREngine": 2,       # Engine 2 handles complex layouts better
+            "isCreateSearchablePdf": False,
+            "isSearchablePdfHideTextLayer": False,
+        }
+
+        try:
+            response = requests.post(
+                OCR_SPACE_URL,
+                data=payload,
+                files={"filename": (filename, image)},
+                timeout=self.timeout,
+            )
+
+            response.raise_for_status()
+            result = response.json()
+
+            # OCR.space error handling
+            if result.get("IsErroredOnProcessing"):
+                error_msg = result.get("ErrorMessage", ["Unknown OCR error"])
+                if isinstance(error_msg, list):
+                    error_msg = " | ".join(error_msg)
+                raise RuntimeError(f"OCR.space API error: {error_msg}")
+
+            parsed_results = result.get("ParsedResults", [])
+            if not parsed_results:
+                raise RuntimeError("OCR.space returned no parsed results.")
+
+            full_text = "\n".join(
+                pr.get("ParsedText", "") for pr in parsed_results
+            )
+
+            return full_text.strip()
+
+        except requests.exceptions.Timeout:
+            raise RuntimeError(
+                "OCR.space API timed out. "
+                "The file may be too large or the service is slow."
+            )
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"OCR.space network error: {e}")
+
+
+class TesseractBackend(OCRBackend):
+    """Local OCR engine. Requires `pip install pytesseract` and the tesseract binary."""
+
+    name = "tesseract"
+
+    def __init__(self, lang: str = "eng"):
+        try:
+            import pytesseract
+        except ImportError:
+            raise RuntimeError(
+                "OCR_BACKEND=tesseract requires the 'pytesseract' package "
+                "and the tesseract binary: pip install pytesseract"
+            )
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def recognize(self, image: bytes, filename: str) -> str:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image)) as img:
+            return self._pytesseract.image_to_string(img, lang=self.lang).strip()
+
+
+class StaticOCRBackend(OCRBackend):
+    """
+    Deterministic stand-in: returns `text` (formatted with {filename}) or
+    the result of calling it. Records every call for assertions.
+    """
+
+    name = "static"
+
+    def __init__(self, text: Union[str, Callable[[bytes, str], str]] = "OCR[{filename}]"):
+        self.text = text
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def recognize(self, image: bytes, filename: str) -> str:
+        with self._lock:
+            self.calls.append(filename)
+        if callable(self.text):
+            return self.text(image, filename)
+        return self.text.format(filename=filename)
+
+
+_BACKENDS = {
+    "ocr_space": OCRSpaceBackend,
+    "tesseract": TesseractBackend,
+    "static": StaticOCRBackend,
+}
+
+_backend: Optional[OCRBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_ocr_backend() -> OCRBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if OCR_BACKEND not in _BACKENDS:
+                raise RuntimeError(
+                    f"Unknown OCR_BACKEND '{OCR_BACKEND}'. Choose from: {sorted(_BACKENDS)}"
+                )
+            _backend = _BACKENDS[OCR_BACKEND]()
+        return _backend
+
+
+def set_ocr_backend(backend: Optional[OCRBackend]) -> None:
+    """Install a backend instance process-wide (None → re-read OCR_BACKEND)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+# ─── Page-level work queue ────────────────────────────────────────────────────
+
+class OCRPageQueue:
+
+    def __init__(
+        self,
+        backend: Optional[OCRBackend] = None,
+        max_workers: int = OCR_WORKERS,
+        max_pending: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self.on_progress = on_progress
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * self.max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "OCRPageQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, page_number: int, image: bytes, filename: Optional[str] = None) -> Future:
+        """Queue one rasterized page; blocks while the queue is full."""
+        if self.backend is None:
+            self.backend = get_ocr_backend()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ocr"
+            )
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                self._run, page_number, image, filename or f"page-{page_number}.png"
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        self._futures[page_number] = future
+        return future
+
+    def results(self) -> Dict[int, str]:
+        """Wait for every queued page; {page_number: text}. Re-raises the first error."""
+        return {page: self._futures[page].result() for page in sorted(self._futures)}
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, page_number: int, image: bytes, filename: str) -> str:
+        try:
+            with span("ocr.page"):
+                text = self.backend.recognize(image, filename)
+        finally:
+            self._slots.release()
+        if self.on_progress is not None:
+            with self._lock:
+                self._done += 1
+                self.on_progress(page_number, self._done, len(self._futures))
+        return text
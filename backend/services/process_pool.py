@@ -0,0 +1,40 @@
+"""
+Process pools for the CPU-bound services: PDF page ranges (ingestion),
+bootstrap resampling, the IRT M-step and /api/analyze/batch.
+
+Each service asks for its pool by name with its own worker count
+(PDF_EXTRACT_WORKERS, BOOTSTRAP_WORKERS, IRT_WORKERS, BATCH_WORKERS); the
+pool is created on first use and reused after that.
+
+Workers are started with "spawn": forking a server that already runs
+threads (the request threadpool, OCR and job executors) copies whatever
+locks those threads hold into the child, where nothing will ever release
+them. The app calls shutdown_pools() on shutdown.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_CONTEXT = multiprocessing.get_context("spawn")
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, max_workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ProcessPoolExecutor(max_workers=max_workers, mp_context=_CONTEXT)
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stop every worker process; a later get_pool() starts a fresh pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
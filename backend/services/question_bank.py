@@ -0,0 +1,314 @@
+"""
+Persistent Question Bank Index — cross-exam duplicate detection.
+
+Every ingested exam is vectorized once and stored on disk; a new paper
+is then checked against the whole bank without re-vectorizing the corpus.
+
+Vectors are hashed (unigrams + bigrams, English stop words removed,
+sublinear TF, L2-normalized — the similarity pipeline's TF-IDF settings
+minus IDF). Hashing needs no fitted vocabulary, so every word of every
+question counts towards its norm: a long question that shares a few
+words with a short bank question scores low instead of being reduced to
+the shared words. IDF is left out because the bank's document
+frequencies change with every insertion and stored vectors would go
+stale; stop-word removal takes out most of what it would down-weight.
+
+On-disk layout (all arrays are .npy, opened with mmap_mode="r"):
+
+  <bank>/vectorizer.json          hashing settings
+  <bank>/shards/00000/            one shard per insertion or merge
+      data.npy  indices.npy  indptr.npy   postings: CSR (features × shard rows)
+      meta.jsonl                          {exam_id, question_id, text} per row
+      merged.json                         shards this one replaces (merges only)
+
+Shards are stored as an inverted index (term → rows), so a query only
+touches the postings of terms that actually occur in the query. Every
+insertion adds a shard; once there are more than QUESTION_BANK_MAX_SHARDS
+they are merged into one, so a query walks a bounded number of shards.
+Adding an exam_id that is already in the bank rewrites the shards that
+hold its old rows, so every exam appears once.
+A bank written with a fitted vocabulary is re-vectorized from its stored
+texts when opened.
+"""
+
+import json
+import os
+import shutil
+import threading
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize as l2_normalize
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.models import Exam
+from backend.services.similarity_engine import (
+    TFIDF_PARAMS, DUPLICATE_THRESHOLD, NEAR_DUP_THRESHOLD
+)
+
+
+QUESTION_BANK_DIR = os.getenv("QUESTION_BANK_DIR", "question_bank")
+QUESTION_BANK_MAX_SHARDS = int(os.getenv("QUESTION_BANK_MAX_SHARDS", "8"))
+
+# Hashed feature space; a shard's indptr holds one entry per feature
+HASH_FEATURES = 1 << 18
+_HASHING_PARAMS = dict(
+    ngram_range=TFIDF_PARAMS["ngram_range"],
+    stop_words=TFIDF_PARAMS["stop_words"],
+    n_features=HASH_FEATURES,
+    alternate_sign=False,
+    norm=None,
+)
+
+
+class _Shard:
+    __slots__ = ("name", "postings", "meta")
+
+    def __init__(self, name: str, postings: sp.csr_matrix, meta: List[Dict]):
+        self.name = name
+        self.postings = postings        # (features × rows), float32
+        self.meta = meta
+
+
+class QuestionBankIndex:
+
+    def __init__(self, directory: str = QUESTION_BANK_DIR, max_shards: int = QUESTION_BANK_MAX_SHARDS):
+        self.directory = directory
+        self.max_shards = max(1, max_shards)
+        self._shard_dir = os.path.join(directory, "shards")
+        self._vectorizer = HashingVectorizer(**_HASHING_PARAMS, dtype=np.float32)
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    # ─── Introspection ────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return sum(len(s.meta) for s in self._shards)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Distinct hashed terms in the bank."""
+        used = np.zeros(HASH_FEATURES, dtype=bool)
+        for shard in self._shards:
+            used |= np.diff(shard.postings.indptr) > 0
+        return int(used.sum())
+
+    # ─── Insertion ────────────────────────────────────────────────────────────
+
+    def add_exam(self, exam: Exam) -> int:
+        """
+        Vectorize an exam's questions and append them as a new shard,
+        merging the shards once there are more than max_shards. Adding an
+        exam_id that is already in the bank replaces its earlier rows.
+        Returns the number of questions added.
+        """
+        meta = [
+            {"exam_id": exam.exam_id, "question_id": q.id, "text": q.text.strip()}
+            for q in exam.questions if q.text.strip()
+        ]
+        vectors = self._vectorize([m["text"] for m in meta]).T if meta else None
+
+        with self._lock:
+            stale = [s for s in self._shards if any(m["exam_id"] == exam.exam_id for m in s.meta)]
+            if stale:
+                # Rewrite the shards holding the old copy, minus its rows
+                self._replace(stale, exam.exam_id, vectors, meta)
+            elif meta:
+                self._write_shard(vectors, meta)
+            if len(self._shards) > self.max_shards:
+                self._merge()
+        return len(meta)
+
+    def rebuild(self) -> None:
+        """Re-vectorize every stored question into a single shard."""
+        with self._lock:
+            self._rebuild()
+
+    # ─── Query ────────────────────────────────────────────────────────────────
+
+    def query(
+        self,
+        texts: List[str],
+        top_k: int = 5,
+        min_score: float = NEAR_DUP_THRESHOLD,
+        exclude_exam_id: Optional[str] = None,
+    ) -> List[List[Tuple[float, Dict]]]:
+        """
+        For each query text, the best `top_k` bank questions with cosine
+        similarity ≥ min_score, as (score, meta) sorted by score descending.
+        """
+        results: List[List[Tuple[float, Dict]]] = [[] for _ in texts]
+        shards = self._shards                   # snapshot; writers swap the list
+        if not texts or not shards:
+            return results
+
+        q = self._vectorize(texts)
+        for shard in shards:
+            # (queries × features) @ (features × rows) — walks only the query terms' postings
+            sims = (q @ shard.postings).tocsr()
+            for i in range(sims.shape[0]):
+                lo, hi = sims.indptr[i], sims.indptr[i + 1]
+                cols, vals = sims.indices[lo:hi], sims.data[lo:hi]
+                keep = vals >= min_score
+                for col, val in zip(cols[keep].tolist(), vals[keep].tolist()):
+                    m = shard.meta[col]
+                    if exclude_exam_id is not None and m["exam_id"] == exclude_exam_id:
+                        continue
+                    results[i].append((val, m))
+
+        for i, hits in enumerate(results):
+            hits.sort(key=lambda h: -h[0])
+            results[i] = hits[:top_k]
+        return results
+
+    # ─── Vectors ──────────────────────────────────────────────────────────────
+
+    def _vectorize(self, texts: List[str]) -> sp.csr_matrix:
+        vectors = self._vectorizer.transform(texts)
+        np.log(vectors.data, out=vectors.data)      # sublinear TF: 1 + log(tf)
+        vectors.data += 1
+        return l2_normalize(vectors, copy=False)
+
+    # ─── Persistence ──────────────────────────────────────────────────────────
+
+    def _merge(self) -> None:
+        """Replace every shard with one holding all their rows."""
+        self._replace(self._shards)
+
+    def _replace(
+        self,
+        old: List[_Shard],
+        drop_exam_id: Optional[str] = None,
+        postings: Optional[sp.spmatrix] = None,
+        meta: Optional[List[Dict]] = None,
+    ) -> None:
+        """
+        Replace `old` with one shard holding their rows (minus those of
+        drop_exam_id) followed by `postings` / `meta`.
+        """
+        parts, rows = [], []
+        for shard in old:
+            keep = [i for i, m in enumerate(shard.meta) if m["exam_id"] != drop_exam_id]
+            if len(keep) < len(shard.meta):
+                parts.append(shard.postings[:, keep])
+                rows.extend(shard.meta[i] for i in keep)
+            else:
+                parts.append(shard.postings)
+                rows.extend(shard.meta)
+        if meta:
+            parts.append(postings)
+            rows.extend(meta)
+
+        names = {s.name for s in old}
+        if rows:
+            self._write_shard(sp.hstack(parts, format="csr"), rows, replaces=sorted(names))
+        self._shards = [s for s in self._shards if s.name not in names]
+        for name in names:
+            shutil.rmtree(os.path.join(self._shard_dir, name), ignore_errors=True)
+
+    def _rebuild(self) -> None:
+        old = self._shards
+        meta = [m for s in old for m in s.meta]
+        self._shards = []
+        shutil.rmtree(self._shard_dir, ignore_errors=True)
+        idf_path = os.path.join(self.directory, "idf.npy")      # fitted-vocabulary banks
+        if os.path.exists(idf_path):
+            os.remove(idf_path)
+        self._write_settings()
+        if meta:
+            self._write_shard(self._vectorize([m["text"] for m in meta]).T, meta)
+
+    def _write_settings(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "vectorizer.json"), "w", encoding="utf-8") as f:
+            json.dump({"hashing": _settings()}, f)
+
+    def _write_shard(
+        self, postings: sp.spmatrix, meta: List[Dict], replaces: Optional[List[str]] = None
+    ) -> None:
+        if not os.path.exists(os.path.join(self.directory, "vectorizer.json")):
+            self._write_settings()
+        postings = postings.tocsr().astype(np.float32)
+        postings.sort_indices()
+        names = [s.name for s in self._shards]
+        name = f"{int(max(names)) + 1 if names else 0:05d}"
+        path = os.path.join(self._shard_dir, name)
+        tmp = path + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, "data.npy"), postings.data)
+        np.save(os.path.join(tmp, "indices.npy"), postings.indices.astype(np.int32))
+        np.save(os.path.join(tmp, "indptr.npy"), postings.indptr.astype(np.int64))
+        with open(os.path.join(tmp, "meta.jsonl"), "w", encoding="utf-8") as f:
+            for m in meta:
+                f.write(json.dumps(m) + "\n")
+        if replaces:
+            with open(os.path.join(tmp, "merged.json"), "w", encoding="utf-8") as f:
+                json.dump(replaces, f)
+        os.replace(tmp, path)                   # shard becomes visible atomically
+        self._shards = self._shards + [self._read_shard(path)]
+
+    def _read_shard(self, path: str) -> _Shard:
+        data    = np.load(os.path.join(path, "data.npy"), mmap_mode="r")
+        indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+        indptr  = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+        with open(os.path.join(path, "meta.jsonl"), encoding="utf-8") as f:
+            meta = [json.loads(line) for line in f if line.strip()]
+        postings = sp.csr_matrix(
+            (data, indices, indptr), shape=(len(indptr) - 1, len(meta)), copy=False
+        )
+        return _Shard(os.path.basename(path), postings, meta)
+
+    def _load(self) -> None:
+        if not os.path.isdir(self._shard_dir):
+            return
+        names = sorted(n for n in os.listdir(self._shard_dir) if not n.endswith(".tmp"))
+        # A merge that was interrupted before removing its inputs
+        replaced = set()
+        for name in names:
+            merged = os.path.join(self._shard_dir, name, "merged.json")
+            if os.path.exists(merged):
+                with open(merged, encoding="utf-8") as f:
+                    replaced.update(json.load(f))
+        for name in names:
+            path = os.path.join(self._shard_dir, name)
+            if name in replaced:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                self._shards.append(self._read_shard(path))
+
+        vec_path = os.path.join(self.directory, "vectorizer.json")
+        saved = {}
+        if os.path.exists(vec_path):
+            with open(vec_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        if saved.get("hashing") != _settings():
+            # Fitted-vocabulary (or differently hashed) bank: re-vectorize
+            self._rebuild()
+
+
+def _settings() -> Dict:
+    """_HASHING_PARAMS as stored in vectorizer.json."""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in _HASHING_PARAMS.items()}
+
+
+def classify_score(score: float) -> str:
+    return "duplicate" if score >= DUPLICATE_THRESHOLD else "near_duplicate"
+
+
+# ─── Process-wide bank ────────────────────────────────────────────────────────
+
+_bank: Optional[QuestionBankIndex] = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBankIndex:
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBankIndex(QUESTION_BANK_DIR)
+        return _bank
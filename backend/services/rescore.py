@@ -0,0 +1,176 @@
+"""
+Answer-Key Re-scoring — cheap reruns after items are regraded.
+
+A ScoredSitting keeps everything about a sitting that does not depend on
+the answer key (the code matrix and its option counts) next to the parts
+that do (boolean score matrix, raw totals, per-item correct counts and
+the 27% groups). `rescore(new_key)` then touches only what the key change
+can affect:
+
+  score columns      regathered for changed items only   O(n × changed)
+  raw totals         updated by the per-student delta    O(n × changed)
+  correct counts     changed items only                  O(n × changed)
+  27% groups         re-sorted only if any total moved   O(n log n)
+  top/bottom means   changed items only, unless the groups moved
+  Σ item × total     changed items only, unless a total moved
+  Cronbach's Alpha   from p-values and the totals        O(n + k)
+
+Distractor counts never change under a new key, so only the correct /
+effective flags are rebuilt. The result is an ExamStatsDiff against the
+previous key; the new key then becomes the baseline for the next call.
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional
+
+from backend.core.models import Exam
+from backend.core.stat_models import (
+    ExamStats, ExamStatsDiff, FieldChange, QuestionStatDiff
+)
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.stats_engine import AnswerKey, StatisticalEngine, normalize_answer_key
+
+
+RESCORE_CACHE_SIZE = int(os.getenv("RESCORE_CACHE_SIZE", "8"))
+
+_EXAM_FIELDS = ("average_score", "score_std_dev", "cronbach_alpha",
+                "reliability_label", "difficulty_distribution", "flagged_question_count")
+_QUESTION_FIELDS = ("difficulty_index", "difficulty_label", "discrimination_index",
+                    "discrimination_label", "point_biserial", "corrected_item_total",
+                    "alpha_if_deleted", "is_flagged", "flag_reasons", "distractors")
+
+
+class ScoredSitting:
+
+    def __init__(self, exam: Exam, matrix: ResponseMatrix, correct_answers: AnswerKey):
+        if matrix.n_students < 2:
+            raise ValueError("At least 2 student responses required for statistical analysis.")
+        self.exam = exam
+        self.matrix = matrix.select([str(q.id) for q in exam.questions])
+        self.option_counts = self.matrix.option_counts()
+        self._cols = np.arange(self.matrix.n_questions, dtype=np.intp)
+        self._lock = threading.Lock()
+
+        self.key = normalize_answer_key(correct_answers)
+        self.accepted = StatisticalEngine._accepted_table(self.matrix, self.key)
+        self.scores = self.accepted[self._cols[np.newaxis, :], self.matrix.codes]
+        self.totals = self.scores.sum(axis=1, dtype=np.int64)
+        self.correct_counts = self.scores.sum(axis=0, dtype=np.int64)
+        self.item_total = _item_total(self.scores, self.totals)
+        self.top_idx, self.bottom_idx = StatisticalEngine._groups_27(self.totals)
+        self.top_correct = self.scores[self.top_idx].mean(axis=0)
+        self.bottom_correct = self.scores[self.bottom_idx].mean(axis=0)
+        self.stats = self._exam_stats()
+
+    # ─── Re-scoring ───────────────────────────────────────────────────────────
+
+    def rescore(self, correct_answers: AnswerKey) -> ExamStatsDiff:
+        """Apply a new answer key and return what changed in ExamStats."""
+        started = time.perf_counter()
+        with self._lock:
+            new_key = normalize_answer_key(correct_answers)
+            accepted = StatisticalEngine._accepted_table(self.matrix, new_key)
+            changed = np.flatnonzero((accepted != self.accepted).any(axis=1))
+            before = self.stats
+
+            if changed.size:
+                new_cols = accepted[changed[np.newaxis, :], self.matrix.codes[:, changed]]
+                delta = (new_cols.astype(np.int8) - self.scores[:, changed]).sum(
+                    axis=1, dtype=np.int64
+                )
+                self.scores[:, changed] = new_cols
+                self.correct_counts[changed] = new_cols.sum(axis=0)
+
+                if delta.any():
+                    # Raw totals moved → the 27% groups (and every item's D) may move
+                    self.totals += delta
+                    self.top_idx, self.bottom_idx = StatisticalEngine._groups_27(self.totals)
+                    self.top_correct = self.scores[self.top_idx].mean(axis=0)
+                    self.bottom_correct = self.scores[self.bottom_idx].mean(axis=0)
+                    self.item_total = _item_total(self.scores, self.totals)
+                else:
+                    self.top_correct[changed] = new_cols[self.top_idx].mean(axis=0)
+                    self.bottom_correct[changed] = new_cols[self.bottom_idx].mean(axis=0)
+                    self.item_total[changed] = _item_total(new_cols, self.totals)
+
+            self.accepted = accepted
+            self.key = new_key
+            self.stats = self._exam_stats()
+            return _diff(
+                before, self.stats,
+                [self.exam.questions[j].id for j in changed.tolist()],
+                (time.perf_counter() - started) * 1000,
+            )
+
+    def _exam_stats(self) -> ExamStats:
+        n = len(self.totals)
+        return StatisticalEngine._exam_stats(
+            self.exam, self.correct_counts / n, self.top_correct - self.bottom_correct,
+            self.totals, self.item_total, self.option_counts, self.matrix.labels, self.key,
+        )
+
+
+def _item_total(scores: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """Σ xᵢT per column, exact in int64 (einsum avoids NumPy's slow integer matmul)."""
+    return np.einsum("ij,i->j", scores, totals)
+
+
+def _changes(before, after, fields) -> List[FieldChange]:
+    changes = []
+    for name in fields:
+        old, new = getattr(before, name), getattr(after, name)
+        if old != new:
+            if isinstance(old, list):
+                old = [x.model_dump() if hasattr(x, "model_dump") else x for x in old]
+                new = [x.model_dump() if hasattr(x, "model_dump") else x for x in new]
+            changes.append(FieldChange(field=name, before=old, after=new))
+    return changes
+
+
+def _diff(before: ExamStats, after: ExamStats, rescored: List[int], elapsed_ms: float) -> ExamStatsDiff:
+    question_changes = []
+    for old_q, new_q in zip(before.question_stats, after.question_stats):
+        changes = _changes(old_q, new_q, _QUESTION_FIELDS)
+        if changes:
+            question_changes.append(
+                QuestionStatDiff(question_id=new_q.question_id, changes=changes)
+            )
+    return ExamStatsDiff(
+        exam_id=after.exam_id,
+        rescored_question_ids=rescored,
+        exam_changes=_changes(before, after, _EXAM_FIELDS),
+        question_changes=question_changes,
+        elapsed_ms=round(elapsed_ms, 3),
+    )
+
+
+# ─── Session cache ────────────────────────────────────────────────────────────
+# The last RESCORE_CACHE_SIZE scored sittings stay in memory, keyed by sitting_id.
+
+_sessions: "OrderedDict[str, ScoredSitting]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def put_scored_sitting(sitting_id: str, scored: ScoredSitting) -> None:
+    with _sessions_lock:
+        _sessions[sitting_id] = scored
+        _sessions.move_to_end(sitting_id)
+        while len(_sessions) > RESCORE_CACHE_SIZE:
+            _sessions.popitem(last=False)
+
+
+def get_scored_sitting(sitting_id: str) -> Optional[ScoredSitting]:
+    with _sessions_lock:
+        scored = _sessions.get(sitting_id)
+        if scored is not None:
+            _sessions.move_to_end(sitting_id)
+        return scored
+
+
+def drop_scored_sitting(sitting_id: str) -> None:
+    with _sessions_lock:
+        _sessions.pop(sitting_id, None)
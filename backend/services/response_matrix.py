@@ -0,0 +1,225 @@
+"""
+Columnar Response Matrix — compact encoding of student responses.
+
+Student answers are encoded once into an (n_students × n_questions) uint8
+code matrix so the statistical engines can work with batched NumPy
+operations instead of per-student dict lookups:
+
+  codes[i, j] = 0            → student i left question j blank (MISSING)
+  codes[i, j] = c  (c ≥ 1)   → student i chose labels[c]
+
+labels[0] is always "" (the missing sentinel). Labels are stored
+stripped and upper-cased, exactly as the scoring rules compare them.
+"""
+
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+
+MISSING = 0                 # code for a blank / missing response
+MAX_LABELS = 255            # uint8 codes 1..255 are available for labels
+
+
+class ResponseMatrix:
+
+    __slots__ = ("student_ids", "question_ids", "labels", "codes", "_label_codes")
+
+    def __init__(
+        self,
+        student_ids: List[str],
+        question_ids: List[str],
+        labels: List[str],
+        codes: np.ndarray,
+    ):
+        if codes.shape != (len(student_ids), len(question_ids)):
+            raise ValueError(
+                f"Code matrix shape {codes.shape} does not match "
+                f"{len(student_ids)} students × {len(question_ids)} questions."
+            )
+        if not labels or labels[0] != "":
+            raise ValueError("labels[0] must be the missing-response sentinel ''.")
+        self.student_ids = student_ids
+        self.question_ids = question_ids
+        self.labels = labels
+        self.codes = codes
+        self._label_codes = {lbl: c for c, lbl in enumerate(labels)}
+
+    # ─── Construction ─────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_dicts(
+        cls,
+        student_responses: List[Dict],
+        q_ids: List[str],
+    ) -> "ResponseMatrix":
+        """
+        Encode the engine's list-of-dicts input format:
+          [{"student_id": "S01", "responses": {"1": "C", ...}}, ...]
+        Only the question IDs in `q_ids` are kept (in that column order).
+        """
+        n, k = len(student_responses), len(q_ids)
+        codes = np.zeros((n, k), dtype=np.uint8)
+        labels = [""]
+        label_codes = {"": MISSING}
+        col_of = {q_id: j for j, q_id in enumerate(q_ids)}
+
+        for i, sr in enumerate(student_responses):
+            row = codes[i]
+            for q_id, ans in sr.get("responses", {}).items():
+                j = col_of.get(q_id)
+                if j is None:
+                    continue
+                lbl = ans.strip().upper()
+                c = label_codes.get(lbl)
+                if c is None:
+                    c = _register_label(lbl, labels, label_codes)
+                row[j] = c
+
+        student_ids = [str(sr.get("student_id", "")) for sr in student_responses]
+        return cls(student_ids, list(q_ids), labels, codes)
+
+    # ─── Lookup helpers ───────────────────────────────────────────────────────
+
+    @property
+    def n_students(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def n_questions(self) -> int:
+        return self.codes.shape[1]
+
+    def code_for(self, label: Optional[str]) -> int:
+        """
+        Code of a label, or -1 if no student ever chose it.
+        Empty / missing labels map to -1 as well: a blank key never matches.
+        """
+        lbl = (label or "").strip().upper()
+        if not lbl:
+            return -1
+        return self._label_codes.get(lbl, -1)
+
+    def select(self, q_ids: Iterable[str]) -> "ResponseMatrix":
+        """
+        Re-order / subset the columns to `q_ids`.
+        Questions absent from this matrix become all-MISSING columns.
+        """
+        q_ids = list(q_ids)
+        if q_ids == self.question_ids:
+            return self
+        col_of = {q_id: j for j, q_id in enumerate(self.question_ids)}
+        src = np.array([col_of.get(q_id, -1) for q_id in q_ids], dtype=np.intp)
+        codes = np.zeros((self.n_students, len(q_ids)), dtype=np.uint8)
+        present = src >= 0
+        codes[:, present] = self.codes[:, src[present]]
+        return ResponseMatrix(self.student_ids, q_ids, self.labels, codes)
+
+    def option_counts(self) -> np.ndarray:
+        """
+        (n_questions × n_labels) matrix: how many students chose each label
+        for each question. Column 0 counts missing responses.
+        Computed with a single bincount over offset codes.
+        """
+        n_labels = len(self.labels)
+        k = self.n_questions
+        if self.n_students == 0 or k == 0:
+            return np.zeros((k, n_labels), dtype=np.int64)
+        offsets = np.arange(k, dtype=np.intp) * n_labels
+        flat = (self.codes.astype(np.intp) + offsets).ravel()
+        return np.bincount(flat, minlength=k * n_labels).reshape(k, n_labels)
+
+    def to_dicts(self) -> List[Dict]:
+        """Decode back into the list-of-dicts format (blank answers omitted)."""
+        results = []
+        for sid, row in zip(self.student_ids, self.codes):
+            responses = {
+                q_id: self.labels[c]
+                for q_id, c in zip(self.question_ids, row.tolist())
+                if c != MISSING
+            }
+            results.append({"student_id": sid, "responses": responses})
+        return results
+
+
+class ResponseMatrixBuilder:
+    """
+    Incrementally fills a preallocated code matrix.
+
+    Rows (students) and columns (questions) grow by amortised doubling,
+    so a streaming parser can write each cell straight into the compact
+    uint8 buffer without holding the source text or per-student dicts.
+    """
+
+    def __init__(self, question_ids: Optional[List[str]] = None, capacity: int = 1024):
+        self.question_ids: List[str] = list(question_ids or [])
+        self.student_ids: List[str] = []
+        self.labels: List[str] = [""]
+        self._label_codes: Dict[str, int] = {"": MISSING}
+        self._col_of = {q_id: j for j, q_id in enumerate(self.question_ids)}
+        self._row_of: Dict[str, int] = {}
+        self._codes = np.zeros(
+            (max(capacity, 1), max(len(self.question_ids), 1)), dtype=np.uint8
+        )
+
+    def code(self, label: str) -> int:
+        lbl = label.strip().upper()
+        c = self._label_codes.get(lbl)
+        if c is None:
+            c = _register_label(lbl, self.labels, self._label_codes)
+        return c
+
+    def append_row(self, student_id: str, cells: List[str]) -> None:
+        """Wide format: one row per student, cells in question_ids order."""
+        i = self._new_row(student_id)
+        row = self._codes[i]
+        for j, cell in enumerate(cells[:len(self.question_ids)]):
+            if cell:
+                row[j] = self.code(cell)
+
+    def set(self, student_id: str, question_id: str, label: str) -> None:
+        """Long format: one cell at a time; later answers overwrite earlier ones."""
+        i = self._row_of.get(student_id)
+        if i is None:
+            i = self._row_of[student_id] = self._new_row(student_id)
+        j = self._col_of.get(question_id)
+        if j is None:
+            j = self._new_col(question_id)
+        self._codes[i, j] = self.code(label)
+
+    def build(self) -> ResponseMatrix:
+        n, k = len(self.student_ids), len(self.question_ids)
+        codes = self._codes
+        if codes.shape != (n, k):
+            codes = codes[:n, :k].copy()
+        self._codes = np.zeros((1, 1), dtype=np.uint8)   # release the buffer
+        return ResponseMatrix(self.student_ids, self.question_ids, self.labels, codes)
+
+    def _new_row(self, student_id: str) -> int:
+        i = len(self.student_ids)
+        if i == self._codes.shape[0]:
+            grown = np.zeros((i * 2, self._codes.shape[1]), dtype=np.uint8)
+            grown[:i] = self._codes
+            self._codes = grown
+        self.student_ids.append(student_id)
+        return i
+
+    def _new_col(self, question_id: str) -> int:
+        j = len(self.question_ids)
+        if j == self._codes.shape[1]:
+            grown = np.zeros((self._codes.shape[0], j * 2), dtype=np.uint8)
+            grown[:, :j] = self._codes
+            self._codes = grown
+        self.question_ids.append(question_id)
+        self._col_of[question_id] = j
+        return j
+
+
+def _register_label(lbl: str, labels: List[str], label_codes: Dict[str, int]) -> int:
+    if len(labels) > MAX_LABELS:
+        raise ValueError(
+            f"Too many distinct response labels (> {MAX_LABELS}). "
+            "Responses must be option labels such as A–E."
+        )
+    c = len(labels)
+    labels.append(lbl)
+    label_codes[lbl] = c
+    return c
@@ -13,12 +13,27 @@ Format B (long — one row per answer):
   S01,        2,           A
 
 Auto-detects format from the column headers.
-Returns: List[{student_id, responses: {q_id: answer}}]
+
+The parser is streaming: the file is read in fixed-size chunks, decoded
+incrementally and every cell is written straight into a preallocated
+ResponseMatrix, so peak memory tracks the compact uint8 matrix rather
+than the CSV text plus one Python dict per student. Files that turn out
+not to be UTF-8 are parsed again from the start as latin-1.
+
+  parse_response_stream(fileobj) → ResponseMatrix
+  parse_response_csv(bytes)      → List[{student_id, responses: {q_id: answer}}]
 """
 
+import codecs
 import csv
 import io
-from typing import List, Dict
+from typing import BinaryIO, Iterator, List, Dict
+
+from backend.services.metrics import span
+from backend.services.response_matrix import ResponseMatrix, ResponseMatrixBuilder
+
+
+CHUNK_SIZE = 1 << 20        # 1 MiB per read from the upload
 
 
 def parse_response_csv(content: bytes) -> List[Dict]:
@@ -26,13 +41,27 @@ def parse_response_csv(content: bytes) -> List[Dict]:
     Parse CSV bytes → list of student response dicts.
     Raises ValueError with a descriptive message on bad input.
     """
-    try:
-        text = content.decode("utf-8-sig")   # handle BOM from Excel exports
-    except Exception:
-        text = content.decode("latin-1")
+    return parse_response_stream(io.BytesIO(content)).to_dicts()
 
-    reader = csv.DictReader(io.StringIO(text))
-    headers = [h.strip().lower() for h in (reader.fieldnames or [])]
+
+def parse_response_stream(fileobj: BinaryIO, chunk_size: int = CHUNK_SIZE) -> ResponseMatrix:
+    """
+    Parse a binary CSV stream (e.g. UploadFile.file) chunk by chunk → ResponseMatrix.
+    Raises ValueError with a descriptive message on bad input.
+    """
+    with span("responses.parse"):
+        start = fileobj.tell()
+        try:
+            return _parse_stream(fileobj, chunk_size, "utf-8-sig")
+        except UnicodeDecodeError:
+            # Not UTF-8 after all: parse the whole file again as latin-1
+            fileobj.seek(start)
+            return _parse_stream(fileobj, chunk_size, "latin-1")
+
+
+def _parse_stream(fileobj: BinaryIO, chunk_size: int, encoding: str) -> ResponseMatrix:
+    reader = csv.reader(_iter_lines(fileobj, chunk_size, encoding))
+    headers = [h.strip().lower() for h in next(reader, None) or []]
 
     if not headers:
         raise ValueError("CSV has no headers. Expected either wide or long format.")
@@ -50,58 +79,77 @@ def parse_response_csv(content: bytes) -> List[Dict]:
         )
 
 
-def _parse_wide_format(reader, headers: List[str]) -> List[Dict]:
+def _iter_lines(fileobj: BinaryIO, chunk_size: int, encoding: str) -> Iterator[str]:
+    """
+    Yield decoded text lines ending in "\n" (kept, as csv.reader expects).
+    Only "\n" ends a line: form feeds, vertical tabs or U+2028 inside a
+    cell stay part of it. A UnicodeDecodeError propagates, so the caller
+    can start over in another encoding.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        final = not chunk
+        lines = (pending + decoder.decode(chunk, final=final)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if final:
+            if pending:
+                yield pending
+            return
+
+
+def _parse_wide_format(reader, headers: List[str]) -> ResponseMatrix:
     """
     Wide format: each non-student_id column is a question ID.
     """
     id_col = next((h for h in headers if h in ("student_id", "id", "student")), headers[0])
-    q_cols = [h for h in headers if h != id_col]
+    id_idx = headers.index(id_col)
+    q_idx = [i for i, h in enumerate(headers) if i != id_idx]
 
-    if not q_cols:
+    if not q_idx:
         raise ValueError("Wide CSV has no question columns after student_id.")
 
-    results = []
+    builder = ResponseMatrixBuilder(question_ids=[headers[i] for i in q_idx])
+    width = len(headers)
     for row in reader:
-        sid = str(row.get(id_col, "")).strip()
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        sid = row[id_idx].strip()
         if not sid:
             continue
-        responses = {}
-        for q in q_cols:
-            ans = str(row.get(q, "")).strip().upper()
-            if ans:
-                responses[q.strip()] = ans
-        results.append({"student_id": sid, "responses": responses})
-
-    if not results:
+        builder.append_row(sid, [row[i] for i in q_idx])
+
+    if not builder.student_ids:
         raise ValueError("CSV parsed but no student rows found.")
 
-    return results
+    return builder.build()
 
 
-def _parse_long_format(reader, headers: List[str]) -> List[Dict]:
+def _parse_long_format(reader, headers: List[str]) -> ResponseMatrix:
     """
     Long format: student_id, question_id, answer columns.
     """
-    id_key  = next(h for h in headers if h == "student_id")
-    qid_key = next(h for h in headers if h == "question_id")
-    ans_key = next(h for h in headers if h == "answer")
-
-    student_map: Dict[str, Dict] = {}
+    if "student_id" not in headers:
+        raise ValueError("Long CSV requires a student_id column.")
+    id_idx  = headers.index("student_id")
+    qid_idx = headers.index("question_id")
+    ans_idx = headers.index("answer")
+    width = max(id_idx, qid_idx, ans_idx) + 1
+
+    builder = ResponseMatrixBuilder()
     for row in reader:
-        sid = str(row.get(id_key, "")).strip()
-        qid = str(row.get(qid_key, "")).strip()
-        ans = str(row.get(ans_key, "")).strip().upper()
+        if len(row) < width:
+            continue
+        sid = row[id_idx].strip()
+        qid = row[qid_idx].strip()
+        ans = row[ans_idx].strip()
         if sid and qid and ans:
-            if sid not in student_map:
-                student_map[sid] = {}
-            student_map[sid][qid] = ans
-
-    results = [
-        {"student_id": sid, "responses": resp}
-        for sid, resp in student_map.items()
-    ]
+            builder.set(sid, qid, ans)
 
-    if not results:
+    if not builder.student_ids:
         raise ValueError("Long CSV parsed but no valid rows found.")
 
-    return results
+    return builder.build()
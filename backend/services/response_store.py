@@ -0,0 +1,106 @@
+"""
+Persistent Response Store — columnar sittings, uploaded once, analyzed many times.
+
+A sitting's CSV is parsed once into a ResponseMatrix and written to disk;
+every later analysis (e.g. a rerun with a corrected answer key) opens the
+stored code matrix with a memory map instead of re-parsing the CSV.
+
+On-disk layout, one directory per sitting:
+
+  <store>/<sitting_id>/codes.npy     uint8 (n_students × n_questions), mmap_mode="r"
+  <store>/<sitting_id>/meta.json     {exam, student_ids, question_ids, labels}
+
+The code matrix is stored as a bare .npy rather than an .npz archive:
+NumPy can only memory-map uncompressed .npy files, and the uint8 codes
+are already one byte per cell. Sittings are written to a temporary
+directory and renamed into place, so readers never see a partial one.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+import numpy as np
+from typing import Optional, Tuple
+
+from backend.core.models import Exam
+from backend.services.response_matrix import ResponseMatrix
+
+
+RESPONSE_STORE_DIR = os.getenv("RESPONSE_STORE_DIR", "response_store")
+
+_SITTING_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResponseStore:
+
+    def __init__(self, directory: str = RESPONSE_STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    # ─── Write ────────────────────────────────────────────────────────────────
+
+    def save(self, exam: Exam, matrix: ResponseMatrix) -> str:
+        """Persist a sitting; returns its new sitting_id."""
+        sitting_id = uuid.uuid4().hex
+        path = os.path.join(self.directory, sitting_id)
+        tmp = path + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, "codes.npy"), np.ascontiguousarray(matrix.codes, dtype=np.uint8))
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "exam": exam.model_dump(),
+                "student_ids": matrix.student_ids,
+                "question_ids": matrix.question_ids,
+                "labels": matrix.labels,
+            }, f)
+        with self._lock:
+            os.replace(tmp, path)               # sitting becomes visible atomically
+        return sitting_id
+
+    def delete(self, sitting_id: str) -> bool:
+        path = self._path(sitting_id)
+        if path is None or not os.path.isdir(path):
+            return False
+        with self._lock:
+            shutil.rmtree(path, ignore_errors=True)
+        return True
+
+    # ─── Read ─────────────────────────────────────────────────────────────────
+
+    def load(self, sitting_id: str) -> Optional[Tuple[Exam, ResponseMatrix]]:
+        """
+        (Exam, ResponseMatrix) for a stored sitting, or None if unknown.
+        The matrix's codes are a read-only memory map of codes.npy.
+        """
+        path = self._path(sitting_id)
+        if path is None or not os.path.isdir(path):
+            return None
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        codes = np.load(os.path.join(path, "codes.npy"), mmap_mode="r")
+        matrix = ResponseMatrix(
+            meta["student_ids"], meta["question_ids"], meta["labels"], codes
+        )
+        return Exam(**meta["exam"]), matrix
+
+    def _path(self, sitting_id: str) -> Optional[str]:
+        if not _SITTING_ID.match(sitting_id):
+            return None                         # also rejects path traversal
+        return os.path.join(self.directory, sitting_id)
+
+
+# ─── Process-wide store ───────────────────────────────────────────────────────
+
+_store: Optional[ResponseStore] = None
+_store_lock = threading.Lock()
+
+
+def get_response_store() -> ResponseStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResponseStore(RESPONSE_STORE_DIR)
+        return _store
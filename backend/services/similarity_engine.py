@@ -8,18 +8,21 @@ Uses TF-IDF vectorization + Cosine Similarity to detect:
 
 Algorithm:
   - Question texts are vectorized using TF-IDF (unigrams + bigrams)
-  - Cosine similarity is computed as a full N×N matrix
-  - Upper triangle is scanned to find pairs above threshold
-  - Results are grouped into similarity clusters
+  - Rows are L2-normalized, so cosine similarity is a sparse dot product
+  - Row blocks are multiplied against the upper-triangle columns and only
+    entries ≥ NEAR_DUP_THRESHOLD are kept (memory ∝ candidate pairs, not N²)
+  - Results are grouped into similarity clusters (connected components
+    over the pair index arrays); the report is validated once at the end
 """
 
 import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List
-from backend.core.similarity_models import (
-    SimilarPair, SimilarityCluster, SimilarityReport
-)
+from typing import List, Optional, Tuple
+from backend.core.similarity_models import SimilarityReport
+from backend.services.lsh import MinHashLSH
+from backend.services.metrics import span
 
 
 # ─── Thresholds ───────────────────────────────────────────────────────────────
@@ -27,17 +30,31 @@ DUPLICATE_THRESHOLD    = 0.95   # treat as exact duplicate
 NEAR_DUP_THRESHOLD     = 0.60   # treat as near-duplicate / paraphrase
 DISTRACTOR_EFFICIENCY  = 5      # min % for a distractor to be "effective" (from Phase 3)
 
+# Rows per sparse product block: bounds the transient block × N result
+SIMILARITY_BLOCK_SIZE  = 512
+
+# TF-IDF settings shared by every vectorizer in the similarity pipeline
+TFIDF_PARAMS = dict(
+    ngram_range=(1, 2),
+    stop_words="english",
+    min_df=1,
+    sublinear_tf=True,      # log normalization reduces impact of frequent terms
+)
+
 
 class SimilarityEngine:
 
     @staticmethod
-    def analyze(questions: list) -> SimilarityReport:
+    def analyze(questions: list, lsh: Optional[MinHashLSH] = None) -> SimilarityReport:
         """
         Run TF-IDF + Cosine Similarity on all questions.
 
         Parameters
         ----------
-        questions : List of Question objects (from Pydantic model)
+        questions : List of Question models (or QuestionRecords)
+        lsh       : Optional MinHashLSH candidate stage. When given, exact
+                    cosine is computed only for LSH candidate pairs instead
+                    of all pairs (approximate recall, near-linear cost).
 
         Returns
         -------
@@ -57,120 +74,166 @@ class SimilarityEngine:
             )
 
         # ── TF-IDF vectorization (unigrams + bigrams) ─────────────────────────
-        vectorizer = TfidfVectorizer(
-            ngram_range=(1, 2),
-            stop_words="english",
-            min_df=1,
-            sublinear_tf=True,      # log normalization reduces impact of frequent terms
-        )
-        tfidf_matrix = vectorizer.fit_transform(texts)
-
-        # ── Cosine similarity matrix (n × n) ─────────────────────────────────
-        sim_matrix = cosine_similarity(tfidf_matrix)
-
-        # ── Scan upper triangle for similar pairs ─────────────────────────────
-        duplicate_pairs: List[SimilarPair] = []
-        near_dup_pairs:  List[SimilarPair] = []
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                score = float(sim_matrix[i, j])
-                if score >= DUPLICATE_THRESHOLD:
-                    duplicate_pairs.append(SimilarPair(
-                        question_id_1=q_ids[i],
-                        question_text_1=texts[i],
-                        question_id_2=q_ids[j],
-                        question_text_2=texts[j],
-                        similarity_score=round(score, 4),
-                        similarity_type="duplicate",
-                    ))
-                elif score >= NEAR_DUP_THRESHOLD:
-                    near_dup_pairs.append(SimilarPair(
-                        question_id_1=q_ids[i],
-                        question_text_1=texts[i],
-                        question_id_2=q_ids[j],
-                        question_text_2=texts[j],
-                        similarity_score=round(score, 4),
-                        similarity_type="near_duplicate",
-                    ))
-
-        # ── Build clusters (union-find grouping) ──────────────────────────────
-        clusters = SimilarityEngine._build_clusters(
-            duplicate_pairs + near_dup_pairs, q_ids, texts
+        with span("similarity.vectorize"):
+            vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+            tfidf_matrix = vectorizer.fit_transform(texts)
+
+        # ── Thresholded sparse cosine similarity (upper triangle only) ────────
+        with span("similarity.pairs"):
+            if lsh is None:
+                rows, cols, scores = SimilarityEngine._similar_pairs(
+                    tfidf_matrix, NEAR_DUP_THRESHOLD
+                )
+            else:
+                cand_rows, cand_cols = lsh.candidate_pairs(texts)
+                rows, cols, scores = SimilarityEngine._score_candidates(
+                    tfidf_matrix, cand_rows, cand_cols, NEAR_DUP_THRESHOLD
+                )
+
+        with span("similarity.report"):
+            return SimilarityEngine._report(rows, cols, scores, q_ids, texts)
+
+    @staticmethod
+    def _report(
+        rows: np.ndarray,
+        cols: np.ndarray,
+        scores: np.ndarray,
+        q_ids: list,
+        texts: list,
+    ) -> SimilarityReport:
+        """Pairs, clusters and the unique count from the thresholded pair arrays."""
+        n = len(q_ids)
+
+        # ── Pairs and clusters stay as index arrays until the report ─────────
+        rounded = [round(x, 4) for x in scores.tolist()]
+        is_dup = scores >= DUPLICATE_THRESHOLD
+        duplicate_pairs: List[dict] = []
+        near_dup_pairs:  List[dict] = []
+
+        for i, j, score, dup in zip(rows.tolist(), cols.tolist(), rounded, is_dup.tolist()):
+            (duplicate_pairs if dup else near_dup_pairs).append({
+                "question_id_1": q_ids[i],
+                "question_text_1": texts[i],
+                "question_id_2": q_ids[j],
+                "question_text_2": texts[j],
+                "similarity_score": score,
+                "similarity_type": "duplicate" if dup else "near_duplicate",
+            })
+
+        # ── Build clusters (connected components of the pair graph) ──────────
+        clusters, clustered = SimilarityEngine._build_clusters(
+            rows, cols, np.asarray(rounded), is_dup, q_ids, texts
         )
 
         # ── Questions not in any cluster are unique ───────────────────────────
-        clustered_ids = {
-            qid for c in clusters for qid in c.question_ids
-        }
-        unique_count = sum(1 for qid in q_ids if qid not in clustered_ids)
-
-        return SimilarityReport(
-            total_questions=n,
-            duplicate_pairs=duplicate_pairs,
-            near_duplicate_pairs=near_dup_pairs,
-            clusters=clusters,
-            unique_question_count=unique_count,
-        )
+        return SimilarityReport.model_validate({
+            "total_questions": n,
+            "duplicate_pairs": duplicate_pairs,
+            "near_duplicate_pairs": near_dup_pairs,
+            "clusters": clusters,
+            "unique_question_count": n - clustered,
+        })
 
     @staticmethod
-    def _build_clusters(
-        pairs: List[SimilarPair],
-        q_ids: list,
-        texts: list,
-    ) -> List[SimilarityCluster]:
-        """
-        Simple union-find to group similar questions into clusters.
-        Each cluster represents a group of questions that are similar to each other.
+    def _similar_pairs(
+        tfidf_matrix,
+        threshold: float,
+        block_size: int = SIMILARITY_BLOCK_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        parent = {qid: qid for qid in q_ids}
+        All pairs (i < j) whose cosine similarity is ≥ threshold.
 
-        def find(x):
-            while parent[x] != x:
-                parent[x] = parent[parent[x]]
-                x = parent[x]
-            return x
+        Rows of `tfidf_matrix` must be L2-normalized (TfidfVectorizer's
+        default). Each block of rows is multiplied against the columns at
+        or after the block start, sub-threshold entries are dropped from
+        the sparse result straight away, and the survivors are returned
+        as flat arrays ordered by (i, j).
+        """
+        X = tfidf_matrix.tocsr()
+        n = X.shape[0]
+        row_parts, col_parts, score_parts = [], [], []
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = (X[start:stop] @ X[start:].T).tocoo()
+            r = block.row + start
+            c = block.col + start
+            keep = (c > r) & (block.data >= threshold)
+            row_parts.append(r[keep])
+            col_parts.append(c[keep])
+            score_parts.append(block.data[keep])
+
+        rows   = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=np.int64)
+        cols   = np.concatenate(col_parts) if col_parts else np.empty(0, dtype=np.int64)
+        scores = np.concatenate(score_parts) if score_parts else np.empty(0)
+
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order], scores[order]
 
-        def union(x, y):
-            parent[find(x)] = find(y)
+    @staticmethod
+    def _score_candidates(
+        tfidf_matrix,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        threshold: float,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Exact cosine for the given candidate pairs only (row-wise sparse
+        dot products), filtered to ≥ threshold. Input must be ordered by (i, j).
+        """
+        X = tfidf_matrix.tocsr()
+        if len(rows) == 0:
+            return rows, cols, np.empty(0)
+        scores = np.asarray(X[rows].multiply(X[cols]).sum(axis=1)).ravel()
+        keep = scores >= threshold
+        return rows[keep], cols[keep], scores[keep]
 
-        for pair in pairs:
-            union(pair.question_id_1, pair.question_id_2)
+    @staticmethod
+    def _build_clusters(
+        rows: np.ndarray,
+        cols: np.ndarray,
+        scores: np.ndarray,
+        is_dup: np.ndarray,
+        q_ids: list,
+        texts: list,
+    ) -> Tuple[List[dict], int]:
+        """
+        Group similar questions into clusters: the connected components
+        of the graph whose edges are the similar pairs (row/col indices).
 
-        # Group by root
-        groups: dict = {}
-        for qid in q_ids:
-            root = find(qid)
-            groups.setdefault(root, []).append(qid)
+        Clusters are numbered in order of their first question; a cluster
+        is "duplicate" if any of its pairs is, and its average similarity
+        is the mean pair score. Returns the cluster payloads and the number
+        of clustered questions.
+        """
+        n = len(q_ids)
+        if len(rows) == 0:
+            return [], 0
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        _, component = connected_components(graph, directed=False)
+
+        # Components with an edge, numbered by their lowest question index
+        pair_component = component[rows]
+        n_components = component.max() + 1
+        pair_count = np.bincount(pair_component, minlength=n_components)
+        score_sum = np.bincount(pair_component, weights=scores, minlength=n_components)
+        dup_count = np.bincount(pair_component, weights=is_dup, minlength=n_components)
+
+        clustered = np.flatnonzero(pair_count[component])     # singletons are not clusters
+        members_by_component = clustered[np.argsort(component[clustered], kind="stable")]
+        bounds = np.flatnonzero(np.diff(component[members_by_component])) + 1
+        groups = np.split(members_by_component, bounds)
+        groups.sort(key=lambda g: g[0])
 
         clusters = []
-        id_to_text = dict(zip(q_ids, texts))
-        cluster_id = 1
-
-        for root, members in groups.items():
-            if len(members) < 2:
-                continue   # singletons are not clusters
-            # Determine the dominant type in this cluster
-            member_set = set(members)
-            cluster_pairs = [
-                p for p in pairs
-                if p.question_id_1 in member_set and p.question_id_2 in member_set
-            ]
-            has_duplicate = any(p.similarity_type == "duplicate" for p in cluster_pairs)
-            cluster_type = "duplicate" if has_duplicate else "near_duplicate"
-
-            avg_score = (
-                sum(p.similarity_score for p in cluster_pairs) / len(cluster_pairs)
-                if cluster_pairs else 0.0
-            )
-
-            clusters.append(SimilarityCluster(
-                cluster_id=cluster_id,
-                question_ids=members,
-                question_texts=[id_to_text[m] for m in members],
-                similarity_type=cluster_type,
-                average_similarity=round(avg_score, 4),
-            ))
-            cluster_id += 1
-
-        return clusters
+        for cluster_id, members in enumerate(groups, start=1):
+            c = component[members[0]]
+            members = members.tolist()
+            clusters.append({
+                "cluster_id": cluster_id,
+                "question_ids": [q_ids[m] for m in members],
+                "question_texts": [texts[m] for m in members],
+                "similarity_type": "duplicate" if dup_count[c] else "near_duplicate",
+                "average_similarity": round(float(score_sum[c] / pair_count[c]), 4),
+            })
+        return clusters, len(clustered)
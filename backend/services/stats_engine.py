@@ -18,6 +18,14 @@ Implements Classical Test Theory (CTT) metrics:
      α = (k/(k-1)) × (1 − Σσᵢ² / σ²_total)
      Measures internal consistency (how well all items measure the same construct).
 
+  5. Item–total statistics
+     Point-biserial r(item, total), corrected r(item, total − item) and
+     α if item deleted — all from one (n × k) · n product Σ xᵢT plus the
+     item and total variances, instead of k alpha recomputations.
+
+  Optionally, percentile bootstrap intervals for p, D and α
+  (see services/bootstrap.py) when `bootstrap` resamples are requested.
+
 Input format (student_responses):
   A list of dicts, one per student:
   [
@@ -29,18 +37,41 @@ Input format (student_responses):
 correct_answers:
   Dict mapping question_id (str) → correct option label (str):
   {"1": "C", "2": "B", ...}
+  An item with several accepted answers lists them all, either as a list
+  or comma-separated: {"3": ["A", "C"]} or {"3": "A,C"}.
+
+Responses are encoded once into a columnar ResponseMatrix (uint8 option
+codes) and every metric is computed as a batched NumPy reduction over it.
 """
 
 import numpy as np
-from typing import List, Dict, Tuple
-from backend.core.stat_models import (
-    QuestionStat, DistractorStat, ExamStats
-)
+from typing import List, Dict, FrozenSet, Optional, Tuple, Union
+from backend.core.stat_models import ExamStats, ConfidenceInterval
 from backend.core.models import Exam
+from backend.services.bootstrap import bootstrap_intervals
+from backend.services.metrics import span
+from backend.services.response_matrix import ResponseMatrix, MISSING
 
 
 # ─── Label helpers ────────────────────────────────────────────────────────────
 
+# {question_id: label | "A,C" | ["A", "C"]}
+AnswerKey = Dict[str, Union[str, List[str]]]
+
+
+def accepted_labels(key: Union[str, List[str], None]) -> FrozenSet[str]:
+    """Normalised set of accepted labels for one answer-key entry."""
+    if key is None:
+        return frozenset()
+    parts = key.split(",") if isinstance(key, str) else key
+    return frozenset(p for p in (str(x).strip().upper() for x in parts) if p)
+
+
+def normalize_answer_key(correct_answers: AnswerKey) -> Dict[str, List[str]]:
+    """Every entry as its sorted list of accepted labels."""
+    return {str(k): sorted(accepted_labels(v)) for k, v in correct_answers.items()}
+
+
 def _difficulty_label(p: float) -> str:
     if p >= 0.80:
         return "Easy"
@@ -86,7 +117,10 @@ class StatisticalEngine:
     def analyze(
         exam: Exam,
         student_responses: List[Dict],
-        correct_answers: Dict[str, str],
+        correct_answers: AnswerKey,
+        bootstrap: int = 0,
+        confidence: float = 0.95,
+        seed: int = 0,
     ) -> ExamStats:
         """
         Full CTT analysis pipeline.
@@ -95,170 +129,346 @@ class StatisticalEngine:
         ----------
         exam              : Normalized Exam object (from Phase 2)
         student_responses : List of {"student_id": str, "responses": {q_id: chosen_label}}
-        correct_answers   : {str(q_id): correct_label}
+        correct_answers   : {str(q_id): correct_label | [accepted labels]}
+        bootstrap         : number of bootstrap resamples (0 = point estimates only)
+        confidence        : bootstrap interval coverage, e.g. 0.95
+        seed              : bootstrap seed; same seed → same intervals
 
         Returns
         -------
         ExamStats object with all computed metrics
         """
-        n_students = len(student_responses)
+        if len(student_responses) < 2:
+            raise ValueError("At least 2 student responses required for statistical analysis.")
+
+        q_ids = [str(q.id) for q in exam.questions]
+        with span("stats.encode"):
+            matrix = ResponseMatrix.from_dicts(student_responses, q_ids)
+        return StatisticalEngine.analyze_matrix(
+            exam, matrix, correct_answers, bootstrap, confidence, seed
+        )
+
+    @staticmethod
+    def analyze_matrix(
+        exam: Exam,
+        matrix: ResponseMatrix,
+        correct_answers: AnswerKey,
+        bootstrap: int = 0,
+        confidence: float = 0.95,
+        seed: int = 0,
+    ) -> ExamStats:
+        """
+        Columnar CTT analysis on an encoded ResponseMatrix.
+
+        Every metric is computed with batched NumPy operations over the
+        (n_students × n_questions) code matrix — there is no per-student
+        Python loop. Produces the same ExamStats as `analyze`.
+        """
+        n_students = matrix.n_students
         if n_students < 2:
             raise ValueError("At least 2 student responses required for statistical analysis.")
 
         q_ids = [str(q.id) for q in exam.questions]
+        with span("stats.score"):
+            matrix = matrix.select(q_ids)
+
+            # ── Build score matrix  (n_students × n_questions, 1=correct 0=wrong) ──
+            accepted = StatisticalEngine._accepted_table(matrix, correct_answers)
+            score_matrix = StatisticalEngine._score_codes(matrix.codes, accepted)
+
+            # Raw scores per student  (sum across questions)
+            total_scores = score_matrix.sum(axis=1)          # shape (n_students,)
+
+            # ── Sort students by total score for discrimination calc ──────────
+            top_idx, bottom_idx = StatisticalEngine._groups_27(total_scores)
+
+            # ── Batched per-question metrics ──────────────────────────────────
+            p_values       = score_matrix.mean(axis=0)
+            top_correct    = score_matrix[top_idx].mean(axis=0)
+            bottom_correct = score_matrix[bottom_idx].mean(axis=0)
+            item_total     = total_scores @ score_matrix        # Σ xᵢT per item
+            option_counts  = matrix.option_counts()
+
+        with span("stats.report"):
+            stats = StatisticalEngine._exam_stats(
+                exam, p_values, top_correct - bottom_correct, total_scores, item_total,
+                option_counts, matrix.labels, correct_answers,
+            )
+        if bootstrap:
+            with span("stats.bootstrap"):
+                StatisticalEngine._attach_intervals(stats, score_matrix, bootstrap, confidence, seed)
+        return stats
 
-        # ── Build score matrix  (n_students × n_questions, 1=correct 0=wrong) ──
-        score_matrix = StatisticalEngine._build_score_matrix(
-            student_responses, correct_answers, q_ids
+    @staticmethod
+    def _attach_intervals(
+        stats: ExamStats,
+        score_matrix: np.ndarray,
+        resamples: int,
+        confidence: float,
+        seed: int,
+    ) -> None:
+        """Add bootstrap confidence intervals to an ExamStats in place."""
+        p_ci, d_ci, alpha_ci = bootstrap_intervals(score_matrix, resamples, confidence, seed)
+        for stat, (p_lo, p_hi), (d_lo, d_hi) in zip(
+            stats.question_stats, p_ci.tolist(), d_ci.tolist()
+        ):
+            stat.difficulty_ci = ConfidenceInterval(lower=round(p_lo, 4), upper=round(p_hi, 4))
+            stat.discrimination_ci = ConfidenceInterval(lower=round(d_lo, 4), upper=round(d_hi, 4))
+        stats.cronbach_alpha_ci = ConfidenceInterval(
+            lower=round(float(alpha_ci[0]), 4), upper=round(float(alpha_ci[1]), 4)
         )
+        stats.bootstrap_resamples = resamples
+        stats.confidence_level = confidence
 
-        # Raw scores per student  (sum across questions)
-        total_scores = score_matrix.sum(axis=1)          # shape (n_students,)
+    @staticmethod
+    def _groups_27(total_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Row indices of the top and bottom 27% of students by raw score.
+        Ties fall as in the original engine: NumPy's default argsort over
+        float64 totals (tie order depends on both the kind and the dtype).
+        """
+        sorted_idx = np.argsort(total_scores.astype(np.float64, copy=False))
+        cutoff = max(1, int(np.ceil(0.27 * len(total_scores))))
+        return sorted_idx[-cutoff:], sorted_idx[:cutoff]
+
+    @staticmethod
+    def _exam_stats(
+        exam: Exam,
+        p_values: np.ndarray,            # (n_questions,)
+        disc_values: np.ndarray,         # (n_questions,)
+        total_scores: np.ndarray,        # (n_students,)
+        item_total: np.ndarray,          # (n_questions,) Σ over students of item × total
+        option_counts: np.ndarray,       # (n_questions × n_labels)
+        labels: List[str],
+        correct_answers: AnswerKey,
+    ) -> ExamStats:
+        """Assemble ExamStats from batched per-question and per-student reductions."""
+        n_students = len(total_scores)
+        total_mean = float(total_scores.mean())
+        total_variance = float(total_scores.var(ddof=1))
+        item_metrics = StatisticalEngine._item_total_stats(
+            p_values, item_total, n_students, total_mean, total_variance
+        )
+        question_stats, diff_distribution, flagged_count = (
+            StatisticalEngine._assemble_question_stats(
+                exam, p_values, disc_values,
+                option_counts, labels, correct_answers, n_students, item_metrics,
+            )
+        )
 
-        # ── Sort students by total score for discrimination calc ──────────────
-        sorted_idx = np.argsort(total_scores)
-        cutoff = max(1, int(np.ceil(0.27 * n_students)))
-        bottom_idx = sorted_idx[:cutoff]
-        top_idx    = sorted_idx[-cutoff:]
+        # ── Cronbach's Alpha ──────────────────────────────────────────────────
+        # Items are binary, so each item variance follows from its p-value:
+        # var_i = n/(n−1) · p_i(1 − p_i). No pass over the score matrix needed.
+        k = len(p_values)
+        item_variance_sum = float((p_values * (1 - p_values)).sum() * n_students / (n_students - 1))
+        alpha = StatisticalEngine._alpha_from_variances(k, item_variance_sum, total_variance)
+
+        return ExamStats.model_validate({
+            "exam_id": exam.exam_id,
+            "total_questions": exam.total_questions,
+            "total_students": n_students,
+            "average_score": round(total_mean, 2),
+            "score_std_dev": round(float(np.sqrt(total_variance)), 2),
+            "cronbach_alpha": round(alpha, 4),
+            "reliability_label": _reliability_label(alpha),
+            "difficulty_distribution": diff_distribution,
+            "flagged_question_count": flagged_count,
+            "question_stats": question_stats,
+        })
+
+    # ─── Question report ──────────────────────────────────────────────────────
 
-        # ── Per-question analysis ─────────────────────────────────────────────
-        question_stats: List[QuestionStat] = []
+    @staticmethod
+    def _assemble_question_stats(
+        exam: Exam,
+        p_values: np.ndarray,            # (n_questions,)
+        disc_values: np.ndarray,         # (n_questions,) top − bottom proportion
+        option_counts: np.ndarray,       # (n_questions × n_labels)
+        labels: List[str],
+        correct_answers: AnswerKey,
+        n_students: int,
+        item_metrics: Optional[np.ndarray] = None,   # (n_questions × 3) from _item_total_stats
+    ) -> Tuple[List[Dict], Dict[str, int], int]:
+        """
+        Turn batched per-question metrics into QuestionStat payloads
+        (plain dicts, validated once with the enclosing ExamStats).
+        O(n_questions) — no student data is touched here.
+        """
+        question_stats: List[Dict] = []
         diff_distribution = {"Easy": 0, "Moderate": 0, "Hard": 0}
         flagged_count = 0
 
-        for i, q in enumerate(exam.questions):
-            q_id = str(q.id)
-            col = score_matrix[:, i]
-
-            # 1. Difficulty Index
-            p = float(col.mean())
-            d_label = _difficulty_label(p)
-            diff_distribution[d_label] += 1
-
-            # 2. Discrimination Index
-            top_correct    = float(col[top_idx].mean())
-            bottom_correct = float(col[bottom_idx].mean())
-            disc = round(top_correct - bottom_correct, 4)
-            disc_label = _discrimination_label(disc)
-
-            # 3. Distractor stats
-            all_responses_for_q = [
-                sr["responses"].get(q_id, "").upper()
-                for sr in student_responses
-            ]
+        label_code = {lbl: c for c, lbl in enumerate(labels) if c != MISSING}
+        counts = option_counts.tolist()
+        disc_rounded = [round(d, 4) for d in disc_values.tolist()]
+        metrics = item_metrics.tolist() if item_metrics is not None else None
+
+        for i, (q, p) in enumerate(zip(exam.questions, p_values.tolist())):
             distractors = StatisticalEngine._distractor_stats(
-                responses=all_responses_for_q,
+                chosen_counts=counts[i],
+                label_code=label_code,
                 options=q.options,
-                correct_label=correct_answers.get(q_id, "").upper(),
+                correct_labels=accepted_labels(correct_answers.get(str(q.id))),
                 n_students=n_students,
             )
-
-            # 4. Flag logic
-            flag_reasons = []
-            if p < 0.20:
-                flag_reasons.append("Extremely difficult (p < 0.20)")
-            if p > 0.90:
-                flag_reasons.append("Trivially easy (p > 0.90)")
-            if disc < 0.10:
-                flag_reasons.append(f"Poor discrimination (D={disc:.2f})")
-            if disc < 0:
-                flag_reasons.append("Negative discrimination — review item immediately")
-            ineffective = [d for d in distractors if not d.is_correct and not d.is_effective]
-            if len(ineffective) >= 2:
-                flag_reasons.append(
-                    f"{len(ineffective)} ineffective distractors (chosen by < 5%)"
-                )
-
-            is_flagged = bool(flag_reasons)
-            if is_flagged:
+            stat = StatisticalEngine._question_stat(q, p, disc_rounded[i], distractors)
+            if metrics is not None:
+                r_pb, r_corrected, alpha_deleted = metrics[i]
+                stat["point_biserial"] = round(r_pb, 4)
+                stat["corrected_item_total"] = round(r_corrected, 4)
+                stat["alpha_if_deleted"] = round(alpha_deleted, 4)
+            diff_distribution[stat["difficulty_label"]] += 1
+            if stat["is_flagged"]:
                 flagged_count += 1
+            question_stats.append(stat)
 
-            question_stats.append(QuestionStat(
-                question_id=q.id,
-                question_text=q.text,
-                difficulty_index=round(p, 4),
-                difficulty_label=d_label,
-                discrimination_index=disc,
-                discrimination_label=disc_label,
-                distractors=distractors,
-                is_flagged=is_flagged,
-                flag_reasons=flag_reasons,
-            ))
+        return question_stats, diff_distribution, flagged_count
 
-        # ── Cronbach's Alpha ──────────────────────────────────────────────────
-        alpha = StatisticalEngine._cronbach_alpha(score_matrix)
-
-        return ExamStats(
-            exam_id=exam.exam_id,
-            total_questions=exam.total_questions,
-            total_students=n_students,
-            average_score=round(float(total_scores.mean()), 2),
-            score_std_dev=round(float(total_scores.std(ddof=1)), 2),
-            cronbach_alpha=round(alpha, 4),
-            reliability_label=_reliability_label(alpha),
-            difficulty_distribution=diff_distribution,
-            flagged_question_count=flagged_count,
-            question_stats=question_stats,
-        )
+    @staticmethod
+    def _question_stat(
+        q,                               # Question model or QuestionRecord
+        p: float,
+        disc: float,
+        distractors: List[Dict],
+    ) -> Dict:
+        """Apply labels and flag rules to one question's raw metrics."""
+        flag_reasons = []
+        if p < 0.20:
+            flag_reasons.append("Extremely difficult (p < 0.20)")
+        if p > 0.90:
+            flag_reasons.append("Trivially easy (p > 0.90)")
+        if disc < 0.10:
+            flag_reasons.append(f"Poor discrimination (D={disc:.2f})")
+        if disc < 0:
+            flag_reasons.append("Negative discrimination — review item immediately")
+        ineffective = sum(1 for d in distractors if not d["is_effective"])
+        if ineffective >= 2:
+            flag_reasons.append(
+                f"{ineffective} ineffective distractors (chosen by < 5%)"
+            )
+
+        return {
+            "question_id": q.id,
+            "question_text": q.text,
+            "difficulty_index": round(p, 4),
+            "difficulty_label": _difficulty_label(p),
+            "discrimination_index": disc,
+            "discrimination_label": _discrimination_label(disc),
+            "distractors": distractors,
+            "is_flagged": bool(flag_reasons),
+            "flag_reasons": flag_reasons,
+        }
+
+    # ─── Item–total statistics ────────────────────────────────────────────────
+
+    @staticmethod
+    def _item_total_stats(
+        p_values: np.ndarray,            # (k,)
+        item_total: np.ndarray,          # (k,) Σ xᵢT
+        n: int,
+        total_mean: float,
+        total_variance: float,
+    ) -> np.ndarray:
+        """
+        (k × 3) array of [point-biserial, corrected item–total r, α if deleted].
+
+        With T the raw total and R = T − xᵢ the rest score (ddof = 1):
+          cov(xᵢ, T) = (Σ xᵢT − n·pᵢ·mean(T)) / (n − 1)
+          cov(xᵢ, R) = cov(xᵢ, T) − var(xᵢ)
+          var(R)     = var(T) − 2·cov(xᵢ, T) + var(xᵢ)
+        so every item costs O(1) once Σ xᵢT is known. Zero-variance
+        items (everyone right or wrong) get r = 0.
+        """
+        k = len(p_values)
+        p = np.asarray(p_values, dtype=np.float64)
+        item_var = p * (1 - p) * n / (n - 1)
+        cov_total = (np.asarray(item_total, dtype=np.float64) - n * p * total_mean) / (n - 1)
+        cov_rest = cov_total - item_var
+        rest_var = total_variance - 2 * cov_total + item_var
+
+        def _corr(cov, var_a, var_b):
+            denom = np.sqrt(np.clip(var_a * var_b, 0, None))
+            return np.divide(cov, denom, out=np.zeros(k), where=denom > 1e-12)
+
+        r_pb = _corr(cov_total, item_var, np.full(k, total_variance))
+        r_corrected = _corr(cov_rest, item_var, rest_var)
+
+        alpha_deleted = np.zeros(k)
+        if k >= 3:
+            ok = rest_var > 1e-12
+            remaining = item_var.sum() - item_var
+            alpha_deleted[ok] = ((k - 1) / (k - 2)) * (1 - remaining[ok] / rest_var[ok])
+        return np.column_stack([
+            np.clip(r_pb, -1.0, 1.0),
+            np.clip(r_corrected, -1.0, 1.0),
+            np.clip(alpha_deleted, -1.0, 1.0),
+        ])
 
     # ─── Score Matrix ─────────────────────────────────────────────────────────
 
     @staticmethod
     def _build_score_matrix(
         student_responses: List[Dict],
-        correct_answers: Dict[str, str],
+        correct_answers: AnswerKey,
         q_ids: List[str],
     ) -> np.ndarray:
         """
         Returns a (n_students × n_questions) binary numpy array.
         1 = student answered correctly, 0 = wrong or missing.
         """
-        n = len(student_responses)
-        k = len(q_ids)
-        matrix = np.zeros((n, k), dtype=np.float64)
+        matrix = ResponseMatrix.from_dicts(student_responses, q_ids)
+        accepted = StatisticalEngine._accepted_table(matrix, correct_answers)
+        return StatisticalEngine._score_codes(matrix.codes, accepted)
 
-        for i, sr in enumerate(student_responses):
-            responses = sr.get("responses", {})
-            for j, q_id in enumerate(q_ids):
-                student_ans = responses.get(q_id, "").strip().upper()
-                correct_ans = correct_answers.get(q_id, "").strip().upper()
-                if student_ans and correct_ans and student_ans == correct_ans:
-                    matrix[i, j] = 1.0
+    @staticmethod
+    def _accepted_table(matrix: ResponseMatrix, correct_answers: AnswerKey) -> np.ndarray:
+        """
+        (n_questions × n_labels) boolean table: accepted[j, c] is True when
+        label code c is a correct answer to question j. The MISSING column
+        is always False, and labels no student chose simply never match.
+        """
+        accepted = np.zeros((matrix.n_questions, len(matrix.labels)), dtype=bool)
+        for j, q_id in enumerate(matrix.question_ids):
+            for lbl in accepted_labels(correct_answers.get(q_id)):
+                c = matrix.code_for(lbl)
+                if c > 0:
+                    accepted[j, c] = True
+        return accepted
 
-        return matrix
+    @staticmethod
+    def _score_codes(codes: np.ndarray, accepted: np.ndarray) -> np.ndarray:
+        """Look every code up in its column's accepted-label row (one gather)."""
+        cols = np.arange(codes.shape[1], dtype=np.intp)
+        return accepted[cols[np.newaxis, :], codes].astype(np.float64)
 
     # ─── Distractor Efficiency ────────────────────────────────────────────────
 
     @staticmethod
     def _distractor_stats(
-        responses: List[str],
-        options,                         # List[Option] from Pydantic model
-        correct_label: str,
+        chosen_counts: List[int],        # one question's row of option_counts
+        label_code: Dict[str, int],      # {label: column in chosen_counts}
+        options,                         # List[Option] or List[OptionRecord]
+        correct_labels: FrozenSet[str],
         n_students: int,
-    ) -> List[DistractorStat]:
-        # Count how many chose each label
-        counts: Dict[str, int] = {}
-        for r in responses:
-            if r:
-                counts[r] = counts.get(r, 0) + 1
-
+    ) -> List[Dict]:
         stats = []
         for opt in options:
             lbl = opt.label.upper()
-            chosen = counts.get(lbl, 0)
+            c = label_code.get(lbl)
+            chosen = chosen_counts[c] if c is not None else 0
             pct = round(chosen / n_students * 100, 1) if n_students > 0 else 0.0
-            is_correct = (lbl == correct_label)
+            is_correct = lbl in correct_labels
             # A distractor is considered "effective" if ≥5% of students chose it
             is_effective = is_correct or pct >= 5.0
 
-            stats.append(DistractorStat(
-                label=lbl,
-                text=opt.text,
-                chosen_count=chosen,
-                chosen_pct=pct,
-                is_correct=is_correct,
-                is_effective=is_effective,
-            ))
+            stats.append({
+                "label": lbl,
+                "text": opt.text,
+                "chosen_count": chosen,
+                "chosen_pct": pct,
+                "is_correct": is_correct,
+                "is_effective": is_effective,
+            })
 
         return stats
 
@@ -281,9 +491,16 @@ class StatisticalEngine:
         total_scores   = score_matrix.sum(axis=1)
         total_variance = total_scores.var(ddof=1)
 
-        if total_variance == 0:
+        return StatisticalEngine._alpha_from_variances(
+            k, float(item_variances.sum()), float(total_variance)
+        )
+
+    @staticmethod
+    def _alpha_from_variances(k: int, item_variance_sum: float, total_variance: float) -> float:
+        """Cronbach's Alpha from already-reduced variance terms."""
+        if k < 2 or total_variance == 0:
             return 0.0
 
-        alpha = (k / (k - 1)) * (1 - item_variances.sum() / total_variance)
+        alpha = (k / (k - 1)) * (1 - item_variance_sum / total_variance)
         # Clamp to [-1, 1] — negative alpha indicates fundamental structural issue
         return float(np.clip(alpha, -1.0, 1.0))
@@ -0,0 +1,3 @@
+"""
+__init__.py for benchmarks — performance scripts, run from the repo root.
+"""
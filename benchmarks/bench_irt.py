@@ -0,0 +1,55 @@
+"""
+Benchmark: IRT (MML/EM) calibration time and parameter recovery.
+
+Draws a score matrix from a known 3PL model (see generators.irt_score_matrix),
+calibrates it and reports wall time, EM cycles and recovery of a, b and θ.
+Exits non-zero if any run exceeds --budget seconds.
+
+Run from the repo root:
+  python benchmarks/bench_irt.py --students 100000 --items 200 --model 2pl --budget 60
+"""
+import argparse
+import json
+import sys
+import time
+import numpy as np
+sys.path.insert(0, ".")
+
+from backend.services.irt_engine import IRTEngine
+from benchmarks.generators import irt_score_matrix
+
+
+def run(n: int, k: int, model: str, seed: int) -> dict:
+    scores, truth = irt_score_matrix(n, k, guessing=0.2 if model == "3pl" else 0.0, seed=seed)
+
+    t0 = time.perf_counter()
+    fit = IRTEngine.fit(scores, model)
+    seconds = time.perf_counter() - t0
+
+    theta, _ = fit.abilities()
+    return {
+        "students": n,
+        "items": k,
+        "model": model,
+        "seconds": round(seconds, 3),
+        "em_cycles": fit.iterations,
+        "converged": fit.converged,
+        "a_correlation": round(float(np.corrcoef(fit.a, truth["a"])[0, 1]), 4) if model != "rasch" else None,
+        "b_rmse": round(float(np.sqrt(((fit.difficulty - truth["b"]) ** 2).mean())), 4),
+        "theta_correlation": round(float(np.corrcoef(theta, truth["theta"])[0, 1]), 4),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, nargs="+", default=[100000])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--model", choices=["rasch", "2pl", "3pl"], default="2pl")
+    parser.add_argument("--budget", type=float, default=60.0, help="max seconds per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = [run(n, args.items, args.model, args.seed) for n in args.students]
+    print(json.dumps(results, indent=2))
+    if any(r["seconds"] > args.budget for r in results):
+        sys.exit(f"IRT calibration exceeded the {args.budget:.0f} s budget.")
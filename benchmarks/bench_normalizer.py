@@ -0,0 +1,56 @@
+"""
+Benchmark: streaming cleaner + fused line classifier.
+
+Times clean_text and the full normalize() pass on debug_raw_text.txt
+repeated at several scales (1× ≈ 26 KB, 100× ≈ 2.6 MB) and reports
+throughput. Question numbers repeat across copies, which is fine for timing.
+
+Run from the repo root:
+  python benchmarks/bench_normalizer.py --scales 1 100 --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+sys.path.insert(0, ".")
+
+from backend.services.cleaner import clean_text
+from backend.services.normalizer import normalize
+
+
+def _best(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(text: str, scale: int, repeat: int) -> dict:
+    raw = "\n".join([text] * scale)
+    mb = len(raw.encode("utf-8")) / 1e6
+    clean_s = _best(clean_text, raw, repeat)
+    normalize_s = _best(normalize, raw, repeat)
+    return {
+        "scale": scale,
+        "megabytes": round(mb, 3),
+        "lines": raw.count("\n") + 1,
+        "questions": normalize(raw).exam.total_questions,
+        "clean_seconds": round(clean_s, 4),
+        "normalize_seconds": round(normalize_s, 4),
+        "normalize_mb_per_s": round(mb / normalize_s, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", default="debug_raw_text.txt")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        text = f.read()
+    results = [run(text, s, args.repeat) for s in args.scales]
+    print(json.dumps(results, indent=2))
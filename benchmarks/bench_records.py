@@ -0,0 +1,82 @@
+"""
+Benchmark: model assembly cost in the normalization, statistics and similarity paths.
+
+For each stage, reports the best wall time and the tracemalloc peak of
+one run (traced separately, since tracing slows allocation-heavy code):
+
+  normalize   rendered synthetic exam text → NormalizationResult
+  stats       StatisticalEngine.analyze_matrix on a random ResponseMatrix
+  similarity  SimilarityEngine.analyze on synthetic questions with planted copies
+
+Run from the repo root:
+  python benchmarks/bench_records.py --questions 5000 --students 2000 --similarity 20000
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, ".")
+
+import numpy as np
+
+from backend.core.models import Exam
+from backend.services.normalizer import normalize
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.similarity_engine import SimilarityEngine
+from backend.services.stats_engine import StatisticalEngine
+from benchmarks.generators import exam_text, synthetic_questions
+
+
+def _measure(fn, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 4), "peak_mb": round(peak / 1e6, 2)}
+
+
+def run(n_questions: int, n_students: int, n_similarity: int, repeat: int, seed: int) -> dict:
+    questions, _ = synthetic_questions(n_questions, seed=seed)
+    text = exam_text(questions)
+    exam = Exam(total_questions=len(questions), questions=questions)
+
+    rng = np.random.default_rng(seed)
+    labels = ["", "A", "B", "C", "D"]
+    codes = rng.integers(0, len(labels), size=(n_students, n_questions), dtype=np.uint8)
+    matrix = ResponseMatrix(
+        [f"S{i}" for i in range(n_students)], [str(q.id) for q in questions], labels, codes
+    )
+    key = {str(q.id): "A" for q in questions}
+
+    sim_questions, _ = synthetic_questions(
+        n_similarity, duplicate_rate=0.2, near_duplicate_rate=0.2, seed=seed
+    )
+
+    return {
+        "questions": n_questions,
+        "students": n_students,
+        "similarity_questions": n_similarity,
+        "normalize": _measure(lambda: normalize(text), repeat),
+        "stats": _measure(lambda: StatisticalEngine.analyze_matrix(exam, matrix, key), repeat),
+        "similarity": _measure(lambda: SimilarityEngine.analyze(sim_questions), repeat),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--similarity", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(
+        run(args.questions, args.students, args.similarity, args.repeat, args.seed), indent=2
+    ))
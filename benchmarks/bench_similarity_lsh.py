@@ -0,0 +1,66 @@
+"""
+Benchmark: MinHash/LSH candidate stage vs exhaustive sparse similarity.
+
+Reports, per bank size, the wall time of each path and the recall of the
+LSH path against the exhaustive pair set (pairs with cosine ≥ 0.60).
+
+Run from the repo root:
+  python benchmarks/bench_similarity_lsh.py --sizes 2000 10000 50000 --bands 32
+"""
+import argparse
+import json
+import sys
+import time
+sys.path.insert(0, ".")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from backend.services.lsh import MinHashLSH
+from backend.services.similarity_engine import (
+    SimilarityEngine, TFIDF_PARAMS, NEAR_DUP_THRESHOLD
+)
+from benchmarks.generators import synthetic_questions
+
+
+def run(n: int, bands: int, num_perm: int, seed: int) -> dict:
+    questions, _ = synthetic_questions(n, seed=seed)
+    texts = [q.text for q in questions]
+    X = TfidfVectorizer(**TFIDF_PARAMS).fit_transform(texts)
+
+    t0 = time.perf_counter()
+    rows, cols, _ = SimilarityEngine._similar_pairs(X, NEAR_DUP_THRESHOLD)
+    exhaustive_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+    cand_rows, cand_cols = lsh.candidate_pairs(texts)
+    l_rows, l_cols, _ = SimilarityEngine._score_candidates(
+        X, cand_rows, cand_cols, NEAR_DUP_THRESHOLD
+    )
+    lsh_s = time.perf_counter() - t0
+
+    truth = set(zip(rows.tolist(), cols.tolist()))
+    found = set(zip(l_rows.tolist(), l_cols.tolist()))
+    return {
+        "questions": n,
+        "bands": bands,
+        "num_perm": num_perm,
+        "exhaustive_pairs": len(truth),
+        "lsh_candidates": int(len(cand_rows)),
+        "lsh_pairs": len(found),
+        "recall": round(len(truth & found) / len(truth), 4) if truth else 1.0,
+        "exhaustive_seconds": round(exhaustive_s, 3),
+        "lsh_seconds": round(lsh_s, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000, 50000])
+    parser.add_argument("--bands", type=int, default=32)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = [run(n, args.bands, args.num_perm, args.seed) for n in args.sizes]
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,191 @@
+"""
+Synthetic data generators for the benchmark scripts.
+
+All generators are deterministic for a given seed so timings and
+recall figures can be compared between commits.
+"""
+import io
+import random
+import numpy as np
+from typing import Dict, List, Tuple
+
+import docx
+import fitz          # PyMuPDF
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from backend.core.models import Question, Option
+
+
+_SUBJECT_WORDS = (
+    "velocity acceleration force mass energy momentum friction gravity pressure "
+    "density voltage current resistance circuit magnet wave frequency amplitude "
+    "photon electron nucleus atom molecule reaction acid base salt oxidation "
+    "enzyme cell membrane protein gene chromosome evolution species habitat "
+    "equation function derivative integral matrix vector probability triangle "
+    "circle polygon theorem proof sequence series limit graph variable constant "
+    "capital river mountain continent climate monsoon empire dynasty treaty "
+    "revolution parliament constitution economy inflation trade market"
+).split()
+_STEMS = (
+    "What is the", "Calculate the", "Which of the following describes the",
+    "Explain why the", "Find the", "Identify the", "Determine the",
+)
+
+
+def _perturb(words: List[str], rng: random.Random, edits: int) -> List[str]:
+    """Paraphrase-like edits: swap neighbours, drop or replace a word."""
+    words = list(words)
+    for _ in range(edits):
+        op = rng.random()
+        i = rng.randrange(len(words))
+        if op < 0.4 and len(words) > 4:
+            del words[i]
+        elif op < 0.7 and i + 1 < len(words):
+            words[i], words[i + 1] = words[i + 1], words[i]
+        else:
+            words[i] = rng.choice(_SUBJECT_WORDS)
+    return words
+
+
+def synthetic_questions(
+    n: int,
+    duplicate_rate: float = 0.1,
+    near_duplicate_rate: float = 0.1,
+    seed: int = 0,
+) -> Tuple[List[Question], List[Tuple[int, int]]]:
+    """
+    n questions; a `duplicate_rate` share are verbatim copies of an earlier
+    question and a `near_duplicate_rate` share are lightly edited copies.
+    Returns the questions and the planted (source_id, copy_id) pairs.
+    """
+    rng = random.Random(seed)
+    questions: List[Question] = []
+    planted: List[Tuple[int, int]] = []
+
+    for qid in range(1, n + 1):
+        roll = rng.random()
+        if questions and roll < duplicate_rate + near_duplicate_rate:
+            src = rng.choice(questions)
+            words = src.text.split()
+            if roll >= duplicate_rate:
+                words = _perturb(words, rng, edits=rng.randint(1, 2))
+            planted.append((src.id, qid))
+        else:
+            words = rng.choice(_STEMS).split() + rng.sample(_SUBJECT_WORDS, rng.randint(6, 12))
+        questions.append(Question(
+            id=qid,
+            text=" ".join(words),
+            options=[Option(label=lbl, text=rng.choice(_SUBJECT_WORDS)) for lbl in "ABCD"],
+        ))
+
+    return questions, planted
+
+
+def irt_score_matrix(
+    n_students: int,
+    n_items: int,
+    guessing: float = 0.0,
+    seed: int = 0,
+) -> Tuple[np.ndarray, dict]:
+    """
+    Binary (n_students × n_items) score matrix drawn from a 3PL model with
+    θ ~ N(0, 1), a ~ LogNormal(0, 0.3), b ~ N(0, 1) and constant c.
+    Returns the matrix and the true parameters {"theta", "a", "b", "c"}.
+    """
+    rng = np.random.default_rng(seed)
+    theta = rng.normal(size=n_students)
+    a = rng.lognormal(0.0, 0.3, n_items)
+    b = rng.normal(size=n_items)
+    c = np.full(n_items, guessing)
+    p = c + (1 - c) / (1 + np.exp(-a * (theta[:, np.newaxis] - b)))
+    scores = (rng.random((n_students, n_items)) < p).astype(np.float64)
+    return scores, {"theta": theta, "a": a, "b": b, "c": c}
+
+
+def response_csv(
+    n_students: int,
+    n_items: int,
+    options: str = "ABCD",
+    omit_rate: float = 0.02,
+    seed: int = 0,
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Wide-format response CSV (student_id, 1, 2, …) for n_students × n_items.
+    Right/wrong is drawn from a 3PL model (see irt_score_matrix, with
+    c = 1/len(options)); wrong answers pick a random distractor and an
+    `omit_rate` share of cells is left blank. Returns the CSV bytes and
+    the answer key {question_id: label}.
+    """
+    scores, _ = irt_score_matrix(n_students, n_items, guessing=1 / len(options), seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    labels = np.array(list(options))
+    key = rng.integers(0, len(options), n_items)
+    # A wrong answer is the key shifted by 1…len-1 positions (never the key)
+    shift = rng.integers(1, len(options), size=scores.shape)
+    chosen = np.where(scores == 1, key, (key + shift) % len(options))
+    cells = labels[chosen]
+    cells[rng.random(scores.shape) < omit_rate] = ""
+
+    out = io.StringIO()
+    out.write("student_id," + ",".join(str(j) for j in range(1, n_items + 1)) + "\n")
+    for i, row in enumerate(cells):
+        out.write(f"S{i + 1}," + ",".join(row) + "\n")
+    answer_key = {str(j + 1): options[k] for j, k in enumerate(key)}
+    return out.getvalue().encode("utf-8"), answer_key
+
+
+# ─── Documents ────────────────────────────────────────────────────────────────
+
+def exam_text(questions: List[Question], answers: bool = True) -> str:
+    """Render questions as a plain-text paper the normalizer can parse."""
+    lines = []
+    for i, q in enumerate(questions):
+        lines.append(f"{i % 999 + 1}. {q.text}")        # the parser reads 1–3 digit numbers
+        lines.extend(f"({o.label.lower()}) {o.text}" for o in q.options)
+        if answers:
+            lines.append("Answer: A")
+    return "\n".join(lines)
+
+
+def exam_pdf(questions: List[Question], per_page: int = 10) -> bytes:
+    """A text-layer PDF with `per_page` questions on each page."""
+    doc = fitz.open()
+    for start in range(0, len(questions), per_page):
+        page = doc.new_page()           # A4
+        text = exam_text(questions[start:start + per_page])
+        page.insert_text((40, 50), text, fontsize=8)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def exam_docx(questions: List[Question], per_page: int = 10) -> bytes:
+    """A DOCX paper, one paragraph per line and a page break every `per_page` questions."""
+    document = docx.Document()
+    # Paragraph XML is built directly: Document.add_paragraph re-scans the
+    # body on every call, which makes multi-hundred-page papers quadratic
+    sect_pr = document.element.body.sectPr
+    for start in range(0, len(questions), per_page):
+        for line in exam_text(questions[start:start + per_page]).split("\n"):
+            sect_pr.addprevious(_docx_paragraph(text=line))
+        sect_pr.addprevious(_docx_paragraph(page_break=True))
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _docx_paragraph(text: str = "", page_break: bool = False):
+    paragraph, run = OxmlElement("w:p"), OxmlElement("w:r")
+    if page_break:
+        br = OxmlElement("w:br")
+        br.set(qn("w:type"), "page")
+        run.append(br)
+    else:
+        t = OxmlElement("w:t")
+        t.set(qn("xml:space"), "preserve")
+        t.text = text
+        run.append(t)
+    paragraph.append(run)
+    return paragraph
@@ -0,0 +1,246 @@
+"""
+Benchmark suite: every engine across size sweeps, as one JSON document.
+
+Each (case, size) runs in a fresh interpreter so its peak RSS is its own:
+the child builds its synthetic input (benchmarks/generators.py), records
+the RSS high-water mark, runs the work `--repeat` times and reports the
+best wall time, throughput and the peak RSS during the runs.
+
+  normalize    rendered exam text of N questions → NormalizationResult
+  responses    parse_response_csv on an N-student × --items CSV (3PL draws)
+  stats        StatisticalEngine.analyze on the same parsed responses
+  similarity   SimilarityEngine.analyze on N questions with planted copies
+  ingest_pdf   IngestionService.process_file + normalize on an N-page PDF
+  ingest_docx  the same on an N-page DOCX
+
+Output carries the git commit; `--compare old.json` adds each case's
+speedup over a previous run (> 1 is faster).
+
+Run from the repo root:
+  python benchmarks/suite.py --output bench.json
+  python benchmarks/suite.py --cases stats similarity --sizes 1000 20000 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+sys.path.insert(0, ".")
+
+
+# Default size sweep per case (questions, students or pages)
+SWEEPS: Dict[str, List[int]] = {
+    "normalize": [1000, 5000, 20000],
+    "responses": [1000, 10000, 50000],
+    "stats": [1000, 10000, 50000],
+    "similarity": [1000, 5000, 20000],
+    "ingest_pdf": [50, 200, 500],
+    "ingest_docx": [50, 200, 500],
+}
+QUESTIONS_PER_PAGE = 10
+
+
+# ─── Cases (run in the child) ─────────────────────────────────────────────────
+# Each returns the work to time and what one run processes:
+# {"unit": name, "units": count, "bytes": input size or 0}
+
+def _case_normalize(size: int, items: int, seed: int) -> Tuple[Callable, dict]:
+    from backend.services.normalizer import normalize
+    from benchmarks.generators import exam_text, synthetic_questions
+
+    questions, _ = synthetic_questions(size, seed=seed)
+    text = exam_text(questions)
+    return lambda: normalize(text), {"unit": "questions", "units": size, "bytes": len(text.encode())}
+
+
+def _case_responses(size: int, items: int, seed: int) -> Tuple[Callable, dict]:
+    from backend.services.response_parser import parse_response_csv
+    from benchmarks.generators import response_csv
+
+    content, _ = response_csv(size, items, seed=seed)
+    return lambda: parse_response_csv(content), {"unit": "students", "units": size, "bytes": len(content)}
+
+
+def _case_stats(size: int, items: int, seed: int) -> Tuple[Callable, dict]:
+    from backend.core.models import Exam
+    from backend.services.response_parser import parse_response_csv
+    from backend.services.stats_engine import StatisticalEngine
+    from benchmarks.generators import response_csv, synthetic_questions
+
+    content, key = response_csv(size, items, seed=seed)
+    responses = parse_response_csv(content)
+    questions, _ = synthetic_questions(items, seed=seed)
+    exam = Exam(total_questions=items, questions=questions)
+    return (
+        lambda: StatisticalEngine.analyze(exam, responses, key),
+        {"unit": "students", "units": size, "bytes": 0},
+    )
+
+
+def _case_similarity(size: int, items: int, seed: int) -> Tuple[Callable, dict]:
+    from backend.services.similarity_engine import SimilarityEngine
+    from benchmarks.generators import synthetic_questions
+
+    questions, _ = synthetic_questions(size, duplicate_rate=0.1, near_duplicate_rate=0.1, seed=seed)
+    return lambda: SimilarityEngine.analyze(questions), {"unit": "questions", "units": size, "bytes": 0}
+
+
+def _ingest_case(ext: str, render: Callable) -> Callable:
+    def case(size: int, items: int, seed: int) -> Tuple[Callable, dict]:
+        from backend.services.ingestion import IngestionService
+        from backend.services.normalizer import normalize
+        from benchmarks.generators import synthetic_questions
+
+        questions, _ = synthetic_questions(size * QUESTIONS_PER_PAGE, seed=seed)
+        content = render(questions, QUESTIONS_PER_PAGE)
+        fd, path = tempfile.mkstemp(suffix=ext)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+
+        def work():
+            extraction = IngestionService.process_file(path, ext)
+            return normalize(extraction["raw_text"])
+
+        return work, {"unit": "pages", "units": size, "bytes": len(content), "cleanup": path}
+    return case
+
+
+def _render_pdf(questions, per_page):
+    from benchmarks.generators import exam_pdf
+    return exam_pdf(questions, per_page)
+
+
+def _render_docx(questions, per_page):
+    from benchmarks.generators import exam_docx
+    return exam_docx(questions, per_page)
+
+
+CASES: Dict[str, Callable] = {
+    "normalize": _case_normalize,
+    "responses": _case_responses,
+    "stats": _case_stats,
+    "similarity": _case_similarity,
+    "ingest_pdf": _ingest_case(".pdf", _render_pdf),
+    "ingest_docx": _ingest_case(".docx", _render_docx),
+}
+
+
+def _max_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    kb = resource.getrusage(who).ru_maxrss          # kilobytes on Linux, bytes on macOS
+    return round(kb / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def run_case(case: str, size: int, items: int, repeat: int, seed: int) -> dict:
+    """Time one (case, size) in this process."""
+    work, info = CASES[case](size, items, seed)
+    cleanup = info.pop("cleanup", None)
+    setup_rss = _max_rss_mb()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            work()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        if cleanup:
+            os.unlink(cleanup)
+
+    result = {
+        "case": case,
+        "size": size,
+        "seconds": round(best, 4),
+        "throughput": round(info["units"] / best, 1),
+        "unit": f"{info['unit']}/s",
+        "setup_rss_mb": setup_rss,
+        "peak_rss_mb": _max_rss_mb(),
+        # process pools (page-parallel PDF extraction) run outside this process
+        "peak_child_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+    if case in ("responses", "stats"):
+        result["items"] = items
+    if info["bytes"]:
+        result["mb_per_second"] = round(info["bytes"] / 1e6 / best, 2)
+    return result
+
+
+# ─── Driver ───────────────────────────────────────────────────────────────────
+
+def _run_child(case: str, size: int, items: int, repeat: int, seed: int) -> dict:
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--child", case, str(size),
+        "--items", str(items), "--repeat", str(repeat), "--seed", str(seed),
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"case": case, "size": size, "error": lines[-1] if lines else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(results: List[dict], baseline: dict) -> None:
+    """Add `speedup` (baseline seconds / seconds) where the baseline has the same case."""
+    old = {(r["case"], r["size"], r.get("items")): r for r in baseline.get("results", [])}
+    for r in results:
+        before = old.get((r["case"], r["size"], r.get("items")))
+        if before and "seconds" in before and "seconds" in r:
+            r["baseline_seconds"] = before["seconds"]
+            r["speedup"] = round(before["seconds"] / r["seconds"], 3)
+
+
+def run(cases: List[str], sizes: Optional[List[int]], items: int, repeat: int, seed: int) -> dict:
+    results = []
+    for case in cases:
+        for size in sizes or SWEEPS[case]:
+            results.append(_run_child(case, size, items, repeat, seed))
+            print(json.dumps(results[-1]), file=sys.stderr)
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", help="Override every case's size sweep")
+    parser.add_argument("--items", type=int, default=100, help="Questions per response CSV")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="Previous suite JSON to compute speedups against")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, size = args.child
+        print(json.dumps(run_case(case, int(size), args.items, args.repeat, args.seed)))
+        sys.exit(0)
+
+    report = run(args.cases, args.sizes, args.items, args.repeat, args.seed)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report["results"], json.load(f))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,14 @@
+"""
+pytest setup for the root-level smoke tests.
+"""
+import pytest
+
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+
+
+@pytest.fixture(autouse=True)
+def _private_extraction_cache(tmp_path):
+    """Every test gets its own extraction cache instead of ./extraction_cache/."""
+    previous = set_extraction_cache(ExtractionCache(str(tmp_path / "extraction_cache")))
+    yield
+    set_extraction_cache(previous)
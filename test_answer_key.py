@@ -0,0 +1,123 @@
+"""
+Smoke test for trailing answer keys: grids, tables and DOCX tables → correct_option.
+Run: python test_answer_key.py
+"""
+import io
+import json
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+import docx
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services.answer_key import apply_answer_key, parse_answer_key, split_answer_key
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+from backend.services.ingestion import IngestionService
+from backend.services.normalizer import iter_questions, normalize
+
+QUESTIONS = """1. What is the capital of France?
+(A) London
+(B) Paris
+(C) Rome
+2. Which planet is largest?
+(A) Mars
+(B) Venus
+(C) Jupiter
+Answer: A
+3. What is H2O?
+(A) Water
+(B) Salt
+(C) Sugar
+"""
+
+LAYOUTS = {
+    "grid": "1-B 2-C 3-A",
+    "titled pairs": "Answer Key\n1. B\n2. C\n3. A",
+    "table rows": "Q.No | Answer\n1 | B\n2 | C\n3 | A",
+    "transposed": "Q | 1 | 2 | 3\nAns | B | C | A",
+    "cells per line": "Q.No | Answer\n1\nB\n2\nC\n3\nA",
+    "untitled pairs": "1. B\n2. C\n3. A",
+}
+
+
+def test_trailing_keys_fill_correct_option():
+    for layout, key in LAYOUTS.items():
+        result = normalize(QUESTIONS + key)
+        questions = result.exam.questions
+        assert [q.id for q in questions] == [1, 2, 3], layout
+        assert [q.correct_option for q in questions] == ["B", "A", "A"], layout   # inline A stays
+        assert questions[2].options[-1].text == "Sugar", layout      # key text not glued on
+        assert "Q2: key 'C' conflicts with inline answer 'A'; kept the inline answer." in result.warnings, layout
+    print(f"  OK {len(LAYOUTS)} answer-key layouts fill correct_option")
+
+
+def test_question_text_is_not_a_key():
+    text = "1. Evaluate\n2\nB\nwhere B is a field.\n(A) 2 (B) 4\n5. (c) stands alone\n(A) x\n(B) y"
+    key = {}
+    assert list(split_answer_key(text.splitlines(), key)) == text.splitlines()
+    assert key == {}
+    assert parse_answer_key("Answer: C\n12 Apples\n1. What is 5.20 m?") == {}
+
+    # A matching table in a question stem is neither removed nor a key
+    text = "1. What is 2+2?\na) 3\nb) 4\nAnswer: B\n2. Match the columns:\n1 2 3\nA B C\n(a) x\n(b) y"
+    result = normalize(text)
+    assert [q.correct_option for q in result.exam.questions] == ["B", None]
+    assert result.exam.questions[1].text == "Match the columns: 1 2 3 A B C"
+    # ... and an untitled block followed by more text is text too
+    assert parse_answer_key(QUESTIONS + "1-B 2-C 3-A\nEnd of paper") == {}
+
+    warnings = []
+    result = normalize(QUESTIONS + "1-B 2-C 7-D 9-A")
+    assert "No question matches 2 answer-key entries (first: Q7)." in result.warnings
+    assert apply_answer_key(result.exam.questions, {"1": "E"}, warnings) == 0
+    assert warnings == ["Q1: key 'E' is not one of its options; ignored."]
+    assert result.exam.questions[0].correct_option == "B"
+    print("  OK formula fragments and prose are left alone, mismatches reported")
+
+
+def test_docx_tables_are_extracted():
+    document = docx.Document()
+    for line in QUESTIONS.splitlines():
+        document.add_paragraph(line)
+    document.add_paragraph("Answer Key")
+    table = document.add_table(rows=4, cols=2)
+    for row, cells in zip(table.rows, [("Q.No", "Answer"), ("1", "B"), ("2", "C"), ("3", "A")]):
+        for cell, text in zip(row.cells, cells):
+            cell.text = text
+    document.add_paragraph("End of paper")
+    buf = io.BytesIO()
+    document.save(buf)
+
+    raw = IngestionService.process_file(buf.getvalue(), ".docx")["raw_text"]
+    assert raw.splitlines()[-6:] == ["Answer Key", "Q.No | Answer", "1 | B", "2 | C", "3 | A", "End of paper"]
+    assert [q.correct_option for q in normalize(raw).exam.questions] == ["B", "A", "A"]
+    print("  OK DOCX tables extracted in order and read as an answer key")
+
+
+def test_streaming_summary_carries_key():
+    text = QUESTIONS + LAYOUTS["grid"]
+    key = {}
+    streamed = list(iter_questions(text.splitlines(), answer_key=key))
+    assert key == {"1": "B", "2": "C", "3": "A"}
+    assert [q.correct_option for q in streamed] == [None, "A", None]   # key comes after
+
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as d:
+        previous = set_extraction_cache(ExtractionCache(d))
+        try:
+            res = client.post("/api/upload/stream", files={"file": ("p.txt", text.encode(), "text/plain")})
+        finally:
+            set_extraction_cache(previous)
+    summary = json.loads(res.text.splitlines()[-1])
+    assert summary["type"] == "summary"
+    assert summary["correct_answers"] == {"1": "B", "2": "A", "3": "A"}
+    print("  OK streamed upload reports the trailing key in its summary")
+
+
+if __name__ == "__main__":
+    test_trailing_keys_fill_correct_option()
+    test_question_text_is_not_a_key()
+    test_docx_tables_are_extracted()
+    test_streaming_summary_carries_key()
+    print("\nAll answer key tests passed OK")
@@ -0,0 +1,100 @@
+"""
+Smoke test for the multi-exam batch analysis endpoint (NDJSON).
+Run: python test_batch_analysis.py
+"""
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.core.models import Exam, Question, Option
+from backend.services import batch_analysis
+from backend.services.stats_engine import StatisticalEngine
+
+
+def _entry(exam_id):
+    exam = Exam(exam_id=exam_id, total_questions=3, questions=[
+        Question(id=1, text="What is the capital of France?",
+                 options=[Option(label=l, text=l) for l in "ABCD"]),
+        Question(id=2, text="What is the capital city of France?",
+                 options=[Option(label=l, text=l) for l in "ABCD"]),
+        Question(id=3, text="Who wrote Hamlet?",
+                 options=[Option(label=l, text=l) for l in "ABCD"]),
+    ])
+    return {
+        "exam": exam.model_dump(),
+        "student_responses": [
+            {"student_id": "S1", "responses": {"1": "A", "2": "B", "3": "C"}},
+            {"student_id": "S2", "responses": {"1": "A", "2": "C", "3": "D"}},
+            {"student_id": "S3", "responses": {"1": "B", "2": "B", "3": "C"}},
+        ],
+        "correct_answers": {"1": "A", "2": "B", "3": "C"},
+    }
+
+
+def _records(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_streams_each_exam():
+    entries = [_entry(f"paper-{i}") for i in range(4)]
+    entries.append({"exam": {"questions": "not a list"}})          # invalid entry
+    client = TestClient(app)
+    old_workers = batch_analysis.BATCH_WORKERS
+    for workers in (1, 2):                                           # inline and pooled
+        batch_analysis.BATCH_WORKERS = workers
+        r = client.post("/api/analyze/batch", json={"exams": entries})
+        assert r.status_code == 200, r.text
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        records = _records(r)
+        results = {rec["index"]: rec for rec in records if rec["type"] == "result"}
+        errors = [rec for rec in records if rec["type"] == "error"]
+        assert sorted(results) == [0, 1, 2, 3] and [e["index"] for e in errors] == [4]
+        assert records[-1] == {**records[-1], "type": "summary", "total": 5,
+                               "succeeded": 4, "failed": 1}
+
+        expected = StatisticalEngine.analyze(
+            Exam(**entries[0]["exam"]), entries[0]["student_responses"],
+            entries[0]["correct_answers"],
+        )
+        assert results[0]["stats"] == expected.model_dump()
+        assert results[0]["similarity"]["total_questions"] == 3
+    batch_analysis.BATCH_WORKERS = old_workers
+    print("  OK /api/analyze/batch (inline + process pool)")
+
+
+def test_closing_the_stream_cancels_pending_entries():
+    submitted = []
+
+    class _Pool(ThreadPoolExecutor):
+        def submit(self, *args):
+            submitted.append(super().submit(*args))
+            return submitted[-1]
+
+    old = batch_analysis.BATCH_WORKERS, batch_analysis.get_pool
+    with _Pool(max_workers=1) as pool:
+        batch_analysis.BATCH_WORKERS, batch_analysis.get_pool = 2, lambda *args: pool
+        try:
+            lines = batch_analysis.iter_batch_results([_entry(f"paper-{i}") for i in range(20)])
+            assert json.loads(next(lines))["type"] == "result"
+            lines.close()                                            # client disconnected
+        finally:
+            batch_analysis.BATCH_WORKERS, batch_analysis.get_pool = old
+    assert len(submitted) == 20 and sum(f.cancelled() for f in submitted) >= 15
+    print("  OK closing the stream cancels entries not yet started")
+
+
+def test_batch_rejects_bad_manifest():
+    client = TestClient(app)
+    assert client.post("/api/analyze/batch", json={"exams": []}).status_code == 400
+    assert client.post("/api/analyze/batch", content=b"{not json").status_code == 422
+    print("  OK manifest validation")
+
+
+if __name__ == "__main__":
+    test_batch_streams_each_exam()
+    test_closing_the_stream_cancels_pending_entries()
+    test_batch_rejects_bad_manifest()
+    print("\nAll batch analysis tests passed OK")
@@ -0,0 +1,66 @@
+"""
+Smoke test for the benchmark generators and suite runner.
+Run: python test_benchmarks.py
+"""
+import os
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+from backend.services.ingestion import IngestionService
+from backend.services.normalizer import normalize
+from backend.services.response_parser import parse_response_csv
+from benchmarks.generators import exam_docx, exam_pdf, response_csv, synthetic_questions
+from benchmarks.suite import CASES, compare, run_case
+
+
+def _ingest(content: bytes, ext: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        return IngestionService.process_file(path, ext)["raw_text"]
+    finally:
+        os.unlink(path)
+
+
+def test_documents_round_trip():
+    questions, _ = synthetic_questions(45, seed=3)
+    pdf = exam_pdf(questions, per_page=10)
+    for content, ext in ((pdf, ".pdf"), (exam_docx(questions, per_page=10), ".docx")):
+        result = normalize(_ingest(content, ext))
+        assert result.exam.total_questions == 45, ext
+        assert [q.text for q in result.exam.questions] == [q.text for q in questions], ext
+    print("  OK generated PDF and DOCX papers parse back to the same questions")
+
+
+def test_response_csv():
+    content, key = response_csv(300, 20, seed=1)
+    rows = parse_response_csv(content)
+    assert len(rows) == 300 and len(key) == 20
+    answers = [a for r in rows for a in r["responses"].values() if a]
+    assert set(answers) <= set("ABCD")
+    correct = sum(r["responses"].get(q) == k for r in rows for q, k in key.items())
+    assert 0.3 < correct / (300 * 20) < 0.9           # 3PL with c = 0.25
+    assert response_csv(300, 20, seed=1) == (content, key)
+    print("  OK response CSV is deterministic and follows the answer key")
+
+
+def test_run_case_reports_json():
+    for case in CASES:
+        size = 2 if case.startswith("ingest") else 30
+        result = run_case(case, size, items=10, repeat=1, seed=0)
+        assert result["case"] == case and result["seconds"] > 0
+        assert result["peak_rss_mb"] >= result["setup_rss_mb"] > 0
+
+    results = [dict(result)]
+    compare(results, {"results": [dict(result, seconds=result["seconds"] * 2)]})
+    assert results[0]["speedup"] == 2.0
+    print("  OK every suite case runs and reports throughput and RSS")
+
+
+if __name__ == "__main__":
+    test_documents_round_trip()
+    test_response_csv()
+    test_run_case_reports_json()
+    print("\nAll benchmark tests passed OK")
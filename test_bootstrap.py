@@ -0,0 +1,89 @@
+"""
+Smoke test for bootstrap confidence intervals on CTT metrics.
+Run: python test_bootstrap.py
+"""
+import sys
+import time
+import numpy as np
+sys.path.insert(0, ".")
+
+from backend.core.models import Exam, Question, Option
+from backend.services import bootstrap, process_pool
+from backend.services.bootstrap import bootstrap_intervals
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.stats_engine import StatisticalEngine
+
+
+def _scores(n, k, seed=0):
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(size=(n, 1))
+    difficulty = rng.normal(size=(1, k))
+    return (rng.random((n, k)) < 1 / (1 + np.exp(difficulty - ability))).astype(np.float64)
+
+
+def test_deterministic_across_chunking_and_pool():
+    scores = _scores(300, 10)
+    old_cells, old_workers = bootstrap.CHUNK_CELLS, bootstrap.BOOTSTRAP_WORKERS
+    try:
+        bootstrap.CHUNK_CELLS = 300 * 10 * 16                   # 13 chunks of ≤ 16 resamples
+        bootstrap.BOOTSTRAP_WORKERS = 2
+        pooled = bootstrap_intervals(scores, 200, seed=7)
+        bootstrap.BOOTSTRAP_WORKERS = 1
+        unpooled = bootstrap_intervals(scores, 200, seed=7)
+    finally:
+        bootstrap.CHUNK_CELLS, bootstrap.BOOTSTRAP_WORKERS = old_cells, old_workers
+    for a, b in zip(pooled, unpooled):
+        assert np.array_equal(a, b)
+    assert pooled[0].shape == (10, 2) and pooled[2].shape == (2,)
+    print("  OK same seed → same intervals, pooled or not")
+
+
+def test_pool_spawns_and_stops_with_the_app():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    with TestClient(app):
+        pool = process_pool.get_pool("bootstrap", 2)
+        assert pool.submit(int, "7").result() == 7
+        assert pool._mp_context.get_start_method() == "spawn"
+    assert process_pool._pools == {}
+    assert process_pool.get_pool("bootstrap", 2) is not pool        # restarts on demand
+    process_pool.shutdown_pools()
+    print("  OK shared pool uses spawn and shuts down with the app")
+
+
+def test_intervals_attached_and_shrink_with_n():
+    k = 8
+    exam = Exam(exam_id="boot-test-001", total_questions=k, questions=[
+        Question(id=j + 1, text=f"Q{j + 1}", options=[Option(label=l, text=l) for l in "AB"])
+        for j in range(k)
+    ])
+    key = {str(j + 1): "A" for j in range(k)}
+    widths = []
+    for n in (40, 4000):
+        scores = _scores(n, k, seed=n)
+        codes = np.where(scores > 0, 1, 2).astype(np.uint8)         # 1 = A (correct), 2 = B
+        matrix = ResponseMatrix([f"S{i}" for i in range(n)], list(key), ["", "A", "B"], codes)
+        stats = StatisticalEngine.analyze_matrix(exam, matrix, key, bootstrap=300, seed=1)
+        assert stats.bootstrap_resamples == 300
+        q = stats.question_stats[0]
+        assert q.difficulty_ci.lower <= q.difficulty_index <= q.difficulty_ci.upper
+        assert stats.cronbach_alpha_ci.lower <= stats.cronbach_alpha_ci.upper
+        widths.append(q.discrimination_ci.upper - q.discrimination_ci.lower)
+    assert widths[1] < widths[0]
+    print(f"  OK D interval width {widths[0]:.3f} (n=40) → {widths[1]:.3f} (n=4000)")
+
+
+def test_timing_10k_by_100():
+    scores = _scores(10_000, 100)
+    t0 = time.perf_counter()
+    bootstrap_intervals(scores, 1000, seed=0)
+    print(f"  OK 1,000 resamples on 10k × 100 in {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    test_deterministic_across_chunking_and_pool()
+    test_pool_spawns_and_stops_with_the_app()
+    test_intervals_attached_and_shrink_with_n()
+    test_timing_10k_by_100()
+    print("\nAll bootstrap tests passed OK")
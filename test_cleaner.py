@@ -0,0 +1,67 @@
+"""
+Smoke test for the streaming cleaner — fuzzed against the original
+whole-text implementation, which is kept here as the reference.
+Run: python test_cleaner.py
+"""
+import random
+import re
+import sys
+sys.path.insert(0, ".")
+
+from backend.services.cleaner import _NOISE_PATTERNS, clean_text, iter_clean_lines
+
+_REFERENCE_NOISE = [re.compile(p, re.IGNORECASE) for p in _NOISE_PATTERNS]
+
+
+def _reference_clean_text(raw: str) -> str:
+    cleaned_lines = []
+    for line in raw.splitlines():
+        if any(p.match(line.strip()) for p in _REFERENCE_NOISE):
+            continue
+        line = re.sub(r"[ \t]+", " ", line).strip()
+        if line:
+            cleaned_lines.append(line)
+    text = "\n".join(cleaned_lines)
+    text = re.sub(r"RESPONSE[\s\n]*GRID[\s\d\.\n]*Space for Rough Work(?:.*?(?:\n|$))?", "", text,
+                  flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r"\[.*?\]", "", text, flags=re.DOTALL)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+TOKENS = [
+    "RESPONSE", "response", "GRID", "Space for Rough Work", "1.", "2.", " ", "  ", "\t",
+    "\n", "\n", "\n\n", "\r\n", "[", "]", "x", "Q1", "(a)", "b)", "Answer: C", "Page 3",
+    "12", "---", "DPP 3", "Section II", "©x", "5.20m", ".", "Space", "tail",
+    "RESPONSE\nGRID\n1.\n2.\nSpace for Rough Work tail",
+]
+
+
+def test_matches_reference_on_fuzzed_input():
+    rng = random.Random(7)
+    for _ in range(5000):
+        raw = "".join(rng.choice(TOKENS) for _ in range(rng.randint(0, 30)))
+        assert clean_text(raw) == _reference_clean_text(raw), repr(raw)
+    print("  OK 5000 fuzzed inputs match the whole-text cleaner")
+
+
+def test_matches_reference_on_debug_text():
+    with open("debug_raw_text.txt", encoding="utf-8") as f:
+        raw = f.read()
+    assert clean_text(raw) == _reference_clean_text(raw)
+    assert list(iter_clean_lines(raw.splitlines())) == clean_text(raw).split("\n")
+    print("  OK debug_raw_text.txt (response grids + rough-work brackets)")
+
+
+def test_grid_and_bracket_spans():
+    raw = "1. Speed of\nRESPONSE\nGRID\n1.\n2.\nSpace for Rough Work\nlight [rough\nwork] is c\n(a) fast"
+    assert list(iter_clean_lines(raw)) == ["1. Speed of", "light  is c", "(a) fast"]
+    assert list(iter_clean_lines("a [never closed\nb\nc")) == ["a [never closed", "b", "c"]
+    print("  OK multi-line grid + bracket removal")
+
+
+if __name__ == "__main__":
+    test_matches_reference_on_fuzzed_input()
+    test_matches_reference_on_debug_text()
+    test_grid_and_bracket_spans()
+    print("\nAll cleaner tests passed OK")
@@ -12,6 +12,7 @@ from fastapi.testclient import TestClient
 sys.path.insert(0, ".")
 from backend.main import app
 from backend.core.models import Exam, Question, Option
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
 
 client = TestClient(app)
 
@@ -108,6 +109,7 @@ def test_similarity_and_responses():
     print(f"✓ CTT Responses OK (Cronbach Alpha: {stats_data['cronbach_alpha']:.3f})")
 
 if __name__ == "__main__":
+    set_extraction_cache(ExtractionCache(None))      # keep ./extraction_cache/ clean
     try:
         test_health()
         test_similarity_and_responses()
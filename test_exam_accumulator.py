@@ -0,0 +1,132 @@
+"""
+Smoke test for incremental CTT statistics (append-only student batches).
+Run: python test_exam_accumulator.py
+"""
+import sys
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.core.models import Exam, Question, Option
+from backend.services import exam_accumulator
+from backend.services.exam_accumulator import (
+    ExamAccumulator, create_accumulator, drop_accumulator, get_accumulator
+)
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.stats_engine import StatisticalEngine
+
+exam = Exam(
+    exam_id="acc-test-001",
+    total_questions=3,
+    questions=[
+        Question(id=i, text=f"Question {i}",
+                 options=[Option(label=l, text=l) for l in "ABCD"])
+        for i in (1, 2, 3)
+    ],
+)
+correct_answers = {"1": "A", "2": "B", "3": "C"}
+
+# Raw scores 3, 2, 1, 0 — no ties at the 27% boundary
+student_responses = [
+    {"student_id": "S1", "responses": {"1": "A", "2": "B", "3": "C"}},
+    {"student_id": "S2", "responses": {"1": "A", "2": "B", "3": "D"}},
+    {"student_id": "S3", "responses": {"1": "A", "2": "C"}},
+    {"student_id": "S4", "responses": {"1": "D", "2": "D", "3": "D"}},
+]
+Q_IDS = ["1", "2", "3"]
+
+
+def test_batches_match_full_analysis():
+    acc = ExamAccumulator(exam, correct_answers)
+    acc.append(ResponseMatrix.from_dicts(student_responses[:1], Q_IDS))
+    acc.append(ResponseMatrix.from_dicts(student_responses[1:3], Q_IDS))
+    acc.append(ResponseMatrix.from_dicts(student_responses[3:], Q_IDS))
+
+    online = acc.stats()
+    batch = StatisticalEngine.analyze(exam, student_responses, correct_answers)
+    assert online == batch, (online, batch)
+    assert acc.score_hist.tolist() == [1, 1, 1, 1]
+    print("  OK online stats == batch stats")
+
+
+def test_multi_answer_keys_agree_everywhere():
+    # Q3 accepts C or D; the same key as a list, a comma string and over the API
+    key = {"1": "A", "2": "B", "3": ["C", "D"]}
+    acc = ExamAccumulator(exam, {"1": "a", "2": "B", "3": "D, c"})
+    acc.append(ResponseMatrix.from_dicts(student_responses[:2], Q_IDS))
+    acc.append(ResponseMatrix.from_dicts(student_responses[2:], Q_IDS))
+    batch = StatisticalEngine.analyze(exam, student_responses, key)
+    assert acc.stats() == batch
+    assert batch.question_stats[2].difficulty_index == 0.75
+
+    client = TestClient(app)
+    body = {"exam": exam.model_dump(), "student_responses": student_responses, "correct_answers": key}
+    r = client.post("/api/analyze/", json=body)
+    assert r.status_code == 200, r.text
+    assert r.json()["question_stats"][2]["difficulty_index"] == 0.75
+
+    csv = b"student_id,1,2,3\nS1,A,B,C\nS2,A,B,D\nS3,A,C,\nS4,D,D,D\n"
+    r = client.post("/api/responses/upload", data={
+        "exam_json": exam.model_dump_json(), "correct_answers_json": '{"1": "A", "2": "B", "3": ["C", "D"]}',
+    }, files={"file": ("r.csv", csv, "text/csv")})
+    assert r.status_code == 200, r.text
+    assert r.json()["question_stats"][2]["difficulty_index"] == 0.75
+    print("  OK multi-answer keys score the same in every entry point")
+
+
+def test_api_append_and_stats():
+    client = TestClient(app)
+    exam_json = exam.model_dump()
+    r = client.post("/api/exams/", json={"exam": exam_json, "correct_answers": correct_answers})
+    assert r.status_code == 200, r.text
+
+    r = client.get(f"/api/exams/{exam.exam_id}/stats")
+    assert r.status_code == 422                  # nobody appended yet
+
+    r = client.post(f"/api/exams/{exam.exam_id}/responses:append",
+                    json={"student_responses": student_responses[:2]})
+    assert r.status_code == 200, r.text
+    assert r.json()["total_students"] == 2
+
+    csv_batch = b"student_id,1,2,3\nS3,A,C,\nS4,D,D,D\n"
+    r = client.post(f"/api/exams/{exam.exam_id}/responses:upload",
+                    files={"file": ("batch.csv", csv_batch, "text/csv")})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"exam_id": exam.exam_id, "total_questions": 3,
+                        "total_students": 4, "batches": 2}
+
+    r = client.get(f"/api/exams/{exam.exam_id}/stats")
+    assert r.status_code == 200, r.text
+    assert r.json()["total_students"] == 4
+    assert r.json()["question_stats"][0]["difficulty_index"] == 0.75
+
+    assert client.get("/api/exams/missing/stats").status_code == 404
+    assert client.delete(f"/api/exams/{exam.exam_id}").json() == {"deleted": exam.exam_id}
+    assert client.get(f"/api/exams/{exam.exam_id}/stats").status_code == 404
+    assert client.delete(f"/api/exams/{exam.exam_id}").status_code == 404
+    print("  OK /api/exams append + stats + delete")
+
+
+def test_registry_keeps_most_recently_used():
+    saved = exam_accumulator.EXAM_ACCUMULATORS_MAX
+    exam_accumulator.EXAM_ACCUMULATORS_MAX = 2
+    try:
+        for name in ("lru-a", "lru-b"):
+            create_accumulator(exam.model_copy(update={"exam_id": name}), correct_answers)
+        assert get_accumulator("lru-a") is not None          # a is now the most recent
+        create_accumulator(exam.model_copy(update={"exam_id": "lru-c"}), correct_answers)
+        assert get_accumulator("lru-b") is None
+        assert get_accumulator("lru-a") is not None and get_accumulator("lru-c") is not None
+    finally:
+        exam_accumulator.EXAM_ACCUMULATORS_MAX = saved
+        for name in ("lru-a", "lru-c"):
+            drop_accumulator(name)
+    print("  OK registry keeps the most recently used sittings")
+
+
+if __name__ == "__main__":
+    test_batches_match_full_analysis()
+    test_multi_answer_keys_agree_everywhere()
+    test_api_append_and_stats()
+    test_registry_keeps_most_recently_used()
+    print("\nAll accumulator tests passed OK")
@@ -0,0 +1,81 @@
+"""
+Smoke test for the content-addressed extraction cache.
+Run: python test_extraction_cache.py
+"""
+import io
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services.extraction_cache import ExtractionCache, CACHE_VERSION, set_extraction_cache
+from backend.services.ingestion import IngestionService
+from backend.services.normalizer import normalize
+
+PAPER = b"""1. What is the capital of France?
+(A) London
+(B) Paris
+Answer: B
+"""
+
+
+def test_memory_and_disk_tiers():
+    result = normalize(PAPER.decode(), source_file="paper.txt")
+    with tempfile.TemporaryDirectory() as d:
+        cache = ExtractionCache(d, max_entries=1)
+        digest = ExtractionCache.digest_stream(io.BytesIO(PAPER))
+        assert digest == ExtractionCache.digest_bytes(PAPER)
+        assert cache.get(digest) is None
+
+        cache.put(digest, {"raw_text": PAPER.decode(), "type": "text"}, result)
+        extraction, cached = cache.get(digest)
+        assert extraction["type"] == "text"
+        assert cached == result
+
+        # Evicted from the 1-entry memory LRU, still served from disk
+        cache.put("0" * 64, {"raw_text": "", "type": "text"}, result)
+        assert list(cache._memory) == [f"{CACHE_VERSION}-{'0' * 64}"]
+        assert cache.get(digest)[1] == result
+
+        # A fresh process re-discovers the disk entries
+        assert ExtractionCache(d).get(digest)[1] == result
+
+        # Disk budget: only the most recent entry survives
+        tiny = ExtractionCache(d, max_disk_bytes=1)
+        tiny.put("f" * 64, {"raw_text": "", "type": "text"}, result)
+        assert len(tiny._disk) <= 1
+    print("  OK memory LRU + disk tier")
+
+
+def test_repeat_upload_skips_extraction():
+    client = TestClient(app)
+    calls = []
+    original = IngestionService.process_file
+
+    def counting(file_path, file_ext):
+        calls.append(file_path)
+        return original(file_path, file_ext)
+
+    with tempfile.TemporaryDirectory() as d:
+        previous = set_extraction_cache(ExtractionCache(d))
+        IngestionService.process_file = staticmethod(counting)
+        try:
+            first = client.post("/api/upload/", files={"file": ("a.txt", PAPER, "text/plain")})
+            second = client.post("/api/upload/", files={"file": ("b.txt", PAPER, "text/plain")})
+        finally:
+            IngestionService.process_file = staticmethod(original)
+            set_extraction_cache(previous)
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert len(calls) == 1
+    a, b = first.json()["exam"], second.json()["exam"]
+    assert a["questions"] == b["questions"]
+    assert b["source_file"] == "b.txt" and a["exam_id"] != b["exam_id"]
+    print("  OK repeat upload served from cache")
+
+
+if __name__ == "__main__":
+    test_memory_and_disk_tiers()
+    test_repeat_upload_skips_extraction()
+    print("\nAll extraction cache tests passed OK")
@@ -0,0 +1,102 @@
+"""
+Smoke test for report pagination and the opt-in fast response path.
+Run: python test_fast_responses.py
+"""
+import json
+import sys
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.api import reports
+from backend.core.models import Exam, Question, Option
+from benchmarks.generators import synthetic_questions
+
+
+def _payload(n_questions=12):
+    questions = [
+        Question(id=i, text=f"Question {i} about topic {i}?",
+                 options=[Option(label=l, text=f"{l}{i}") for l in "ABCD"])
+        for i in range(1, n_questions + 1)
+    ]
+    exam = Exam(exam_id="fast-001", total_questions=n_questions, questions=questions)
+    responses = [
+        {"student_id": f"S{s}",
+         "responses": {str(i): "ABCD"[(s * i + s) % 4] for i in range(1, n_questions + 1)}}
+        for s in range(30)
+    ]
+    return {
+        "exam": exam.model_dump(),
+        "student_responses": responses,
+        "correct_answers": {str(i): "ABCD"[i % 4] for i in range(1, n_questions + 1)},
+    }
+
+
+def test_fast_path_matches_default():
+    client = TestClient(app)
+    payload = _payload()
+    slow = client.post("/api/analyze/", json=payload)
+    fast = client.post("/api/analyze/?fast=true", json=payload)
+    assert slow.status_code == fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == slow.json()
+    assert slow.json()["page"] is None
+    print("  OK fast path returns the same ExamStats")
+
+
+def test_pagination():
+    client = TestClient(app)
+    payload = _payload()
+    full = client.post("/api/analyze/", json=payload).json()
+    for fast in ("false", "true"):
+        page = client.post(f"/api/analyze/?offset=5&limit=4&fast={fast}", json=payload).json()
+        assert page["question_stats"] == full["question_stats"][5:9]
+        assert page["page"] == {"offset": 5, "limit": 4, "totals": {"question_stats": 12}}
+        assert page["cronbach_alpha"] == full["cronbach_alpha"]
+
+    questions, _ = synthetic_questions(60, duplicate_rate=0.3, near_duplicate_rate=0.3)
+    exam = Exam(total_questions=60, questions=questions).model_dump()
+    report = client.post("/api/similarity/", json={"exam": exam}).json()
+    tail = client.post("/api/similarity/?offset=1", json={"exam": exam}).json()
+    for name in ("duplicate_pairs", "near_duplicate_pairs", "clusters"):
+        assert tail[name] == report[name][1:]
+        assert tail["page"]["totals"][name] == len(report[name])
+
+    assert client.post("/api/analyze/?limit=0", json=payload).status_code == 422
+    print("  OK ?offset=&limit= pages every report list")
+
+
+def test_compression_above_threshold():
+    client = TestClient(app)
+    payload = _payload()
+    old_threshold = reports.RESPONSE_COMPRESS_MIN_BYTES
+    try:
+        reports.RESPONSE_COMPRESS_MIN_BYTES = 1
+        r = client.post("/api/analyze/?fast=true", json=payload,
+                        headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert r.headers["vary"] == "Accept-Encoding"
+        assert r.json()["exam_id"] == "fast-001"           # client decodes transparently
+
+        r = client.post("/api/analyze/?fast=true", json=payload,
+                        headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert "content-encoding" not in r.headers
+
+        reports.RESPONSE_COMPRESS_MIN_BYTES = 10 ** 9
+        r = client.post("/api/analyze/?fast=true", json=payload,
+                        headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers
+    finally:
+        reports.RESPONSE_COMPRESS_MIN_BYTES = old_threshold
+
+    exam = Exam()
+    assert reports.paginate(exam, 0, 1) is exam                  # no paginated lists
+    assert json.loads(reports.ReportResponse(exam).body)["title"] == "Untitled Exam"
+    print("  OK gzip only above the threshold and when accepted")
+
+
+if __name__ == "__main__":
+    test_fast_path_matches_default()
+    test_pagination()
+    test_compression_above_threshold()
+    print("\nAll fast response tests passed OK")
@@ -0,0 +1,164 @@
+"""
+Smoke test for per-page PDF extraction (text / scanned / mixed routing).
+Run: python test_ingestion.py
+"""
+import os
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+import threading
+import time
+
+import fitz
+from backend.services import ingestion
+from backend.services.ingestion import IngestionService
+from backend.services.ocr import OCRPageQueue, StaticOCRBackend, set_ocr_backend
+
+
+def _build_pdf(path, page_kinds):
+    """page_kinds: list of "text" / "image" — image pages carry no text layer."""
+    doc = fitz.open()
+    for n, kind in enumerate(page_kinds, start=1):
+        page = doc.new_page()
+        if kind == "text":
+            page.insert_text((72, 72), f"{n}. Question on page {n} about velocity and force?")
+            page.insert_text((72, 90), "(A) one  (B) two  (C) three  (D) four")
+        elif kind == "cover":                   # title + small logo: not a scan
+            page.insert_text((72, 300), "Physics Final Exam 2024")
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 40), False)
+            pix.clear_with(120)
+            page.insert_image(fitz.Rect(72, 72, 172, 172), pixmap=pix)
+        else:
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 40), False)
+            pix.clear_with(200)
+            page.insert_image(fitz.Rect(72, 72, 272, 272), pixmap=pix)
+    doc.save(path)
+    doc.close()
+
+
+def _fake_ocr(image, filename):
+    assert image.startswith(b"\x89PNG")
+    return f"OCR[{filename}]"
+
+
+def test_per_page_routing():
+    backend = StaticOCRBackend(_fake_ocr)
+    set_ocr_backend(backend)
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            text_pdf = os.path.join(d, "text.pdf")
+            _build_pdf(text_pdf, ["text", "text"])
+            out = IngestionService.process_file(text_pdf, ".pdf")
+            assert out["type"] == "pdf_text" and out["pages"] == 2
+            assert not out["ocr_used"] and "page 2" in out["raw_text"]
+
+            mixed_pdf = os.path.join(d, "mixed.pdf")
+            _build_pdf(mixed_pdf, ["text", "image", "text"])
+            out = IngestionService.process_file(mixed_pdf, ".pdf")
+            assert out["type"] == "pdf_mixed" and out["ocr_pages"] == [2]
+            assert out["raw_text"].index("page 1") < out["raw_text"].index("OCR[page-2.png]")
+
+            scanned_pdf = os.path.join(d, "scanned.pdf")
+            _build_pdf(scanned_pdf, ["image", "image"])
+            out = IngestionService.process_file(scanned_pdf, ".pdf")
+            assert out["type"] == "pdf_scanned" and out["ocr_pages"] == [1, 2]
+            assert backend.calls.count("page-2.png") == 2
+    finally:
+        set_ocr_backend(None)
+    print("  OK per-page text / mixed / scanned routing")
+
+
+def test_parallel_page_ranges_keep_order():
+    saved = ingestion.PDF_EXTRACT_WORKERS, ingestion.PARALLEL_PAGE_THRESHOLD
+    ingestion.PDF_EXTRACT_WORKERS, ingestion.PARALLEL_PAGE_THRESHOLD = 2, 4
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "long.pdf")
+            _build_pdf(path, ["text"] * 20)
+            serial = ingestion._extract_page_range_from_source(path, 0, 20)
+            parallel = list(IngestionService._iter_pdf_pages(path))
+            assert parallel == serial
+            with open(path, "rb") as f:
+                assert list(IngestionService._iter_pdf_pages(f.read())) == serial
+            assert "page 20" in parallel[-1][0]
+    finally:
+        ingestion.PDF_EXTRACT_WORKERS, ingestion.PARALLEL_PAGE_THRESHOLD = saved
+    print("  OK process-pool page ranges reassembled in order")
+
+
+def test_ocr_queue_order_progress_and_bound():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow(image, filename):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.002 * (int(image) % 5))     # finish out of order
+        with lock:
+            active[0] -= 1
+        return f"text {image.decode()}"
+
+    progress = []
+    with OCRPageQueue(
+        StaticOCRBackend(slow),
+        max_workers=3,
+        on_progress=lambda page, done, queued: progress.append((page, done)),
+    ) as ocr:
+        for page in range(1, 31):
+            ocr.submit(page, str(page).encode())
+        results = ocr.results()
+
+    assert list(results) == list(range(1, 31))
+    assert results[17] == "text 17"
+    assert sorted(p for p, _ in progress) == list(range(1, 31))
+    assert [done for _, done in progress] == list(range(1, 31))
+    assert peak[0] <= 3
+    print("  OK OCR queue: page order, per-page progress, bounded workers")
+
+
+def test_ocr_errors_surface():
+    def boom(image, filename):
+        raise RuntimeError("engine down")
+
+    with OCRPageQueue(StaticOCRBackend(boom)) as ocr:
+        ocr.submit(1, b"x")
+        try:
+            ocr.results()
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            assert "engine down" in str(e)
+    print("  OK OCR backend errors re-raised")
+
+
+def test_logo_pages_skip_ocr_and_ocr_failures_keep_the_page():
+    def down(image, filename):
+        raise RuntimeError("OCR network error")
+
+    backend = StaticOCRBackend(down)
+    set_ocr_backend(backend)
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "cover.pdf")
+            _build_pdf(path, ["cover", "text"])
+            out = IngestionService.process_file(path, ".pdf")
+            assert out["type"] == "pdf_text" and backend.calls == []
+            assert "Physics Final Exam" in out["raw_text"] and "warnings" not in out
+
+            _build_pdf(path, ["text", "image", "text"])
+            out = IngestionService.process_file(path, ".pdf")
+            assert out["ocr_failed_pages"] == [2] and "page 3" in out["raw_text"]
+            assert out["warnings"] == ["Page 2: OCR failed (OCR network error); kept the PDF text layer."]
+    finally:
+        set_ocr_backend(None)
+    print("  OK logo pages keep their text; a failed OCR page does not fail the PDF")
+
+
+if __name__ == "__main__":
+    test_per_page_routing()
+    test_parallel_page_ranges_keep_order()
+    test_ocr_queue_order_progress_and_bound()
+    test_ocr_errors_surface()
+    test_logo_pages_skip_ocr_and_ocr_failures_keep_the_page()
+    print("\nAll ingestion tests passed OK")
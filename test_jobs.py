@@ -0,0 +1,182 @@
+"""
+Smoke test for the asynchronous job API and the SQLite job store.
+Run: python test_jobs.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.api.endpoints import jobs as jobs_endpoint
+from backend.services import jobs
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+from backend.services.jobs import JobManager, MemoryJobStore, SQLiteJobStore
+from backend.core.job_models import Job
+
+PAPER = b"""1. What is the capital of France?
+(A) London
+(B) Paris
+(C) Rome
+Answer: B
+
+2. What is 2 + 2?
+(A) 3
+(B) 4
+(C) 5
+Answer: B
+"""
+
+RESPONSES = b"""student_id,1,2
+s1,B,B
+s2,B,A
+s3,A,B
+s4,C,C
+"""
+
+
+def _wait(client, url, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(url).json()
+        if body["status"] in ("succeeded", "failed"):
+            return body
+        time.sleep(0.02)
+    raise AssertionError(f"job did not finish: {body}")
+
+
+def test_pipeline_job():
+    client = TestClient(app)
+    saved = jobs._manager
+    jobs._manager = JobManager(MemoryJobStore())
+    previous = set_extraction_cache(ExtractionCache(None))
+    try:
+        r = client.post(
+            "/api/jobs/",
+            files={
+                "file": ("paper.txt", PAPER, "text/plain"),
+                "responses": ("responses.csv", RESPONSES, "text/csv"),
+            },
+        )
+        assert r.status_code == 202, r.text
+        body = _wait(client, r.json()["status_url"])
+    finally:
+        jobs._manager.shutdown()
+        jobs._manager = saved
+        set_extraction_cache(previous)
+
+    assert body["status"] == "succeeded", body
+    assert [s["name"] for s in body["stages"]][-1] == "analyze"
+    assert all(s["duration_ms"] is not None for s in body["stages"])
+    exam = body["result"]["normalization"]["exam"]
+    assert exam["source_file"] == "paper.txt" and len(exam["questions"]) == 2
+    stats = body["result"]["stats"]
+    assert stats["total_students"] == 4
+    assert stats["question_stats"][0]["difficulty_index"] == 0.5
+
+    assert client.get("/api/jobs/does-not-exist").status_code == 404
+    print("  OK upload → normalize → analyze job")
+
+
+def test_failed_job_and_queue_limit():
+    release = threading.Event()
+    jobs.RUNNERS["block"] = lambda ctx, spec: release.wait(5) and {}
+    manager = JobManager(MemoryJobStore(), queue_limit=1)
+    try:
+        blocked = manager.submit("block", {})
+        try:
+            manager.submit("block", {})
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            assert "queue is full" in str(e)
+        release.set()
+        manager.shutdown()
+        assert manager.get(blocked.job_id).status == "succeeded"
+    finally:
+        del jobs.RUNNERS["block"]
+
+    manager = JobManager(MemoryJobStore())
+    job = manager.submit("pipeline", {"file_path": "/nonexistent.txt", "file_ext": ".txt",
+                                      "filename": "x.txt"})
+    deadline = time.time() + 5
+    while manager.get(job.job_id).status not in ("succeeded", "failed") and time.time() < deadline:
+        time.sleep(0.01)
+    failed = manager.get(job.job_id)
+    assert failed.status == "failed" and "No such file" in failed.error
+    manager.shutdown()
+    print("  OK queue limit + failures recorded on the job")
+
+
+def test_inputs_deleted_and_finished_jobs_pruned():
+    client = TestClient(app)
+    saved = jobs._manager, jobs_endpoint.JOB_INPUT_DIR
+    with tempfile.TemporaryDirectory() as d:
+        jobs_endpoint.JOB_INPUT_DIR = d
+        previous = set_extraction_cache(ExtractionCache(None))
+        try:
+            jobs._manager = JobManager(MemoryJobStore())
+            r = client.post("/api/jobs/", files={"file": ("paper.txt", PAPER, "text/plain")})
+            assert _wait(client, r.json()["status_url"])["status"] == "succeeded"
+            jobs._manager.shutdown()
+            assert os.listdir(d) == []
+
+            jobs._manager = JobManager(MemoryJobStore(), queue_limit=0)       # always full
+            r = client.post("/api/jobs/", files={"file": ("paper.txt", PAPER, "text/plain")})
+            assert r.status_code == 503
+            assert os.listdir(d) == []
+        finally:
+            jobs._manager.shutdown()
+            jobs._manager, jobs_endpoint.JOB_INPUT_DIR = saved
+            set_extraction_cache(previous)
+
+        store = SQLiteJobStore(os.path.join(d, "jobs.db"), max_finished=2)
+        for i in range(4):
+            store.save(Job(job_id=f"done-{i}", kind="pipeline", status="succeeded",
+                           created_at=float(i)), {})
+        store.save(Job(job_id="queued", kind="pipeline", created_at=0.0), {})
+        assert [store.load(f"done-{i}") is not None for i in range(4)] == [False, False, True, True]
+        assert store.load("queued") is not None
+        store.close()
+    print("  OK job inputs deleted (also on 503), SQLite keeps the newest finished jobs")
+
+
+def test_sqlite_store_survives_restart():
+    with tempfile.TemporaryDirectory() as d:
+        db = os.path.join(d, "jobs.db")
+        paper = os.path.join(d, "paper.txt")
+        with open(paper, "wb") as f:
+            f.write(PAPER)
+
+        # Simulate a crash: two jobs left "running" in the store
+        store = SQLiteJobStore(db)
+        alive = Job(job_id="alive", kind="pipeline", status="running", created_at=time.time())
+        lost = Job(job_id="lost", kind="pipeline", status="running", created_at=time.time())
+        store.save(alive, {"file_path": paper, "file_ext": ".txt", "filename": "paper.txt"})
+        store.save(lost, {"file_path": os.path.join(d, "gone.txt"), "file_ext": ".txt",
+                          "filename": "gone.txt"})
+        store.close()
+
+        manager = JobManager(SQLiteJobStore(db))
+        manager.shutdown(wait=True)
+        assert manager.get("alive").status == "succeeded"
+        assert manager.get("lost").status == "failed"
+        assert "restart" in manager.get("lost").error
+
+        # A fresh process still sees the finished job
+        reopened = SQLiteJobStore(db)
+        assert reopened.load("alive").result["normalization"]["exam"]["total_questions"] == 2
+        reopened.close()
+        manager.store.close()
+    print("  OK SQLite store: unfinished jobs resumed or failed on restart")
+
+
+if __name__ == "__main__":
+    set_extraction_cache(ExtractionCache(None))      # keep ./extraction_cache/ clean
+    test_pipeline_job()
+    test_failed_job_and_queue_limit()
+    test_inputs_deleted_and_finished_jobs_pruned()
+    test_sqlite_store_survives_restart()
+    print("\nAll job tests passed OK")
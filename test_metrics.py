@@ -0,0 +1,95 @@
+"""
+Smoke test for stage spans, GET /api/metrics, Server-Timing and ?profile=1.
+Run: python test_metrics.py
+"""
+import json
+import sys
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.api import middleware
+from backend.services import metrics
+from backend.services.metrics import Counter, Histogram, span
+from test_fast_responses import _payload
+
+
+def test_histogram_and_counter_render():
+    hist = Histogram("t_seconds", "Test histogram.", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="a")
+    hist.observe(0.1, stage="a")        # bucket bounds are inclusive
+    hist.observe(5.0, stage="a")
+    lines = list(hist.lines())
+    assert 't_seconds_bucket{stage="a",le="0.1"} 2' in lines
+    assert 't_seconds_bucket{stage="a",le="1"} 2' in lines
+    assert 't_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{stage="a"} 3' in lines
+
+    counter = Counter("t_total", "Test counter.", ("status",))
+    counter.inc(status="200")
+    counter.inc(2, status="200")
+    assert list(counter.lines()) == ['t_total{status="200"} 3']
+    print("  OK histogram buckets are cumulative, counters add up")
+
+
+def test_span_records_errors():
+    before = metrics.STAGE_ERRORS.value(stage="test.fail")
+    try:
+        with span("test.fail"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert metrics.STAGE_ERRORS.value(stage="test.fail") == before + 1
+    assert metrics.STAGE_SECONDS.count(stage="test.fail") >= 1
+    print("  OK failing spans are timed and counted as errors")
+
+
+def test_server_timing_and_metrics_endpoint():
+    client = TestClient(app)
+    res = client.post("/api/analyze/", json=_payload())
+    assert res.status_code == 200
+    timing = res.headers["server-timing"]
+    assert "stats.encode;dur=" in timing and "stats.report;dur=" in timing
+
+    text = client.get("/api/metrics").text
+    assert "# TYPE examforge_stage_seconds histogram" in text
+    assert 'examforge_stage_seconds_bucket{stage="stats.score",le="+Inf"}' in text
+    assert 'examforge_http_requests_total{method="POST",route="/api/analyze/",status="200"}' in text
+    print("  OK Server-Timing header and Prometheus metrics")
+
+
+def test_profile_mode():
+    client = TestClient(app)
+    payload = _payload()
+    plain = client.post("/api/analyze/", json=payload).json()
+    assert client.post("/api/analyze/?profile=1", json=payload).json() == plain   # off by default
+
+    middleware.REQUEST_PROFILING = True
+    try:
+        _check_profiles(client, payload, plain)
+    finally:
+        middleware.REQUEST_PROFILING = False
+    print("  OK ?profile=1 is opt-in; wraps JSON replies and appends to NDJSON streams")
+
+
+def _check_profiles(client, payload, plain):
+    for fast in ("false", "true"):
+        res = client.post(f"/api/analyze/?profile=1&fast={fast}", json=payload)
+        assert res.status_code == 200
+        body = res.json()
+        assert body["result"] == plain
+        profile = body["profile"]
+        assert {"wall_ms", "samples", "functions", "spans"} <= profile.keys()
+        assert any(s["name"] == "stats.score" for s in profile["spans"])
+
+    res = client.post("/api/analyze/batch?profile=1", json={"exams": [payload]})
+    lines = [json.loads(l) for l in res.text.splitlines() if l.strip()]
+    assert [l["type"] for l in lines] == ["result", "summary", "profile"]
+
+
+if __name__ == "__main__":
+    test_histogram_and_counter_render()
+    test_span_records_errors()
+    test_server_timing_and_metrics_endpoint()
+    test_profile_mode()
+    print("\nAll metrics tests passed OK")
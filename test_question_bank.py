@@ -0,0 +1,143 @@
+"""
+Smoke test for the persistent question-bank index.
+Run: python test_question_bank.py
+"""
+import os
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.core.models import Exam, Question
+from backend.services import question_bank
+from backend.services.question_bank import QuestionBankIndex
+
+
+def _exam(exam_id, texts):
+    return Exam(exam_id=exam_id, total_questions=len(texts),
+                questions=[Question(id=i + 1, text=t) for i, t in enumerate(texts)])
+
+
+paper_1 = _exam("paper-1", [
+    "What is the capital of France?",
+    "Who wrote Romeo and Juliet?",
+    "Calculate the speed of light in vacuum.",
+])
+paper_2 = _exam("paper-2", [
+    "State Newton's second law of motion.",
+    "Who authored the play Romeo and Juliet?",
+])
+new_paper = _exam("paper-3", [
+    "What is the capital of France?",            # exact duplicate of paper-1 Q1
+    "Describe the water cycle.",                  # unseen
+])
+
+
+def test_insert_persist_and_query():
+    with tempfile.TemporaryDirectory() as d:
+        bank = QuestionBankIndex(d)
+        assert bank.add_exam(paper_1) == 3
+        assert bank.add_exam(paper_2) == 2
+        assert len(bank) == 5 and bank.shard_count == 2
+
+        # Re-open from disk: vectors are memory-mapped, nothing is re-fitted
+        reopened = QuestionBankIndex(d)
+        assert len(reopened) == 5
+        assert reopened.vocabulary_size == bank.vocabulary_size
+
+        hits = reopened.query([q.text for q in new_paper.questions], top_k=3)
+        assert hits[0][0][1]["exam_id"] == "paper-1"
+        assert hits[0][0][1]["question_id"] == 1
+        assert hits[0][0][0] > 0.99
+        assert hits[1] == []
+
+        # A paper never matches itself
+        self_hits = reopened.query([paper_1.questions[0].text], exclude_exam_id="paper-1")
+        assert self_hits == [[]]
+
+        reopened.rebuild()
+        assert reopened.shard_count == 1 and len(QuestionBankIndex(d)) == 5
+    print("  OK insert / persist / query / rebuild")
+
+
+def test_unseen_words_count():
+    with tempfile.TemporaryDirectory() as d:
+        bank = QuestionBankIndex(d)
+        bank.add_exam(_exam("paper-1", ["What is the capital of France?"]))
+        long_question = (
+            "The Seine flows for 777 kilometres from Burgundy through the capital of France "
+            "before reaching the English Channel at Le Havre; estimate its mean discharge."
+        )
+        assert bank.query([long_question], min_score=0.0)[0][0][0] < 0.5
+        assert bank.query([long_question]) == [[]]
+    print("  OK words outside the first exam keep unrelated questions apart")
+
+
+def test_shards_merge():
+    with tempfile.TemporaryDirectory() as d:
+        bank = QuestionBankIndex(d, max_shards=2)
+        for paper in (paper_1, paper_2, new_paper):
+            bank.add_exam(paper)
+        assert bank.shard_count == 1 and len(bank) == 7
+        assert os.listdir(os.path.join(d, "shards")) == ["00003"]
+
+        reopened = QuestionBankIndex(d, max_shards=2)
+        assert len(reopened) == 7 and reopened.shard_count == 1
+        hits = reopened.query(["Who wrote Romeo and Juliet?"], exclude_exam_id="paper-3")
+        assert hits[0][0][1]["exam_id"] == "paper-1" and hits[0][0][0] > 0.99
+    print("  OK shards merge past max_shards and reopen")
+
+
+def test_readding_an_exam_replaces_it():
+    with tempfile.TemporaryDirectory() as d:
+        bank = QuestionBankIndex(d)
+        bank.add_exam(paper_1)
+        bank.add_exam(paper_2)
+        bank.add_exam(paper_1)
+        assert len(bank) == 5 and bank.shard_count == 2
+        hits = bank.query(["Who wrote Romeo and Juliet?"], top_k=2, min_score=0.0)[0]
+        assert [(m["exam_id"], m["question_id"]) for _, m in hits] == [("paper-1", 2), ("paper-2", 2)]
+
+        revised = _exam("paper-2", ["State Newton's third law of motion."])
+        assert bank.add_exam(revised) == 1
+        reopened = QuestionBankIndex(d)
+        assert len(reopened) == 4
+        texts = sorted(m["text"] for s in reopened._shards for m in s.meta)
+        assert "Who authored the play Romeo and Juliet?" not in texts
+        assert "State Newton's third law of motion." in texts
+    print("  OK re-adding an exam_id replaces its rows")
+
+
+def test_bank_endpoint():
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as d:
+        question_bank._bank = QuestionBankIndex(d)
+        try:
+            r = client.post("/api/similarity/bank/exams", json={"exam": paper_1.model_dump()})
+            assert r.status_code == 200, r.text
+            assert r.json()["bank_size"] == 3
+
+            r = client.post("/api/similarity/bank",
+                            json={"exam": new_paper.model_dump(), "add_to_bank": True})
+            assert r.status_code == 200, r.text
+            report = r.json()
+            assert report["bank_size"] == 3
+            assert report["questions_with_matches"] == 1
+            assert report["results"][0]["matches"][0]["similarity_type"] == "duplicate"
+            assert client.get("/api/similarity/bank").json()["bank_size"] == 5
+
+            r = client.post("/api/similarity/bank/exams", json={"exam": paper_1.model_dump()})
+            assert r.json()["bank_size"] == 5 and r.json()["added"] == 3
+        finally:
+            question_bank._bank = None
+    print("  OK /api/similarity/bank")
+
+
+if __name__ == "__main__":
+    test_insert_persist_and_query()
+    test_unseen_words_count()
+    test_shards_merge()
+    test_readding_an_exam_replaces_it()
+    test_bank_endpoint()
+    print("\nAll question bank tests passed OK")
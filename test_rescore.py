@@ -0,0 +1,85 @@
+"""
+Smoke test for answer-key re-scoring on a cached response matrix.
+Run: python test_rescore.py
+"""
+import sys
+import time
+import numpy as np
+sys.path.insert(0, ".")
+
+from backend.core.models import Exam, Question, Option
+from backend.services.rescore import ScoredSitting
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.stats_engine import StatisticalEngine
+
+
+def _exam(k):
+    return Exam(
+        exam_id="rescore-test-001",
+        total_questions=k,
+        questions=[Question(id=i + 1, text=f"Question {i + 1}",
+                            options=[Option(label=l, text=l) for l in "ABCD"])
+                   for i in range(k)],
+    )
+
+
+def _random_matrix(n, k, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, 5, size=(n, k), dtype=np.uint8)     # 0 = blank, 1..4 = A..D
+    return ResponseMatrix([f"S{i}" for i in range(n)], [str(j + 1) for j in range(k)],
+                          ["", "A", "B", "C", "D"], codes)
+
+
+def test_rescore_matches_full_analysis():
+    exam, matrix = _exam(6), _random_matrix(200, 6)
+    key_v1 = {str(j + 1): "ABCDAB"[j] for j in range(6)}
+    key_v2 = dict(key_v1, **{"2": "C", "5": ["A", "D"]})        # regrade + two accepted
+
+    scored = ScoredSitting(exam, matrix, key_v1)
+    assert scored.stats == StatisticalEngine.analyze_matrix(exam, matrix, key_v1)
+
+    diff = scored.rescore(key_v2)
+    assert diff.rescored_question_ids == [2, 5]
+    assert scored.stats == StatisticalEngine.analyze_matrix(exam, matrix, key_v2)
+    assert {c.question_id for c in diff.question_changes} >= {2, 5}
+    q5 = scored.stats.question_stats[4]
+    assert [d.is_correct for d in q5.distractors] == [True, False, False, True]
+
+    # Same key again → nothing changes
+    again = scored.rescore(key_v2)
+    assert again.rescored_question_ids == []
+    assert again.exam_changes == [] and again.question_changes == []
+    print("  OK rescore == full analysis")
+
+
+def test_tied_scores_split_as_in_the_original_engine():
+    exam, matrix = _exam(5), _random_matrix(150, 5, seed=3)     # 150 students, 6 score levels
+    key = {str(j + 1): "ABCDA"[j] for j in range(5)}
+    score = (matrix.codes == np.array([1, 2, 3, 4, 1], dtype=np.uint8)).astype(np.float64)
+    order = np.argsort(score.sum(axis=1))                       # the original engine's ordering
+    cutoff = int(np.ceil(0.27 * 150))
+    expected = score[order[-cutoff:]].mean(axis=0) - score[order[:cutoff]].mean(axis=0)
+
+    for stats in (StatisticalEngine.analyze_matrix(exam, matrix, key),
+                  ScoredSitting(exam, matrix, key).stats):
+        got = [q.discrimination_index for q in stats.question_stats]
+        assert got == [round(float(d), 4) for d in expected], got
+    print("  OK tied totals fall into the 27% groups as before")
+
+
+def test_rescore_speed_100k():
+    exam, matrix = _exam(100), _random_matrix(100_000, 100, seed=1)
+    key = {str(j + 1): "ABCD"[j % 4] for j in range(100)}
+    scored = ScoredSitting(exam, matrix, key)
+    t0 = time.perf_counter()
+    diff = scored.rescore(dict(key, **{"7": ["A", "B"]}))
+    elapsed = (time.perf_counter() - t0) * 1000
+    assert diff.rescored_question_ids == [7]
+    print(f"  OK rescore of 1 item on 100k × 100 in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_rescore_matches_full_analysis()
+    test_tied_scores_split_as_in_the_original_engine()
+    test_rescore_speed_100k()
+    print("\nAll rescore tests passed OK")
@@ -0,0 +1,85 @@
+"""
+Smoke test for the columnar ResponseMatrix + vectorized CTT path.
+Run: python test_response_matrix.py
+"""
+import sys
+import numpy as np
+sys.path.insert(0, ".")
+
+from backend.core.models import Exam, Question, Option
+from backend.services.response_matrix import ResponseMatrix, MISSING
+from backend.services.stats_engine import StatisticalEngine
+
+exam = Exam(
+    exam_id="matrix-test-001",
+    total_questions=3,
+    questions=[
+        Question(id=i, text=f"Question {i}",
+                 options=[Option(label=l, text=l) for l in "ABCD"])
+        for i in (1, 2, 3)
+    ],
+)
+correct_answers = {"1": "C", "2": "A", "3": "B"}
+student_responses = [
+    {"student_id": "S01", "responses": {"1": "C", "2": "A", "3": "B"}},
+    {"student_id": "S02", "responses": {"1": "c", "2": "B"}},           # Q3 blank
+    {"student_id": "S03", "responses": {"1": "A", "2": "A", "3": "B"}},
+    {"student_id": "S04", "responses": {"1": "D", "2": "C", "3": "A", "9": "X"}},
+]
+
+
+def test_encoding_roundtrip():
+    m = ResponseMatrix.from_dicts(student_responses, ["1", "2", "3"])
+    assert m.codes.dtype == np.uint8
+    assert m.codes.shape == (4, 3)
+    assert m.labels[0] == ""
+    assert m.codes[1, 2] == MISSING
+    assert m.labels[m.codes[1, 0]] == "C"        # lower-case input normalised
+    assert "X" not in m.labels                   # unknown question ignored
+    decoded = m.to_dicts()
+    assert decoded[1]["responses"] == {"1": "C", "2": "B"}
+    print("  OK encoding round-trip")
+
+
+def test_option_counts_and_select():
+    m = ResponseMatrix.from_dicts(student_responses, ["1", "2", "3"])
+    counts = m.option_counts()
+    assert counts[0, m.code_for("C")] == 2
+    assert counts[2, MISSING] == 1
+    assert counts.sum() == 4 * 3
+
+    s = m.select(["3", "7", "1"])
+    assert s.question_ids == ["3", "7", "1"]
+    assert (s.codes[:, 1] == MISSING).all()
+    assert (s.codes[:, 2] == m.codes[:, 0]).all()
+    print("  OK option counts / column select")
+
+
+def test_score_matrix_matches_naive_loop():
+    q_ids = ["1", "2", "3"]
+    matrix = StatisticalEngine._build_score_matrix(student_responses, correct_answers, q_ids)
+    for i, sr in enumerate(student_responses):
+        for j, q_id in enumerate(q_ids):
+            ans = sr["responses"].get(q_id, "").strip().upper()
+            expected = 1.0 if ans and ans == correct_answers[q_id] else 0.0
+            assert matrix[i, j] == expected
+    print("  OK score matrix")
+
+
+def test_analyze_matrix_equals_analyze():
+    from_dicts = StatisticalEngine.analyze(exam, student_responses, correct_answers)
+    m = ResponseMatrix.from_dicts(student_responses, ["3", "1", "2"])   # column order differs
+    from_matrix = StatisticalEngine.analyze_matrix(exam, m, correct_answers)
+    assert from_dicts == from_matrix
+    q1 = from_dicts.question_stats[0]
+    assert q1.difficulty_index == 0.5
+    assert [d.chosen_count for d in q1.distractors] == [1, 0, 2, 1]
+    print("  OK analyze_matrix == analyze")
+
+
+if __name__ == "__main__":
+    test_encoding_roundtrip()
+    test_option_counts_and_select()
+    test_score_matrix_matches_naive_loop()
+    test_analyze_matrix_equals_analyze()
+    print("\nAll response matrix tests passed OK")
@@ -50,3 +50,42 @@ assert len(rows) == 2
 print("  OK Excel BOM handled\n")
 
 print("All response parser tests passed OK")
+
+# ── Test 4: Streaming parser across tiny chunks ───────────────────────────────
+import io
+from backend.services.response_parser import parse_response_stream
+
+quoted_csv = b'student_id,1,2,3\n"S,01",C,A,B\nS02,C\nS03,a,,d\n'
+for chunk_size in (1, 3, 7, 1 << 20):
+    m = parse_response_stream(io.BytesIO(quoted_csv), chunk_size=chunk_size)
+    assert m.student_ids == ["S,01", "S02", "S03"]
+    assert m.question_ids == ["1", "2", "3"]
+    assert m.codes.dtype.name == "uint8"
+    assert m.to_dicts()[1]["responses"] == {"1": "C"}          # short row → blanks
+    assert m.to_dicts()[2]["responses"] == {"1": "A", "3": "D"}
+print("  OK Streaming wide format (chunked)\n")
+
+m = parse_response_stream(io.BytesIO(long_csv), chunk_size=5)
+assert m.codes.shape == (2, 3)
+assert m.to_dicts() == parse_response_csv(long_csv)
+print("  OK Streaming long format (chunked)\n")
+
+# ── Test 5: Non-UTF-8 bytes fall back to latin-1 ──────────────────────────────
+latin_csv = "student_id,1\nJosé,A\nZoë,B\n".encode("latin-1")
+rows = parse_response_csv(latin_csv)
+assert [r["student_id"] for r in rows] == ["José", "Zoë"]
+
+# The first bad byte comes after rows that happen to be valid UTF-8:
+# the whole file is latin-1, including what was already read
+late_latin_csv = "student_id,1\nÃ©,A\nJosé,B\n".encode("latin-1")
+m = parse_response_stream(io.BytesIO(late_latin_csv), chunk_size=4)
+assert m.student_ids == ["Ã©", "José"]
+print("  OK latin-1 fallback\n")
+
+# ── Test 6: Only "\n" ends a row ──────────────────────────────────────────────
+odd_csv = "student_id,1\nS\x0c1,A\nS\u20282,B\nS3,C".encode("utf-8")
+m = parse_response_stream(io.BytesIO(odd_csv), chunk_size=3)
+assert m.student_ids == ["S\x0c1", "S\u20282", "S3"]
+print("  OK form feeds / U+2028 stay inside cells\n")
+
+print("All streaming parser tests passed OK")
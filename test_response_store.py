@@ -0,0 +1,94 @@
+"""
+Smoke test for the persistent columnar response store.
+Run: python test_response_store.py
+"""
+import sys
+import tempfile
+import numpy as np
+sys.path.insert(0, ".")
+
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.core.models import Exam, Question, Option
+from backend.services import response_store
+from backend.services.response_matrix import ResponseMatrix
+from backend.services.response_store import ResponseStore
+from backend.services.stats_engine import StatisticalEngine
+
+exam = Exam(
+    exam_id="store-test-001",
+    total_questions=3,
+    questions=[
+        Question(id=i, text=f"Question {i}",
+                 options=[Option(label=l, text=l) for l in "ABCD"])
+        for i in (1, 2, 3)
+    ],
+)
+csv_text = (
+    "student_id,1,2,3\n"
+    "S01,C,A,B\n"
+    "S02,C,B,\n"
+    "S03,A,A,B\n"
+    "S04,D,C,A\n"
+)
+key_v1 = {"1": "C", "2": "A", "3": "B"}
+key_v2 = {"1": "A", "2": "A", "3": "B"}     # regraded Q1
+
+
+def test_save_and_memory_mapped_load():
+    matrix = ResponseMatrix.from_dicts(
+        [{"student_id": "S01", "responses": {"1": "C", "2": "A"}},
+         {"student_id": "S02", "responses": {"1": "B", "3": "D"}}],
+        ["1", "2", "3"],
+    )
+    with tempfile.TemporaryDirectory() as d:
+        store = ResponseStore(d)
+        sitting_id = store.save(exam, matrix)
+        loaded_exam, loaded = store.load(sitting_id)
+        assert loaded_exam == exam
+        assert isinstance(loaded.codes, np.memmap)
+        assert (np.asarray(loaded.codes) == matrix.codes).all()
+        assert loaded.labels == matrix.labels
+        assert loaded.student_ids == ["S01", "S02"]
+        assert store.load("../etc") is None
+        assert store.delete(sitting_id)
+        assert store.load(sitting_id) is None
+    print("  OK save / mmap load / delete")
+
+
+def test_sitting_endpoints():
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as d:
+        response_store._store = ResponseStore(d)
+        try:
+            r = client.post("/api/sittings/",
+                            data={"exam_json": exam.model_dump_json()},
+                            files={"file": ("responses.csv", csv_text.encode(), "text/csv")})
+            assert r.status_code == 200, r.text
+            info = r.json()
+            assert info["total_students"] == 4
+            sitting_id = info["sitting_id"]
+
+            matrix = ResponseMatrix.from_dicts(
+                [{"student_id": f"S0{i + 1}", "responses": dict(zip("123", row.split(",")[1:]))}
+                 for i, row in enumerate(csv_text.splitlines()[1:])],
+                ["1", "2", "3"],
+            )
+            for key in (key_v1, key_v2):
+                r = client.post(f"/api/sittings/{sitting_id}/analyze",
+                                json={"correct_answers": key})
+                assert r.status_code == 200, r.text
+                expected = StatisticalEngine.analyze_matrix(exam, matrix, key)
+                assert r.json() == expected.model_dump()
+
+            assert client.get("/api/sittings/" + "0" * 32).status_code == 404
+            assert client.delete(f"/api/sittings/{sitting_id}").status_code == 200
+        finally:
+            response_store._store = None
+    print("  OK /api/sittings")
+
+
+if __name__ == "__main__":
+    test_save_and_memory_mapped_load()
+    test_sitting_endpoints()
+    print("\nAll response store tests passed OK")
@@ -61,3 +61,30 @@ if report.clusters:
             print(f"      Q{qid}: {qt}")
 
 print(f"\n{'='*60}\n")
+# ── Sparse blocked pairs == dense upper-triangle scan ─────────────────────────
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+tfidf = TfidfVectorizer(ngram_range=(1, 2), stop_words="english", sublinear_tf=True)
+X = tfidf.fit_transform([q.text for q in exam.questions])
+dense = (X @ X.T).toarray()
+expected = [(i, j) for i in range(len(dense)) for j in range(i + 1, len(dense)) if dense[i, j] >= 0.60]
+
+for block_size in (1, 2, 512):
+    rows, cols, scores = SimilarityEngine._similar_pairs(X, 0.60, block_size=block_size)
+    assert list(zip(rows.tolist(), cols.tolist())) == expected
+    assert np.allclose(scores, [dense[i, j] for i, j in expected])
+assert len(report.duplicate_pairs) >= 1
+print("  OK sparse blocked similarity matches dense scan")
+
+# ── MinHash/LSH candidate stage ───────────────────────────────────────────────
+from backend.services.lsh import MinHashLSH
+
+lsh = MinHashLSH(num_perm=128, bands=64)
+cand_rows, cand_cols = lsh.candidate_pairs([q.text for q in exam.questions])
+assert (0, 2) in set(zip(cand_rows.tolist(), cand_cols.tolist()))   # Q1 ↔ Q3 verbatim
+lsh_report = SimilarityEngine.analyze(exam.questions, lsh=lsh)
+lsh_pairs = {(p.question_id_1, p.question_id_2) for p in lsh_report.duplicate_pairs + lsh_report.near_duplicate_pairs}
+all_pairs = {(p.question_id_1, p.question_id_2) for p in report.duplicate_pairs + report.near_duplicate_pairs}
+assert lsh_pairs <= all_pairs and (1, 3) in lsh_pairs
+print("  OK LSH candidates + exact cosine re-scoring")
@@ -0,0 +1,143 @@
+"""
+Smoke test for generator-based normalization and the NDJSON upload stream.
+Run: python test_streaming_normalizer.py
+"""
+import json
+import os
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+import fitz
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+from backend.services.ingestion import IngestionService
+from backend.core.models import Question
+from backend.core.records import QuestionRecord
+from backend.services.normalizer import _parse_questions, iter_questions, normalize
+from backend.services.ocr import StaticOCRBackend, set_ocr_backend
+
+
+def _paper_lines(n):
+    for i in range(1, n + 1):
+        yield f"{i}. Question number {i} about force?"
+        yield "(a) one"
+        yield "(b) two"
+        yield "Answer: b"
+
+
+def test_questions_yielded_before_input_ends():
+    consumed = [0]
+
+    def counting():
+        for line in _paper_lines(500):
+            consumed[0] += 1
+            yield line
+
+    stream = iter_questions(counting())
+    first = next(stream)
+    assert first.id == 1 and first.correct_option == "B"
+    assert consumed[0] < 20, consumed[0]
+    assert sum(1 for _ in stream) == 499
+    print("  OK first question yielded after a handful of lines")
+
+
+def test_matches_normalize():
+    with open("debug_raw_text.txt", encoding="utf-8") as f:
+        raw = f.read()
+    pages = raw.split("\n\n")
+    warnings = []
+    streamed = list(iter_questions((l for p in pages for l in p.splitlines()), warnings))
+    batch = normalize(raw)
+    assert streamed == batch.exam.questions and warnings == batch.warnings
+    print(f"  OK iter_questions == normalize ({len(streamed)} questions)")
+
+
+def test_parser_emits_records():
+    text = "1. Which is a prime?\n(a) four\nor eight\n(b) seven\nAnswer: b\n2. Lone stem?"
+    records, warnings = _parse_questions(text)
+    assert all(isinstance(r, QuestionRecord) for r in records)
+    assert not hasattr(records[0], "__dict__")
+    assert [o.text for o in records[0].options] == ["four or eight", "seven"]
+    assert records[1].is_flagged and warnings == ["Q2: No options detected."]
+
+    model = records[0].to_model()
+    assert isinstance(model, Question) and model.correct_option == "B"
+    assert normalize(text).exam.questions == [r.to_model() for r in records]
+    print("  OK parser emits slotted records, converted once at the boundary")
+
+
+def _build_pdf(path, pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        if lines is None:                       # scanned page: image, no text
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 40), False)
+            pix.clear_with(200)
+            page.insert_image(fitz.Rect(72, 72, 272, 272), pixmap=pix)
+            continue
+        for n, line in enumerate(lines):
+            page.insert_text((72, 72 + 14 * n), line)
+    doc.save(path)
+    doc.close()
+
+
+def test_iter_pages_keeps_page_order_with_ocr():
+    set_ocr_backend(StaticOCRBackend("3. Scanned question text here?\n(a) x\n(b) y"))
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "mixed.pdf")
+            _build_pdf(path, [["1. First question text?", "(a) p", "(b) q"], None,
+                              ["4. Fourth question text?", "(a) r", "(b) s"]])
+            meta = {}
+            pages = list(IngestionService.iter_pages(path, ".pdf", meta))
+            assert "First" in pages[0] and "Scanned" in pages[1] and "Fourth" in pages[2]
+            assert meta == {"type": "pdf_mixed", "pages": 3, "ocr_used": True, "ocr_pages": [2]}
+            assert IngestionService.process_file(path, ".pdf")["raw_text"] == "\n".join(pages)
+    finally:
+        set_ocr_backend(None)
+    print("  OK page stream in order, OCR pages slotted in")
+
+
+def test_ndjson_upload_stream():
+    client = TestClient(app)
+    previous = set_extraction_cache(ExtractionCache(None))
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "paper.pdf")
+            _build_pdf(path, [
+                ["1. What is the capital of France?", "(A) London", "(B) Paris", "Answer: B"],
+                ["2. What is 2 + 2?", "(A) 3", "(B) 4", "Answer: B"],
+            ])
+            with open(path, "rb") as f:
+                content = f.read()
+
+        records = []
+        for attempt in range(2):                # second upload is replayed from the cache
+            r = client.post("/api/upload/stream", files={"file": ("paper.pdf", content, "application/pdf")})
+            assert r.status_code == 200
+            assert r.headers["content-type"].startswith("application/x-ndjson")
+            records.append([json.loads(line) for line in r.text.splitlines()])
+    finally:
+        set_extraction_cache(previous)
+
+    for recs in records:
+        assert [rec["type"] for rec in recs] == ["question", "question", "summary"]
+        assert recs[1]["question"]["correct_option"] == "B"
+        assert recs[-1]["total_questions"] == 2 and recs[-1]["source_file"] == "paper.pdf"
+    assert records[0][:2] == records[1][:2]
+    assert records[0][-1]["exam_id"] != records[1][-1]["exam_id"]
+
+    r = client.post("/api/upload/stream", files={"file": ("x.exe", b"MZ", "application/octet-stream")})
+    assert r.status_code == 400
+    print("  OK NDJSON stream: questions, then summary; cache replay")
+
+
+if __name__ == "__main__":
+    test_questions_yielded_before_input_ends()
+    test_matches_normalize()
+    test_parser_emits_records()
+    test_iter_pages_keeps_page_order_with_ocr()
+    test_ndjson_upload_stream()
+    print("\nAll streaming normalizer tests passed OK")
@@ -0,0 +1,149 @@
+"""
+Smoke test for multi-file exam sets (POST /api/upload/batch) and answer-key detection.
+Run: python test_upload_batch.py
+"""
+import io
+import sys
+import tempfile
+import time
+sys.path.insert(0, ".")
+
+import docx
+import fitz
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services.answer_key import is_answer_key, parse_answer_key, parse_key_line
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+from backend.services.ocr import StaticOCRBackend, set_ocr_backend
+
+BOOKLET = b"""1. What is the capital of France?
+(A) London
+(B) Paris
+(C) Rome
+2. Which planet is largest?
+(A) Mars
+(B) Venus
+(C) Jupiter
+Answer: B
+3. What is H2O?
+(A) Water
+(B) Salt
+(C) Sugar
+"""
+SUPPLEMENT = """4. Which gas do plants absorb?
+(A) Oxygen
+(B) Nitrogen
+(C) Carbon dioxide
+(D) Helium
+5. What is 2 + 2?
+(A) 4
+(B) 5
+"""
+KEY = "ANSWER KEY\n1-B 2-C 3-A\n4-C\n5-A\n9-D\n"
+
+
+def _pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 50), text, fontsize=9)
+    return doc.tobytes()
+
+
+def _docx(text: str) -> bytes:
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _post(client, files):
+    with tempfile.TemporaryDirectory() as d:
+        previous = set_extraction_cache(ExtractionCache(d))
+        try:
+            return client.post(
+                "/api/upload/batch",
+                files=[("files", (name, content, "application/octet-stream")) for name, content in files],
+            )
+        finally:
+            set_extraction_cache(previous)
+
+
+def test_answer_key_parser():
+    assert parse_key_line("1-C 2-A 3-D") == {"1": "C", "2": "A", "3": "D"}
+    assert parse_key_line("Q1: (b), Q2: d; 3) A") == {"1": "B", "2": "D", "3": "A"}
+    assert parse_key_line("1. What is 5.20 m in cm?") == {}
+    assert parse_key_line("12 Apples") == {}
+    assert parse_answer_key(KEY) == {"1": "B", "2": "C", "3": "A", "4": "C", "5": "A", "9": "D"}
+    assert is_answer_key(KEY)
+    assert not is_answer_key(BOOKLET.decode())
+    print("  OK answer-key pairs, grids and document detection")
+
+
+def test_exam_set_merges_files_and_applies_key():
+    client = TestClient(app)
+    res = _post(client, [
+        ("booklet.txt", BOOKLET),
+        ("key.docx", _docx(KEY)),
+        ("supplement.pdf", _pdf(SUPPLEMENT)),
+    ])
+    assert res.status_code == 200, res.text
+    body = res.json()
+    exam = body["exam"]
+    assert [q["id"] for q in exam["questions"]] == [1, 2, 3, 4, 5]
+    assert [q["correct_option"] for q in exam["questions"]] == ["B", "B", "A", "C", "A"]
+    assert exam["source_file"] == "booklet.txt, supplement.pdf"
+    assert [(d["filename"], d["role"]) for d in body["documents"]] == [
+        ("booklet.txt", "questions"), ("key.docx", "answer_key"), ("supplement.pdf", "questions"),
+    ]
+    assert body["documents"][1]["answers"] == 4
+    assert any("key.docx: Q2: key 'C' conflicts with inline answer 'B'" in w for w in body["warnings"])
+    assert any("key.docx: No question matches 1 answer-key entries (first: Q9)" in w for w in body["warnings"])
+    print("  OK booklet + supplement merged, answer key applied")
+
+
+def test_renumbering_and_failed_files():
+    client = TestClient(app)
+    res = _post(client, [
+        ("a.txt", BOOKLET),
+        ("broken.pdf", b"%PDF-1.7 not really"),
+        ("b.txt", BOOKLET),
+    ])
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [q["id"] for q in body["exam"]["questions"]] == [1, 2, 3, 4, 5, 6]
+    assert any("b.txt: Q1 renumbered to Q4" in w for w in body["warnings"])
+    assert body["documents"][1]["role"] == "failed"
+
+    assert _post(client, [("notes.md", b"x")]).status_code == 400
+    assert _post(client, [("key.txt", KEY.encode())]).status_code == 422
+    print("  OK duplicate numbers renumbered, broken files reported")
+
+
+def test_files_extract_concurrently():
+    def slow_ocr(image, filename):
+        time.sleep(0.4)
+        n = int(image.decode())
+        return f"{n}. Scanned question {n}?\n(A) yes\n(B) no"
+
+    set_ocr_backend(StaticOCRBackend(slow_ocr))
+    try:
+        client = TestClient(app)
+        t0 = time.perf_counter()
+        res = _post(client, [(f"page{n}.png", str(n).encode()) for n in (1, 2, 3)])
+        elapsed = time.perf_counter() - t0
+    finally:
+        set_ocr_backend(None)
+    assert res.status_code == 200, res.text
+    assert [q["id"] for q in res.json()["exam"]["questions"]] == [1, 2, 3]
+    assert elapsed < 1.0, elapsed          # serial extraction takes 1.2 s
+    print(f"  OK three 0.4 s OCR files in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    set_extraction_cache(ExtractionCache(None))      # keep ./extraction_cache/ clean
+    test_answer_key_parser()
+    test_exam_set_merges_files_and_applies_key()
+    test_renumbering_and_failed_files()
+    test_files_extract_concurrently()
+    print("\nAll upload batch tests passed OK")
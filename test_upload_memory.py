@@ -0,0 +1,122 @@
+"""
+Smoke test for in-memory upload extraction and the spill-to-disk fallback.
+Run: python test_upload_memory.py
+"""
+import io
+import os
+import sys
+import tempfile
+sys.path.insert(0, ".")
+
+import docx
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+from backend.main import app
+from backend.api.endpoints import upload
+from backend.services import metrics
+from backend.services.extraction_cache import ExtractionCache, set_extraction_cache
+from backend.services.ingestion import IngestionService
+from backend.services.ocr import StaticOCRBackend, set_ocr_backend
+from benchmarks.generators import exam_docx, exam_pdf, synthetic_questions
+
+PAPER = b"""1. What is the capital of France?
+(A) London
+(B) Paris
+Answer: B
+"""
+
+
+def test_bytes_and_path_extract_the_same():
+    questions, _ = synthetic_questions(25, seed=5)
+    documents = {
+        ".pdf": exam_pdf(questions),
+        ".docx": exam_docx(questions),
+        ".txt": PAPER,
+        ".png": b"\x89PNG fake image",
+    }
+    set_ocr_backend(StaticOCRBackend("OCR text"))
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            for ext, content in documents.items():
+                path = os.path.join(d, f"paper{ext}")
+                with open(path, "wb") as f:
+                    f.write(content)
+                from_disk = IngestionService.process_file(path, ext)
+                from_memory = IngestionService.process_file(content, ext)
+                assert from_memory == from_disk, ext
+                assert (
+                    list(IngestionService.iter_pages(content, ext))
+                    == list(IngestionService.iter_pages(path, ext))
+                ), ext
+    finally:
+        set_ocr_backend(None)
+    print("  OK PDF / DOCX / text / image extract identically from bytes and paths")
+
+
+def _post(client, content: bytes, name: str, endpoint: str = "/api/upload/"):
+    return client.post(endpoint, files={"file": (name, content, "application/octet-stream")})
+
+
+def test_uploads_leave_no_files():
+    client = TestClient(app)
+    saved = upload.UPLOAD_DIR, upload.UPLOAD_MEMORY_LIMIT
+    document = docx.Document()
+    for line in PAPER.decode().splitlines():
+        document.add_paragraph(line)
+    buf = io.BytesIO()
+    document.save(buf)
+
+    with tempfile.TemporaryDirectory() as d, tempfile.TemporaryDirectory() as cache_dir:
+        upload.UPLOAD_DIR = d
+        previous = set_extraction_cache(None)
+        try:
+            for limit in (upload.UPLOAD_MEMORY_LIMIT, 16):
+                upload.UPLOAD_MEMORY_LIMIT = limit
+                spills = metrics.STAGE_SECONDS.count(stage="upload.save")
+                for i, (content, name) in enumerate([(PAPER, "a.txt"), (buf.getvalue(), "a.docx")]):
+                    set_extraction_cache(ExtractionCache(os.path.join(cache_dir, f"{limit}-{i}")))
+                    res = _post(client, content, name)
+                    assert res.status_code == 200, res.text
+                    assert res.json()["exam"]["questions"][0]["correct_option"] == "B"
+
+                set_extraction_cache(ExtractionCache(os.path.join(cache_dir, f"{limit}-stream")))
+                res = _post(client, PAPER, "b.txt", "/api/upload/stream")
+                assert res.status_code == 200 and '"type": "summary"' in res.text
+
+                spilled = metrics.STAGE_SECONDS.count(stage="upload.save") - spills
+                assert spilled == (3 if limit == 16 else 0)
+                assert os.listdir(d) == []
+        finally:
+            upload.UPLOAD_DIR, upload.UPLOAD_MEMORY_LIMIT = saved
+            set_extraction_cache(previous)
+    print("  OK small uploads stay in memory, large ones spill and are removed")
+
+
+def test_stream_cleanup_does_not_depend_on_the_body():
+    client = TestClient(app)
+    saved = upload.UPLOAD_DIR, upload.UPLOAD_MEMORY_LIMIT, upload._stream_extraction
+
+    def _never_started(*args):          # stands in for a client that left at once
+        return iter(())
+
+    with tempfile.TemporaryDirectory() as d, tempfile.TemporaryDirectory() as cache_dir:
+        upload.UPLOAD_DIR, upload.UPLOAD_MEMORY_LIMIT = d, 16
+        upload._stream_extraction = _never_started
+        previous = set_extraction_cache(ExtractionCache(cache_dir))
+        try:
+            res = _post(client, PAPER, "c.txt", "/api/upload/stream")
+            assert res.status_code == 200 and res.text == ""
+            assert os.listdir(d) == []
+        finally:
+            upload.UPLOAD_DIR, upload.UPLOAD_MEMORY_LIMIT, upload._stream_extraction = saved
+            set_extraction_cache(previous)
+    assert MultiPartParser.max_file_size == 1024 * 1024      # Starlette left alone
+    print("  OK /stream removes its temp file even if the body never runs")
+
+
+if __name__ == "__main__":
+    set_extraction_cache(ExtractionCache(None))      # keep ./extraction_cache/ clean
+    test_bytes_and_path_extract_the_same()
+    test_uploads_leave_no_files()
+    test_stream_cleanup_does_not_depend_on_the_body()
+    print("\nAll upload memory tests passed OK")